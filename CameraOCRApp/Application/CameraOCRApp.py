@@ -6,6 +6,9 @@ from Infrastructure.CameraService import CameraService
 from Infrastructure.OCRService import OCRService
 from Infrastructure.DatabaseService import DatabaseService
 from Infrastructure.WebService import WebService
+from Infrastructure.DurableReadingQueue import DurableReadingQueue
+from Infrastructure.ReadingDrainer import ReadingDrainer
+from Domain.Models import StoreForwardConfig
 
 class CameraOCRApp:
     def __init__(self, argv):
@@ -14,14 +17,36 @@ class CameraOCRApp:
         self.ocr_service = OCRService()
         self.database_service = DatabaseService()
         self.web_service = WebService()
+        # Her okuma önce diske yazılır, hedefe arka planda iletilir
+        self.store_forward_config = StoreForwardConfig()
+        self.reading_queue = None
+        self.reading_drainer = None
+        if self.store_forward_config.enabled:
+            config = self.store_forward_config
+            self.reading_queue = DurableReadingQueue(config.path)
+            self.reading_drainer = ReadingDrainer(self.reading_queue,
+                                                  batch_size=config.batch_size,
+                                                  poll_interval=config.poll_interval,
+                                                  retry_backoff=config.retry_backoff,
+                                                  retry_backoff_max=config.retry_backoff_max,
+                                                  max_attempts=config.max_attempts)
         
         self.main_window = MainWindow(
             self.camera_service, 
             self.ocr_service, 
             self.database_service, 
-            self.web_service
+            self.web_service,
+            self.reading_drainer
         )
         
     def run(self):
         self.main_window.show()
-        return self.app.exec_()
\ No newline at end of file
+        exit_code = self.app.exec_()
+        # Gönderilemeyen okumalar kalıcı kuyrukta kalır, bir sonraki açılışta iletilir
+        if self.reading_drainer is not None:
+            self.reading_drainer.stop()
+            self.reading_queue.close()
+        # Yazma tamponunda bekleyen okumalar kaybolmasın
+        self.database_service.close()
+        self.web_service.close()
+        return exit_code
\ No newline at end of file
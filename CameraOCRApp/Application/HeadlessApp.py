@@ -0,0 +1,531 @@
+# Application/HeadlessApp.py
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Optional
+from Domain.Models import (CameraConfig, ROIField, OCRConfig, ProcessingParams, DatabaseConfig, WebServiceConfig,
+                           StoreForwardConfig, HeadlessConfig, StreamConfig, SensorData, rect_to_tuple)
+from Infrastructure.CaptureSource import CaptureSource
+from Infrastructure.OCRService import OCRService
+from Infrastructure.DatabaseService import DatabaseService
+from Infrastructure.WebService import WebService
+from Infrastructure.DurableReadingQueue import DurableReadingQueue
+from Infrastructure.ReadingDrainer import ReadingDrainer
+from Infrastructure.MultiROIReader import MultiROIReader
+from Application.Pipeline import PipelineStage, StagedPipeline
+from Application.StreamManager import StreamManager
+from Application.ShardSupervisor import ShardSupervisor
+
+try:
+    import yaml
+except ImportError:  # İsteğe bağlı bağımlılık; yoksa yalnızca JSON ayar dosyası okunur
+    yaml = None
+
+log = logging.getLogger("CameraOCRApp.headless")
+
+# Ayar dosyasındaki bölüm adı -> dataclass
+CONFIG_SECTIONS = {
+    'camera': CameraConfig,
+    'ocr': OCRConfig,
+    'processing': ProcessingParams,
+    'database': DatabaseConfig,
+    'web': WebServiceConfig,
+    'store_forward': StoreForwardConfig,
+    'headless': HeadlessConfig,
+}
+
+def _build_section(cls, data: dict):
+    known = {f.name for f in fields(cls)}
+    unknown = set(data) - known
+    if unknown:
+        raise ValueError(f"{cls.__name__} için bilinmeyen ayar(lar): {', '.join(sorted(unknown))}")
+    return cls(**data)
+
+def _build_roi_field(data: dict) -> ROIField:
+    data = dict(data)
+    data['rect'] = rect_to_tuple(data.pop('roi', data.get('rect', (100, 100, 200, 150))))
+    if data.get('processing') is not None:
+        data['processing'] = _build_section(ProcessingParams, data['processing'])
+    return _build_section(ROIField, data)
+
+def _build_stream(data: dict) -> StreamConfig:
+    data = dict(data)
+    data['camera'] = _build_section(CameraConfig, data.get('camera') or {})
+    data['processing'] = _build_section(ProcessingParams, data.get('processing') or {})
+    if 'roi' in data:
+        data['roi'] = rect_to_tuple(data['roi'])
+    data['fields'] = [_build_roi_field(item) for item in data.get('fields') or []]
+    return _build_section(StreamConfig, data)
+
+def load_site_config(path: str) -> dict:
+    """YAML/JSON ayar dosyasını bölüm başına dataclass sözlüğüne çevir.
+
+    ``ocr.roi: [x, y, w, h]`` OCR alanını verir; ``ocr.fields`` listesi verilirse
+    her öğe (``name``, ``roi``, ``sensor_field``, ``parser``, ``engine``,
+    ``processing``) aynı kareden okunan bir ROIField olur. Eksik bölümler
+    varsayılanları kullanır. ``streams`` listesi verilirse her öğe bir StreamConfig olur ve
+    ``camera``/``ocr.roi``/``ocr.fields``/``processing`` yerine akış başına ayarlar
+    (``roi`` veya ``fields``) kullanılır.
+    """
+    with open(path, 'r', encoding='utf-8') as handle:
+        if path.lower().endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise ValueError("YAML ayar dosyası için PyYAML kurulu olmalı")
+            raw = yaml.safe_load(handle) or {}
+        else:
+            raw = json.load(handle)
+
+    unknown = set(raw) - set(CONFIG_SECTIONS) - {'streams'}
+    if unknown:
+        raise ValueError(f"Bilinmeyen ayar bölümü: {', '.join(sorted(unknown))}")
+
+    config = {}
+    for name, cls in CONFIG_SECTIONS.items():
+        section = dict(raw.get(name) or {})
+        if cls is OCRConfig:
+            # Varsayılan dikdörtgen QRect'tir; başsız kipte her zaman demet kullanılır
+            section['selection_rect'] = rect_to_tuple(section.pop('roi', (100, 100, 200, 150)))
+            section['fields'] = [_build_roi_field(item) for item in section.get('fields') or []]
+        config[name] = _build_section(cls, section)
+    streams = [_build_stream(item) for item in raw.get('streams') or []]
+    names = [stream.name for stream in streams]
+    if len(set(names)) != len(names):
+        raise ValueError("Akış adları benzersiz olmalı")
+    config['streams'] = streams
+    return config
+
+@dataclass
+class ReadingItem:
+    """Hat aşamaları arasında taşınan tek okuma tiki"""
+    sequence: int
+    captured_at: datetime
+    # Alan adı -> kırpılmış ROI; yalnızca ``pending`` alanlar ön işlenip tanınır
+    rois: Optional[dict] = None
+    pending: set = field(default_factory=set)
+    processed: Optional[dict] = None
+    # Alan adı -> (metin, değer, güven)
+    results: dict = field(default_factory=dict)
+
+class HeadlessApp:
+    """Qt olmadan kamera -> ön işleme -> OCR -> hedef döngüsünü çalıştırır.
+
+    Arayüzdeki DatabaseTab okuma yolunun aynısıdır: aynı ROI alanları,
+    ProcessingParams, değişim kontrolü ve sonuç önbelleği kullanılır; her tik
+    tüm alanlardan tek bir kayıt üretir; okumalar kalıcı kuyruk
+    açıksa önce diske, değilse yazıcı/web göndericisine bırakılır.
+    """
+
+    SINK_DB = "db"
+    SINK_WEB = "web"
+    SINK_NONE = "none"
+    SINKS = [SINK_DB, SINK_WEB, SINK_NONE]
+
+    # Eksik bir tik için en fazla bu kadar sonraki tik bekletilir
+    REORDER_LIMIT = 64
+
+    def __init__(self, config: dict):
+        self.camera_config = config['camera']
+        self.ocr_config = config['ocr']
+        self.processing_params = config['processing']
+        self.database_config = config['database']
+        self.store_forward_config = config['store_forward']
+        self.headless_config = config['headless']
+        self.stream_configs = config.get('streams') or []
+        if self.headless_config.sink not in self.SINKS:
+            raise ValueError(f"Bilinmeyen hedef: {self.headless_config.sink}")
+
+        self.camera_service = CaptureSource(on_error=lambda message: log.warning("[Kamera] %s", message))
+        self.ocr_service = OCRService(self.ocr_config.backend,
+                                      self.ocr_config.result_cache_size,
+                                      self.ocr_config.result_cache_ttl)
+        self.database_service = DatabaseService()
+        self.web_service = WebService(config['web'])
+        self.roi_fields = self.ocr_config.roi_fields()
+        MultiROIReader.validate(self.roi_fields, self.ocr_service)
+        for stream in self.stream_configs:
+            MultiROIReader.validate(stream.roi_fields(), self.ocr_service)
+        self.field_reader = MultiROIReader(self.ocr_service,
+                                           self.ocr_config.change_threshold,
+                                           self.ocr_config.max_skip_seconds,
+                                           self.ocr_config.stitch_rois,
+                                           self.ocr_config.vote_frames,
+                                           self.ocr_config.min_confidence,
+                                           self.ocr_config.vote_method,
+                                           self.ocr_config.vote_tolerance)
+
+        self.reading_queue = None
+        self.reading_drainer = None
+        if self.store_forward_config.enabled:
+            sf = self.store_forward_config
+            self.reading_queue = DurableReadingQueue(sf.path)
+            self.reading_drainer = ReadingDrainer(self.reading_queue,
+                                                  batch_size=sf.batch_size,
+                                                  poll_interval=sf.poll_interval,
+                                                  retry_backoff=sf.retry_backoff,
+                                                  retry_backoff_max=sf.retry_backoff_max,
+                                                  max_attempts=sf.max_attempts,
+                                                  on_forwarded=self._on_forwarded)
+        self.stream_manager = None
+        self._stop = threading.Event()
+        self._sequence = 0
+        # Sırasız biten tikler yakalama sırasına dizilir; düşürülen tikler None ile işaretlenir
+        self._reorder_lock = threading.Lock()
+        self._next_sequence = 1
+        self._held = {}
+
+    def stop(self):
+        """Döngüyü durdur; sinyal işleyicisinden veya başka iş parçacığından çağrılabilir"""
+        self._stop.set()
+
+    def start(self) -> bool:
+        """Kamerayı ve hedefleri başlat; çok akışlı kipte kameraları StreamManager açar"""
+        if not self.stream_configs and not self.camera_service.start_camera(self.camera_config):
+            return False
+
+        sink = self.headless_config.sink
+        if sink == self.SINK_DB:
+            success, message = self.database_service.connect(self.database_config)
+            log.info("[DB] %s", message)
+            if self.reading_drainer is not None:
+                # Veritabanı açılışta kapalıysa bağlantıyı iletici geri çekilerek yeniden dener
+                self.reading_drainer.set_sink('db', self._forward_to_database)
+            elif success:
+                self.database_service.start_writer(on_result=self._on_db_row_written,
+                                                   on_dropped=self._on_dropped)
+            else:
+                # Kalıcı kuyruk yoksa okumalar bekletilemez
+                return False
+        elif sink == self.SINK_WEB:
+            if not self.headless_config.web_url and (not self.stream_configs
+                                                     or not all(s.web_url for s in self.stream_configs)):
+                log.error("[Web Servis] headless.web_url boş olamaz")
+                return False
+            if self.reading_drainer is not None:
+                self.reading_drainer.set_sink('web', self._forward_to_web_service,
+                                              batch_size=self._web_batch_size())
+            else:
+                self.web_service.start_sink(on_result=self._on_web_sent, on_dropped=self._on_dropped)
+
+        if self.reading_drainer is not None:
+            self.reading_drainer.start()
+            pending = self.reading_queue.count()
+            if pending:
+                log.info("[Kuyruk] Önceki çalışmadan %d gönderilmemiş okuma bulundu.", pending)
+        return True
+
+    def run(self) -> int:
+        if not self.start():
+            self.close()
+            return 1
+        config = self.headless_config
+        log.info("[OCR] Otomatik okuma başlatıldı (%.1fs aralıklarla)", config.interval)
+        try:
+            if self.stream_configs:
+                self._run_streams()
+            elif config.pipeline:
+                self._run_pipeline()
+            else:
+                self._run_serial()
+        finally:
+            self.close()
+        return 0
+
+    def _run_serial(self):
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.read_once()
+            except Exception as e:
+                self.field_reader.invalidate()
+                log.error("[OCR] Bir hata oluştu: %s", e)
+            next_tick += self.headless_config.interval
+            # Uzun bir OCR tiki sonraki tikleri biriktirmesin
+            next_tick = max(next_tick, time.monotonic())
+            self._stop.wait(next_tick - time.monotonic())
+
+    def _run_pipeline(self):
+        pipeline = self.build_pipeline()
+        pipeline.start()
+        try:
+            while not self._stop.wait(self.headless_config.stats_interval):
+                self._log_pipeline_stats(pipeline)
+        finally:
+            pipeline.stop()
+            self._log_pipeline_stats(pipeline)
+
+    def _run_streams(self):
+        ocr = self.ocr_config
+        supervisor = None
+        shard_options = {}
+        if self.headless_config.capture_processes > 0:
+            # Kod çözme ayrı süreçlerde; OCR bu süreçteki ortak havuzda kalır
+            supervisor = ShardSupervisor(self.stream_configs,
+                                         processes=self.headless_config.capture_processes,
+                                         on_event=self._on_shard_event)
+            supervisor.start()
+            shard_options = {'source_factory': supervisor.source_factory, 'reopen_delay': 1.0}
+
+        self.stream_manager = StreamManager(self.ocr_service, self._on_stream_reading,
+                                            ocr_workers=self.headless_config.ocr_workers,
+                                            change_gate=ocr.change_gate,
+                                            change_threshold=ocr.change_threshold,
+                                            max_skip_seconds=ocr.max_skip_seconds,
+                                            humidity=self.headless_config.humidity,
+                                            on_error=self._on_stream_error,
+                                            stitch=ocr.stitch_rois,
+                                            vote_frames=ocr.vote_frames,
+                                            min_confidence=ocr.min_confidence,
+                                            vote_method=ocr.vote_method,
+                                            vote_tolerance=ocr.vote_tolerance,
+                                            **shard_options)
+        for stream in self.stream_configs:
+            self.stream_manager.add_stream(stream)
+        self.stream_manager.start()
+        try:
+            while not self._stop.wait(self.headless_config.stats_interval):
+                self._log_stream_stats(supervisor)
+        finally:
+            # Okuyucular halkaları bırakmadan yakalama süreçleri kapatılmaz
+            self.stream_manager.stop()
+            if supervisor is not None:
+                supervisor.stop()
+            self._log_stream_stats(supervisor)
+
+    def _on_stream_reading(self, stream: StreamConfig, data: SensorData):
+        if self._is_skipped(data.temperature):
+            return
+        self._submit(data, stream.web_url)
+
+    @staticmethod
+    def _on_stream_error(name: str, message: str):
+        log.warning("[Akış:%s] %s", name, message)
+
+    @staticmethod
+    def _on_shard_event(kind: str, name: str, message: str):
+        if kind == 'restart':
+            log.warning("[Yakalama:%s] yeniden başlatıldı: %s", name, message)
+        else:
+            log.warning("[Akış:%s] %s", name, message)
+
+    def _log_stream_stats(self, supervisor=None):
+        if supervisor is not None:
+            for shard_id, stats in supervisor.stats().items():
+                log.info("[Yakalama:shard-%d] pid %s, %s, yeniden başlatma %d, akışlar %s", shard_id,
+                         stats['pid'], "çalışıyor" if stats['alive'] else "durdu", stats['restarts'],
+                         ", ".join(stats['streams']))
+        for name, stats in self.stream_manager.stats().items():
+            log.info("[Akış:%s] %s, kare %d, okuma %d, OCR %d (ort %.1f ms), atlanan %d, birleşen %d, "
+                     "kararsız %d, hata %d, son değer %s", name, stats['state'], stats['frames'], stats['reads'],
+                     stats['ocr_runs'], stats['ocr_avg_ms'], stats['gate_skips'], stats['coalesced'],
+                     stats['unstable'], stats['failures'], stats['last_value'])
+
+    def read_once(self):
+        """Bir okuma tikini aşama fonksiyonlarıyla sırayla çalıştır; kaydedilen SensorData veya None"""
+        item = self._capture_stage()
+        if item is None:
+            return None
+        try:
+            item = self._ocr_stage(self._preprocess_stage(item))
+        except Exception:
+            self._on_item_dropped(item)
+            raise
+        records = self._parse_stage(item)
+        if records is None:
+            return None
+        self._sink_stage(records)
+        return records[-1]
+
+    def build_pipeline(self) -> StagedPipeline:
+        """Yakalama -> ön işleme -> OCR -> ayrıştırma -> hedef hattını kur (başlatmaz)"""
+        config = self.headless_config
+        return StagedPipeline(self._capture_stage, [
+            PipelineStage('preprocess', self._preprocess_stage, queue_size=config.queue_size,
+                          policy=PipelineStage.POLICY_DROP_OLDEST, on_drop=self._on_item_dropped),
+            PipelineStage('ocr', self._ocr_stage, workers=config.ocr_workers,
+                          queue_size=config.queue_size, policy=config.drop_policy,
+                          on_drop=self._on_item_dropped),
+            PipelineStage('parse', self._parse_stage, queue_size=config.queue_size,
+                          on_drop=self._on_item_dropped),
+            # Okumalar burada düşürülmez; hedef yavaşsa geri basınç OCR'a yansır
+            PipelineStage('sink', self._sink_stage, queue_size=config.queue_size,
+                          policy=PipelineStage.POLICY_BLOCK, block_timeout=config.interval or 1.0,
+                          on_drop=self._on_records_dropped),
+        ], interval=config.interval, on_error=self._on_stage_error)
+
+    def _capture_stage(self):
+        # Yakalama iş parçacığı kareleri kendisi tazeler; yoksa burada okunur
+        self.camera_service.read_frame()
+        frame = self.camera_service.get_frame()
+        if frame is None:
+            log.warning("[OCR] Kamera karesi yok")
+            return None
+
+        # Tüm alanlar aynı kareden kırpılır; değişmeyen alanlar OCR'a gitmez
+        try:
+            rois, pending = self.field_reader.prepare(frame, self.roi_fields, self.processing_params,
+                                                      self.ocr_config.language, self.ocr_config.change_gate)
+        except ValueError as e:
+            log.error("[OCR] %s", e)
+            return None
+        self._sequence += 1
+        return ReadingItem(sequence=self._sequence, captured_at=datetime.now(), rois=rois, pending=pending)
+
+    def _preprocess_stage(self, item: 'ReadingItem'):
+        item.processed = self.field_reader.preprocess(item.rois, self.roi_fields,
+                                                      self.processing_params, item.pending)
+        item.rois = None
+        return item
+
+    def _ocr_stage(self, item: 'ReadingItem'):
+        try:
+            item.results = self.field_reader.recognize(item.processed, self.roi_fields, self.ocr_config.language)
+        except Exception:
+            # Referans geçersiz sayılır ki bir sonraki tikte OCR yeniden denensin
+            self.field_reader.invalidate(item.pending)
+            raise
+        item.processed = None
+        return item
+
+    def _parse_stage(self, item: 'ReadingItem'):
+        """Tikleri yakalama sırasıyla birleştir; sırası gelen tiklerin kayıt listesi veya None.
+
+        Paralel OCR işçileri sırasız bitirebilir ve değişmeyen tikler OCR'ı
+        atladığı için değişen tikten önce gelir. Sırayla birleştirilmezlerse
+        değişen tikin okuması ya atılır ya da eski değerle ezilir.
+        """
+        with self._reorder_lock:
+            if item.sequence < self._next_sequence:
+                # Sınır aşıldığı için atlanmış tik; alanları sonraki tikte yeniden okunsun
+                self.field_reader.invalidate(item.pending, keep_readings=True)
+                return None
+            self._held[item.sequence] = item
+            if len(self._held) > self.REORDER_LIMIT:
+                # Kaybolan bir tik hattı kilitlemesin
+                self._next_sequence = min(self._held)
+            ready = []
+            while self._next_sequence in self._held:
+                ready.append(self._held.pop(self._next_sequence))
+                self._next_sequence += 1
+
+        records = [self._parse_item(ready_item) for ready_item in ready if ready_item is not None]
+        records = [data for data in records if data is not None]
+        return records or None
+
+    def _parse_item(self, item: 'ReadingItem') -> Optional[SensorData]:
+        readings = self.field_reader.merge(self.roi_fields, item.results)
+        for name, reading in readings.items():
+            if reading.reused:
+                log.debug("[OCR:%s] ROI değişmedi, son okuma kullanıldı: %s", name, reading.text.strip())
+            else:
+                log.info("[OCR:%s] Okunan Ham Veri: %s (güven %.2f)", name, reading.text.strip(),
+                         reading.confidence)
+
+        # Nem alanı tanımlı değilse sabit nem kullanılır
+        data = MultiROIReader.build_record(self.roi_fields, readings, item.captured_at,
+                                           {'humidity': self.headless_config.humidity})
+        if data is None:
+            missing = MultiROIReader.missing(self.roi_fields, readings)
+            if missing:
+                log.warning("[OCR] Metinden geçerli değer çıkarılamadı: %s", ", ".join(missing))
+            else:
+                log.info("[OCR] Değer henüz kararlı değil, kaydedilmedi: %s",
+                         ", ".join(MultiROIReader.unstable(self.roi_fields, readings)))
+            return None
+        if self._is_skipped(data.temperature):
+            log.info("[OCR] Veri filtrelendi: %s°C", data.temperature)
+            return None
+        return data
+
+    def _sink_stage(self, records: list):
+        for data in records:
+            self._submit(data)
+        return None
+
+    def _on_item_dropped(self, item: 'ReadingItem'):
+        # Değişim referansı yakalamada ilerledi; düşen tikin alanları sonraki tikte yeniden okunsun
+        self.field_reader.invalidate(item.pending, keep_readings=True)
+        with self._reorder_lock:
+            if item.sequence >= self._next_sequence:
+                self._held[item.sequence] = None
+
+    def _on_records_dropped(self, records: list):
+        for data in records:
+            self._on_dropped(data, "hedef kuyruğu dolu")
+
+    def _on_stage_error(self, stage: str, error: Exception):
+        log.error("[Hat:%s] Bir hata oluştu: %s", stage, error)
+
+    def _log_pipeline_stats(self, pipeline: StagedPipeline):
+        for name, stats in pipeline.stats().items():
+            if name == 'source':
+                log.info("[Hat:kaynak] üretilen %d, hata %d", stats['produced'], stats['errors'])
+                continue
+            log.info("[Hat:%s] %.2f/s, ort %.1f ms, kuyruk %d/%d (en çok %d), düşürülen %d, hata %d",
+                     name, stats['throughput_per_s'], stats['avg_ms'], stats['queue_depth'],
+                     stats['queue_size'], stats['max_depth'], stats['dropped'], stats['errors'])
+
+    def close(self):
+        """Kamerayı durdur; gönderilemeyen okumalar kalıcı kuyrukta kalır"""
+        self.camera_service.stop_camera()
+        if self.reading_drainer is not None:
+            self.reading_drainer.stop()
+            self.reading_queue.close()
+            self.reading_drainer = None
+        self.database_service.close()
+        self.web_service.close()
+
+    def _is_skipped(self, temperature: float) -> bool:
+        low, high = self.headless_config.skip_min, self.headless_config.skip_max
+        if low is None and high is None:
+            return False
+        return (low is None or temperature >= low) and (high is None or temperature <= high)
+
+    def _submit(self, data: SensorData, web_url: str = ""):
+        sink = self.headless_config.sink
+        if sink == self.SINK_NONE:
+            return
+        url = web_url or self.headless_config.web_url
+        if self.reading_drainer is not None:
+            self.reading_drainer.submit(data, sink, url if sink == self.SINK_WEB else "")
+        elif sink == self.SINK_DB:
+            self.database_service.submit_sensor_data(data)
+        else:
+            self.web_service.submit_sensor_data(data, url)
+
+    def _web_batch_size(self) -> int:
+        return self.web_service.config.batch_size if self.web_service.config.batch_mode else 1
+
+    def _forward_to_database(self, items, target):
+        if not self.database_service.is_connected():
+            success, message = self.database_service.connect(self.database_config)
+            if not success:
+                return False, message
+            log.info("[DB] %s", message)
+        return self.database_service.insert_sensor_data_batch(items)
+
+    def _forward_to_web_service(self, items, target):
+        return self.web_service.forward_readings(items, target)
+
+    @staticmethod
+    def _on_forwarded(sink, items, success, message):
+        if success:
+            log.info("[%s] %d okuma iletildi", sink, len(items))
+        else:
+            log.warning("[%s] İletilemedi, okumalar kuyrukta bekliyor - %s", sink, message)
+
+    @staticmethod
+    def _on_db_row_written(data, success, message):
+        if not success:
+            log.warning("[DB] Hata: %s°C - %s", data.temperature, message)
+
+    @staticmethod
+    def _on_web_sent(items, url, success, message):
+        if not success:
+            log.warning("[Web Servis] %d okuma gönderilemedi: %s", len(items), message)
+
+    @staticmethod
+    def _on_dropped(data, reason):
+        log.warning("Okuma düşürüldü: %s°C - %s", data.temperature, reason)
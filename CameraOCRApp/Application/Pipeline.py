@@ -0,0 +1,239 @@
+# Application/Pipeline.py
+import queue
+import threading
+import time
+from collections import deque
+
+class PipelineStage:
+    """Kendi iş parçacıklarında çalışan, sınırlı giriş kuyruklu bir hat aşaması.
+
+    ``func(item)`` sonraki aşamaya gidecek öğeyi döndürür; None dönerse öğe
+    burada biter (filtrelendi veya son aşama). Kuyruk dolduğunda davranış
+    ``policy`` ile seçilir:
+      - block: en fazla ``block_timeout`` saniye bekle, sonra öğeyi düşür
+      - drop_oldest: kuyruktaki en eski öğeyi düşür (canlı kareler için)
+      - drop_newest: gelen öğeyi düşür
+    Düşürülen veya işlenirken hata veren her öğe için ``on_drop(öğe)``
+    çağrılır; çağıran böylece öğeyle ilerletilmiş durumu geri alabilir.
+    """
+
+    POLICY_BLOCK = "block"
+    POLICY_DROP_OLDEST = "drop_oldest"
+    POLICY_DROP_NEWEST = "drop_newest"
+    POLICIES = [POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_DROP_NEWEST]
+
+    # Verim bu kadar saniyelik kayan pencerede hesaplanır
+    THROUGHPUT_WINDOW = 10.0
+
+    def __init__(self, name: str, func, workers: int = 1, queue_size: int = 4,
+                 policy: str = POLICY_BLOCK, block_timeout: float = 1.0, on_drop=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Bilinmeyen kuyruk politikası: {policy}")
+        self.name = name
+        self.func = func
+        self.workers = max(workers, 1)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.next_stage = None
+        self.on_error = None
+        self.on_drop = on_drop
+
+        self._queue = queue.Queue(maxsize=max(queue_size, 1))
+        self._threads = []
+        self._running = False
+        self._stats_lock = threading.Lock()
+        self._completions = deque(maxlen=1000)
+        self._busy_seconds = 0.0
+        self._max_depth = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"Pipeline-{self.name}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 2.0):
+        """İşçileri durdur; kuyrukta kalan öğeler atılır"""
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def offer(self, item) -> bool:
+        """Öğeyi kuyruğa bırak; politika gereği düşürüldüyse False"""
+        try:
+            self._queue.put_nowait(item)
+            self._note_depth()
+            return True
+        except queue.Full:
+            pass
+
+        if self.policy == self.POLICY_DROP_OLDEST:
+            while True:
+                try:
+                    self._drop(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                try:
+                    self._queue.put_nowait(item)
+                    self._note_depth()
+                    return True
+                except queue.Full:
+                    continue
+
+        if self.policy == self.POLICY_BLOCK:
+            try:
+                self._queue.put(item, timeout=self.block_timeout)
+                self._note_depth()
+                return True
+            except queue.Full:
+                pass
+
+        self._drop(item)
+        return False
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._stats_lock:
+            recent = sum(1 for at in self._completions if now - at <= self.THROUGHPUT_WINDOW)
+            window = min(self.THROUGHPUT_WINDOW, now - self._completions[0]) if self._completions else 0.0
+            depth = self._queue.qsize()
+            return {
+                'workers': self.workers,
+                'processed': self.processed,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'queue_depth': depth,
+                'queue_size': self._queue.maxsize,
+                'occupancy': depth / self._queue.maxsize,
+                'max_depth': self._max_depth,
+                'throughput_per_s': recent / window if window > 0 else 0.0,
+                'avg_ms': self._busy_seconds / self.processed * 1000 if self.processed else 0.0,
+            }
+
+    def _note_depth(self):
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._max_depth = max(self._max_depth, depth)
+
+    def _drop(self, item):
+        with self._stats_lock:
+            self.dropped += 1
+        if self.on_drop is not None:
+            self.on_drop(item)
+
+    def _run(self):
+        while self._running:
+            try:
+                item = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            started = time.perf_counter()
+            try:
+                result = self.func(item)
+            except Exception as e:
+                result = None
+                with self._stats_lock:
+                    self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(self.name, e)
+                if self.on_drop is not None:
+                    self.on_drop(item)
+            finished = time.perf_counter()
+            with self._stats_lock:
+                self.processed += 1
+                self._busy_seconds += finished - started
+                self._completions.append(time.monotonic())
+
+            if result is not None and self.next_stage is not None:
+                self.next_stage.offer(result)
+
+class StagedPipeline:
+    """Bir kaynak ve ardışık aşamalardan oluşan hat.
+
+    Kaynak ``source()`` en fazla ``interval`` saniyede bir kendi iş
+    parçacığında çağrılır ve ürettiği öğe ilk aşamanın kuyruğuna bırakılır;
+    böylece yakalama, ön işleme, OCR ve hedef G/Ç'si birbiriyle örtüşür ve en
+    yavaş aşama (Tesseract) diğerlerinin hızını belirlemez. Birden çok işçili
+    aşamalar öğeleri sırasız tamamlayabilir; sıra gerekiyorsa öğe bir sıra
+    numarası taşımalı ve sonraki aşama öğeleri bu numaraya göre dizmelidir
+    (düşürülen numaralar ``on_drop`` ile bildirilir).
+    """
+
+    # Kaynak öğe üretmediğinde yeniden denemeden önceki bekleme
+    IDLE_WAIT = 0.005
+
+    def __init__(self, source, stages, interval: float = 0.0, on_error=None):
+        if not stages:
+            raise ValueError("Hat en az bir aşama içermeli")
+        self.source = source
+        self.stages = list(stages)
+        self.interval = interval
+        # on_error(aşama adı, istisna); aşama iş parçacığından çağrılır
+        self.on_error = on_error
+        for stage, next_stage in zip(self.stages, self.stages[1:] + [None]):
+            stage.next_stage = next_stage
+            stage.on_error = on_error
+
+        self._stop = threading.Event()
+        self._thread = None
+        self.produced = 0
+        self.source_errors = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        # Tüketiciler kaynaktan önce hazır olsun
+        for stage in reversed(self.stages):
+            stage.start()
+        self._thread = threading.Thread(target=self._run_source, name="Pipeline-source", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Önce kaynağı, sonra aşamaları sırayla durdur"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        for stage in self.stages:
+            stage.stop(timeout)
+
+    def stats(self) -> dict:
+        """Aşama adı -> istatistik; kaynak için 'source' anahtarı"""
+        result = {'source': {'produced': self.produced, 'errors': self.source_errors}}
+        for stage in self.stages:
+            result[stage.name] = stage.stats()
+        return result
+
+    def _run_source(self):
+        next_tick = time.monotonic()
+        first_stage = self.stages[0]
+        while not self._stop.is_set():
+            try:
+                item = self.source()
+            except Exception as e:
+                item = None
+                self.source_errors += 1
+                if self.on_error is not None:
+                    self.on_error('source', e)
+
+            if item is None:
+                self._stop.wait(self.interval if self.interval > 0 else self.IDLE_WAIT)
+                next_tick = time.monotonic()
+                continue
+
+            self.produced += 1
+            first_stage.offer(item)
+            next_tick += self.interval
+            # Kaynak geride kaldıysa kaçırılan tikler art arda çalıştırılmaz
+            next_tick = max(next_tick, time.monotonic())
+            self._stop.wait(next_tick - time.monotonic())
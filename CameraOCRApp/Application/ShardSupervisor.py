@@ -0,0 +1,248 @@
+# Application/ShardSupervisor.py
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import replace
+from Infrastructure.CaptureSource import CaptureSource
+from Infrastructure.SharedFrameRing import SharedFrameRing, SharedFrameSource
+
+# Yakalama süreci bu aralıkla kalp atışı gönderir
+HEARTBEAT_INTERVAL = 1.0
+
+def _capture_shard(shard_id: int, streams: list, prefix: str, slots: int, events, stop):
+    """Yakalama süreci: atanan akışların karelerini paylaşımlı halkalara yazar.
+
+    ``streams`` (akış adı, CameraConfig) listesidir. Kare boyutu ilk karede
+    öğrenilir; boyut değişirse yeni adla yeni halka açılır ve ana sürece
+    ``('ring', akış, halka adı)`` olayı gönderilir. Kameralar ayrı iş
+    parçacıklarında açılır; erişilemeyen bir RTSP adresinin açılış zaman aşımı
+    (FFmpeg'de ~30 s) diğer akışları ve kalp atışını bekletmez. Döngü yalnızca
+    ``get_latest_frame`` okuduğundan kameralar her zaman ``threaded_capture``
+    ile açılır.
+    """
+    sources = {}
+    opening = set()
+    opened = queue.Queue()
+    rings = {}
+    last_sequence = {}
+    retry_at = {}
+    generation = 0
+    next_beat = 0.0
+
+    def report(name, message):
+        events.put(('error', name, message))
+
+    def open_camera(name, camera):
+        source = CaptureSource(on_error=lambda message: report(name, message))
+        # Eşzamanlı okuma bu döngüyü bloklardı; kareyi yakalama iş parçacığı üretir
+        started = source.start_camera(replace(camera, threaded_capture=True))
+        opened.put((name, source if started else None))
+
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            while True:
+                try:
+                    name, source = opened.get_nowait()
+                except queue.Empty:
+                    break
+                opening.discard(name)
+                if source is None:
+                    retry_at[name] = now + 10.0
+                else:
+                    sources[name] = source
+
+            for name, camera in streams:
+                source = sources.get(name)
+                if source is None:
+                    if name in opening or now < retry_at.get(name, 0.0):
+                        continue
+                    opening.add(name)
+                    threading.Thread(target=open_camera, args=(name, camera),
+                                     name=f"CaptureOpen-{name}", daemon=True).start()
+                    continue
+
+                sequence, frame, _ = source.get_latest_frame()
+                if frame is None or sequence == last_sequence.get(name):
+                    continue
+                last_sequence[name] = sequence
+
+                ring = rings.get(name)
+                if ring is None or ring.shape != frame.shape:
+                    if ring is not None:
+                        ring.unlink()
+                    generation += 1
+                    ring = SharedFrameRing.create(f"{prefix}{shard_id}_{os.getpid()}_{generation}",
+                                                  frame.shape, slots)
+                    rings[name] = ring
+                    events.put(('ring', name, ring.name))
+                ring.write(frame)
+
+            if now >= next_beat:
+                next_beat = now + HEARTBEAT_INTERVAL
+                for ring in rings.values():
+                    ring.heartbeat()
+                events.put(('heartbeat', shard_id, now))
+            # Yakalama iş parçacıkları kendi hızında okur; bu döngü yalnızca kopyalar
+            stop.wait(0.002)
+    finally:
+        # Durdurma sırasında açılışı biten kameralar da kapatılır
+        while True:
+            try:
+                name, source = opened.get_nowait()
+            except queue.Empty:
+                break
+            if source is not None:
+                sources[name] = source
+        for source in sources.values():
+            source.stop_camera()
+        for ring in rings.values():
+            ring.unlink()
+
+class ShardSupervisor:
+    """Kamera akışlarını yakalama süreçlerine dağıtır ve çökenleri yeniden başlatır.
+
+    RTSP/H.264 çözme her süreçte ayrı çekirdekte çalışır, GIL paylaşılmaz.
+    Kareler süreçten ana sürece ``SharedFrameRing`` ile taşınır; ana süreçteki
+    StreamManager ``source_factory`` ile halkalardan yalnızca ROI'yi okur.
+    Kalp atışı ``heartbeat_timeout`` saniyeden uzun gelmeyen veya ölen süreç
+    sonlandırılır, halkaları silinir ve aynı akışlarla yeniden başlatılır.
+    """
+
+    def __init__(self, stream_configs: list, processes: int = 0, ring_slots: int = 4,
+                 heartbeat_timeout: float = 10.0, on_event=None):
+        self.stream_configs = [config for config in stream_configs if config.enabled]
+        count = processes or min(os.cpu_count() or 1, len(self.stream_configs))
+        self.processes = max(min(count, len(self.stream_configs)), 1)
+        self.ring_slots = ring_slots
+        self.heartbeat_timeout = heartbeat_timeout
+        # on_event(tür, ad, mesaj): 'error', 'restart'
+        self.on_event = on_event
+        self.prefix = f"cocr{os.getpid()}_"
+
+        # Alt süreçler ana sürecin iş parçacıklarını devralmasın
+        self._context = multiprocessing.get_context('spawn')
+        self._events = self._context.Queue()
+        self._stop = self._context.Event()
+        self._lock = threading.Lock()
+        self._rings = {}  # akış adı -> halka adı
+        self._shards = []
+        self._monitor = None
+        self._running = False
+
+    def assignments(self) -> list:
+        """Akışları süreçlere sırayla dağıt: süreç başına (akış adı, CameraConfig) listesi"""
+        shards = [[] for _ in range(self.processes)]
+        for index, config in enumerate(self.stream_configs):
+            shards[index % self.processes].append((config.name, config.camera))
+        return shards
+
+    def source_factory(self, stream_config, on_error) -> SharedFrameSource:
+        """StreamManager için akışın halkasını okuyan kaynak"""
+        return SharedFrameSource(stream_config.name, self.ring_name, on_error)
+
+    def ring_name(self, stream_name: str):
+        with self._lock:
+            return self._rings.get(stream_name)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._stop.clear()
+        for shard_id, streams in enumerate(self.assignments()):
+            self._shards.append({'id': shard_id, 'streams': streams, 'process': None,
+                                 'heartbeat': 0.0, 'restarts': 0, 'started': 0.0, 'rings': set()})
+            self._spawn(self._shards[-1])
+        self._monitor = threading.Thread(target=self._run_monitor, name="ShardSupervisor", daemon=True)
+        self._monitor.start()
+
+    def stop(self, timeout: float = 5.0):
+        if not self._running:
+            return
+        self._running = False
+        self._stop.set()
+        self._monitor.join(timeout)
+        for shard in self._shards:
+            process = shard['process']
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout)
+            self._remove_rings(shard)
+        self._shards = []
+
+    def stats(self) -> dict:
+        """Süreç numarası -> pid, canlılık, yeniden başlatma sayısı, akışlar"""
+        now = time.monotonic()
+        with self._lock:
+            return {shard['id']: {
+                'pid': shard['process'].pid if shard['process'] else None,
+                'alive': bool(shard['process'] and shard['process'].is_alive()),
+                'restarts': shard['restarts'],
+                'heartbeat_age_s': now - shard['heartbeat'] if shard['heartbeat'] else None,
+                'streams': [name for name, _ in shard['streams']],
+            } for shard in self._shards}
+
+    def _spawn(self, shard: dict):
+        process = self._context.Process(target=_capture_shard, name=f"CaptureShard-{shard['id']}",
+                                        args=(shard['id'], shard['streams'], self.prefix,
+                                              self.ring_slots, self._events, self._stop),
+                                        daemon=True)
+        process.start()
+        shard['process'] = process
+        shard['started'] = time.monotonic()
+        shard['heartbeat'] = 0.0
+
+    def _restart(self, shard: dict, reason: str):
+        process = shard['process']
+        if process.is_alive():
+            process.terminate()
+        process.join(2.0)
+        self._remove_rings(shard)
+        shard['restarts'] += 1
+        self._emit('restart', f"shard-{shard['id']}", reason)
+        self._spawn(shard)
+
+    def _remove_rings(self, shard: dict):
+        with self._lock:
+            for name, _ in shard['streams']:
+                self._rings.pop(name, None)
+            rings, shard['rings'] = shard['rings'], set()
+        # Düzgün kapanan süreç halkalarını kendisi siler; çökenden kalanlar burada silinir
+        for ring_name in rings:
+            SharedFrameRing.remove(ring_name)
+
+    def _run_monitor(self):
+        owners = {name: shard for shard in self._shards for name, _ in shard['streams']}
+        while self._running:
+            try:
+                kind, name, value = self._events.get(timeout=0.5)
+            except queue.Empty:
+                kind = None
+            if kind == 'ring':
+                shard = owners[name]
+                with self._lock:
+                    self._rings[name] = value
+                    shard['rings'].add(value)
+            elif kind == 'heartbeat':
+                self._shards[name]['heartbeat'] = time.monotonic()
+            elif kind == 'error':
+                self._emit('error', name, value)
+
+            now = time.monotonic()
+            for shard in self._shards:
+                if not self._running:
+                    break
+                process = shard['process']
+                last_beat = shard['heartbeat'] or shard['started']
+                if not process.is_alive():
+                    self._restart(shard, f"süreç sonlandı (çıkış kodu {process.exitcode})")
+                elif now - last_beat > self.heartbeat_timeout:
+                    self._restart(shard, "kalp atışı alınamadı")
+
+    def _emit(self, kind: str, name: str, message: str):
+        if self.on_event is not None:
+            self.on_event(kind, name, message)
@@ -0,0 +1,320 @@
+# Application/StreamManager.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from Domain.Models import StreamConfig, rect_to_tuple
+from Infrastructure.CaptureSource import CaptureSource
+from Infrastructure.MultiROIReader import MultiROIReader
+from Infrastructure.TemporalVoter import TemporalVoter
+
+class StreamState:
+    """Tek bir akışın çalışma durumu ve sayaçları"""
+
+    STATE_STOPPED = "stopped"
+    STATE_RUNNING = "running"
+    STATE_ERROR = "error"
+
+    def __init__(self, config: StreamConfig, reader: MultiROIReader, humidity: float, source_factory=None):
+        self.config = config
+        self.reader = reader
+        self.humidity = humidity
+        # Alanlar kapsayan dikdörtgene göre kaydırılır; her tikte kaynaktan yalnızca o
+        # dikdörtgen tek parça okunur (paylaşımlı halkada tüm alanlar aynı kareden gelir)
+        rects = [rect_to_tuple(item.rect) for item in config.roi_fields()]
+        left, top = min(r[0] for r in rects), min(r[1] for r in rects)
+        right, bottom = max(r[0] + r[2] for r in rects), max(r[1] + r[3] for r in rects)
+        self.bounds = (left, top, right - left, bottom - top)
+        self.fields = [replace(item, rect=(x - left, y - top, w, h))
+                       for item, (x, y, w, h) in zip(config.roi_fields(), rects)]
+        factory = source_factory or (lambda stream_config, on_error: CaptureSource(on_error=on_error))
+        self.source = factory(config, self._on_camera_error)
+        self.state = self.STATE_STOPPED
+        self.next_due = 0.0
+        self.retry_at = 0.0
+        self.busy = False
+        self.reset_gate = False
+        # Kare sırası en son ne zaman ilerledi (yakalama zamanı vermeyen kaynaklar için)
+        self.frame_sequence = None
+        self.frame_seen_at = 0.0
+        self.stale = False
+        self.last_error = ""
+        self.last_value = None
+        self.last_read_at = None
+        self.reads = 0
+        self.ocr_runs = 0
+        self.gate_skips = 0
+        self.stale_skips = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.camera_errors = 0
+        self.ocr_seconds = 0.0
+
+    def _on_camera_error(self, message: str):
+        self.camera_errors += 1
+        self.last_error = message
+
+    def stats(self) -> dict:
+        sequence, _, captured_at = self.source.get_latest_frame()
+        reader = self.reader.stats()
+        return {
+            'state': self.state,
+            'frames': sequence,
+            'frame_age_s': time.monotonic() - captured_at if captured_at else None,
+            'reads': self.reads,
+            'ocr_runs': self.ocr_runs,
+            'gate_skips': self.gate_skips,
+            'stale_skips': self.stale_skips,
+            'unstable': reader['unstable'],
+            'coalesced': self.coalesced,
+            'failures': self.failures,
+            'camera_errors': self.camera_errors,
+            'ocr_avg_ms': self.ocr_seconds / self.ocr_runs * 1000 if self.ocr_runs else 0.0,
+            'last_value': self.last_value,
+            'last_read_at': self.last_read_at,
+            'last_error': self.last_error,
+            'busy': self.busy,
+        }
+
+class StreamManager:
+    """Birden çok kamera/RTSP akışını tek süreçte yönetir.
+
+    Her akışın kendi ROI alanları, ProcessingParams'ı, dili ve okuma aralığı
+    vardır; kareler akış başına bir CaptureSource yakalama iş parçacığından
+    gelir. Alanlar tek kameralı yoldaki gibi akış başına bir MultiROIReader ile
+    okunur (alan başına tanıma yolu, değişim kontrolü ve oylama): tek bir
+    zamanlayıcı iş parçacığı zamanı gelen akışın alanlarını kırpar (``prepare``),
+    değişen alanlar tüm akışların paylaştığı OCR iş havuzunda ön işlenip
+    tanınır; böylece Tesseract, önbellek ve hedef bağlantıları akış sayısıyla
+    çoğalmaz. Bir akışın önceki OCR'ı sürerken gelen tikleri birleştirilir.
+
+    Okumalar ``on_reading(akış ayarı, SensorData)`` ile OCR iş parçacığından
+    (değişmeyen ROI'de zamanlayıcıdan) bildirilir. ``source_factory(akış
+    ayarı, on_error)`` verilirse kareler CaptureSource yerine o kaynaktan
+    okunur (ör. başka süreçteki yakalayıcının paylaşımlı bellek halkası).
+    Karesi ``STALE_INTERVALS`` aralıktan (en az ``STALE_MIN_SECONDS``) uzun
+    süredir yenilenmeyen akışın tikleri atlanır; donmuş kamera son değeri
+    yeni okuma gibi üretmeye devam etmez.
+    """
+
+    # Açılamayan kamera bu kadar saniye sonra yeniden denenir
+    REOPEN_DELAY = 10.0
+    STALE_INTERVALS = 3
+    STALE_MIN_SECONDS = 2.0
+
+    def __init__(self, ocr_service, on_reading, ocr_workers: int = 2, change_gate: bool = True,
+                 change_threshold: float = 12.0, max_skip_seconds: float = 300.0,
+                 humidity: float = 70.0, on_error=None, source_factory=None,
+                 reopen_delay: float = REOPEN_DELAY, stitch: bool = False, vote_frames: int = 1,
+                 min_confidence: float = 0.0, vote_method: str = TemporalVoter.METHOD_VOTE, vote_tolerance: float = 0.5):
+        self.ocr_service = ocr_service
+        self.on_reading = on_reading
+        # on_error(akış adı, mesaj)
+        self.on_error = on_error
+        self.ocr_workers = max(ocr_workers, 1)
+        self.change_gate = change_gate
+        self.change_threshold = change_threshold
+        self.max_skip_seconds = max_skip_seconds
+        self.humidity = humidity
+        self.source_factory = source_factory
+        self.reopen_delay = reopen_delay
+        self.stitch = stitch
+        self.vote_frames = vote_frames
+        self.min_confidence = min_confidence
+        self.vote_method = vote_method
+        self.vote_tolerance = vote_tolerance
+
+        self._streams = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor = None
+        self._thread = None
+
+    def add_stream(self, config: StreamConfig) -> StreamState:
+        """Akışı ekle; yönetici çalışıyorsa kamera bir sonraki turda açılır.
+
+        Alanlar geçersizse (bkz. ``MultiROIReader.validate``) ValueError verir.
+        """
+        MultiROIReader.validate(config.roi_fields(), self.ocr_service)
+        reader = MultiROIReader(self.ocr_service, self.change_threshold, self.max_skip_seconds, self.stitch,
+                                self.vote_frames, self.min_confidence, self.vote_method, self.vote_tolerance,
+                                namespace=config.name)
+        humidity = self.humidity if config.humidity is None else config.humidity
+        with self._lock:
+            if config.name in self._streams:
+                raise ValueError(f"Aynı adla iki akış olamaz: {config.name}")
+            stream = StreamState(config, reader, humidity, self.source_factory)
+            self._streams[config.name] = stream
+        self._wake.set()
+        return stream
+
+    def remove_stream(self, name: str):
+        with self._lock:
+            stream = self._streams.pop(name, None)
+        if stream is not None:
+            stream.source.stop_camera()
+            stream.state = StreamState.STATE_STOPPED
+
+    def streams(self) -> list:
+        with self._lock:
+            return list(self._streams.values())
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.ocr_workers, thread_name_prefix="StreamOCR")
+        self._thread = threading.Thread(target=self._run, name="StreamManager", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Zamanlayıcıyı durdur, süren OCR işlerini bekle ve kameraları kapat"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        for stream in self.streams():
+            stream.source.stop_camera()
+            stream.state = StreamState.STATE_STOPPED
+
+    def stats(self) -> dict:
+        """Akış adı -> durum ve sayaçlar"""
+        return {stream.config.name: stream.stats() for stream in self.streams()}
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            now = time.monotonic()
+            next_wake = now + 1.0
+            for stream in self.streams():
+                if self._stop.is_set():
+                    break
+                if not stream.config.enabled:
+                    continue
+                if stream.state != StreamState.STATE_RUNNING:
+                    if now >= stream.retry_at:
+                        self._guarded(stream, self._open)
+                    next_wake = min(next_wake, stream.retry_at)
+                    continue
+                if now >= stream.next_due:
+                    # Uzun süren bir tik sonraki tikleri biriktirmesin
+                    stream.next_due = max(stream.next_due + stream.config.interval, now)
+                    self._guarded(stream, self._tick)
+                next_wake = min(next_wake, stream.next_due)
+            self._wake.wait(max(next_wake - time.monotonic(), 0.0))
+
+    def _guarded(self, stream: StreamState, step):
+        # Bir akışın hatası (ör. on_reading'de kuyruk hatası) zamanlayıcıyı ve diğer akışları durdurmasın
+        try:
+            step(stream)
+        except Exception as e:
+            stream.failures += 1
+            stream.reset_gate = True
+            if stream.state != StreamState.STATE_RUNNING:
+                stream.state = StreamState.STATE_ERROR
+                stream.retry_at = time.monotonic() + self.reopen_delay
+            self._report(stream, str(e))
+
+    def _open(self, stream: StreamState):
+        if stream.source.start_camera(stream.config.camera):
+            # Yeniden açılan kameranın kareleri eski ortalamaya karışmasın
+            for item in stream.fields:
+                self.ocr_service.reset_temporal_denoise(stream.reader.roi_key(item))
+            stream.state = StreamState.STATE_RUNNING
+            stream.next_due = time.monotonic()
+            stream.frame_seen_at = stream.next_due
+        else:
+            stream.state = StreamState.STATE_ERROR
+            stream.retry_at = time.monotonic() + self.reopen_delay
+            self._report(stream, stream.last_error or "Kamera açılamadı")
+
+    def _tick(self, stream: StreamState):
+        if stream.busy:
+            stream.coalesced += 1
+            return
+        if stream.reset_gate:
+            stream.reader.invalidate([item.name for item in stream.fields], keep_readings=True)
+            stream.reset_gate = False
+
+        stream.source.read_frame()
+        frame = stream.source.read_roi(stream.bounds)
+        if frame is None:
+            return
+        if frame.size == 0:
+            self._report(stream, "OCR alanı karenin dışında")
+            return
+        if self._is_stale(stream):
+            return
+
+        captured_at = datetime.now()
+        try:
+            rois, pending = stream.reader.prepare(frame, stream.fields, stream.config.processing,
+                                                  stream.config.language, self.change_gate)
+        except ValueError as e:
+            self._report(stream, str(e))
+            return
+        if not pending:
+            stream.gate_skips += 1
+            self._emit(stream, stream.reader.merge(stream.fields, {}), captured_at)
+            return
+
+        stream.busy = True
+        # İş, ROI'lerin ve parametrelerin o anki kopyasıyla çalışır
+        self._executor.submit(self._recognize, stream, rois, pending, replace(stream.config.processing),
+                              captured_at)
+
+    def _is_stale(self, stream: StreamState) -> bool:
+        """Kare birkaç aralıktır yenilenmediyse tiki atla ve bir kez bildir"""
+        sequence, _, frame_time = stream.source.get_latest_frame()
+        now = time.monotonic()
+        if sequence != stream.frame_sequence:
+            stream.frame_sequence = sequence
+            stream.frame_seen_at = now
+        # Yakalama zamanı vermeyen kaynakta sıranın son ilerlediği an kullanılır
+        age = now - (frame_time or stream.frame_seen_at)
+        if age <= max(self.STALE_INTERVALS * stream.config.interval, self.STALE_MIN_SECONDS):
+            stream.stale = False
+            return False
+        stream.stale_skips += 1
+        if not stream.stale:
+            stream.stale = True
+            self._report(stream, f"Kare {age:.1f} s'dir yenilenmedi, okuma atlanıyor")
+        return True
+
+    def _recognize(self, stream: StreamState, rois: dict, pending: set, params, captured_at: datetime):
+        # Akış meşgulken zamanlayıcı okuyucuya dokunmaz; birleştirme burada yapılabilir
+        started = time.perf_counter()
+        try:
+            processed = stream.reader.preprocess(rois, stream.fields, params, pending)
+            results = stream.reader.recognize(processed, stream.fields, stream.config.language)
+            stream.ocr_runs += 1
+            stream.ocr_seconds += time.perf_counter() - started
+            self._emit(stream, stream.reader.merge(stream.fields, results), captured_at)
+        except Exception as e:
+            stream.failures += 1
+            # Alanlar bir sonraki tikte yeniden okunsun
+            stream.reader.invalidate(pending)
+            self._report(stream, str(e))
+        finally:
+            stream.busy = False
+
+    def _emit(self, stream: StreamState, readings: dict, captured_at: datetime):
+        # Nem alanı tanımlı değilse akışın sabit nemi kullanılır
+        data = MultiROIReader.build_record(stream.fields, readings, captured_at, {'humidity': stream.humidity})
+        if data is None:
+            return
+        stream.reads += 1
+        stream.last_value = data.temperature
+        stream.last_read_at = captured_at
+        self.on_reading(stream.config, data)
+
+    def _report(self, stream: StreamState, message: str):
+        stream.last_error = message
+        if self.on_error is not None:
+            self.on_error(stream.config.name, message)
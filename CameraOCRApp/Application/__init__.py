@@ -2,7 +2,19 @@
 Application katmanı - Uygulama mantığı ve ana pencere yönetimi
 """
 
-from .CameraOCRApp import CameraOCRApp
-from .MainWindow import MainWindow
+from .HeadlessApp import HeadlessApp
+from .Pipeline import PipelineStage, StagedPipeline
+from .StreamManager import StreamManager, StreamState
+from .ShardSupervisor import ShardSupervisor
 
-__all__ = ['CameraOCRApp', 'MainWindow']
\ No newline at end of file
+__all__ = ['CameraOCRApp', 'MainWindow', 'HeadlessApp', 'PipelineStage', 'StagedPipeline', 'StreamManager', 'StreamState', 'ShardSupervisor']
+
+def __getattr__(name):
+    # Qt arayüzü ilk erişimde yüklenir; başsız kip PyQt5'i hiç içe aktarmaz
+    if name == 'CameraOCRApp':
+        from .CameraOCRApp import CameraOCRApp
+        return CameraOCRApp
+    if name == 'MainWindow':
+        from .MainWindow import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
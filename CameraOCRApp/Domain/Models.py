@@ -1,6 +1,5 @@
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
-from PyQt5.QtCore import QRect
 from datetime import datetime
 import re
 
@@ -17,6 +16,10 @@ class ProcessingParams:
     adaptive_thresh: bool = False
     invert: bool = False
     denoise: int = 0
+    # spatial: fastNlMeansDenoising (güç = denoise); temporal: denoise + 1 karelik üstel ortalama
+    denoise_mode: str = "spatial"
+    # Tanımadan önce karakterlerin ölçekleneceği yükseklik (piksel); 0 = ölçekleme yok
+    glyph_height: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -30,13 +33,25 @@ class ProcessingParams:
             'gamma': self.gamma,
             'adaptive_thresh': self.adaptive_thresh,
             'invert': self.invert,
-            'denoise': self.denoise
+            'denoise': self.denoise,
+            'denoise_mode': self.denoise_mode,
+            'glyph_height': self.glyph_height
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
         return cls(**data)
 
+    def cache_key(self) -> tuple:
+        """Derlenmiş ön işleme planlarının önbellek anahtarı (alan sırasıyla)"""
+        return (self.contrast, self.brightness, self.sharpness, self.threshold,
+                self.blur, self.dilate, self.erode, self.gamma,
+                self.adaptive_thresh, self.invert, self.denoise, self.denoise_mode, self.glyph_height)
+
+    @classmethod
+    def from_key(cls, key: tuple):
+        return cls(*key)
+
 @dataclass
 class CameraConfig:
     index: int = 1
@@ -44,11 +59,60 @@ class CameraConfig:
     username: str = ""
     password: str = ""
     use_rtsp: bool = False
+    threaded_capture: bool = True
+
+def _default_selection_rect():
+    # Qt yalnızca arayüz varsayılan dikdörtgeni istediğinde yüklenir
+    from PyQt5.QtCore import QRect
+    return QRect(100, 100, 200, 150)
+
+def rect_to_tuple(rect) -> tuple:
+    """QRect veya (x, y, w, h) dizisini (x, y, w, h) demetine çevir"""
+    if hasattr(rect, 'getRect'):
+        return tuple(rect.getRect())
+    x, y, w, h = rect
+    return int(x), int(y), int(w), int(h)
+
+@dataclass
+class ROIField:
+    """Karedeki adlandırılmış bir okuma alanı; değeri bir SensorData alanına yazılır"""
+    name: str = "temperature"
+    # Arayüzde QRect, başsız kipte (x, y, genişlik, yükseklik) demeti
+    rect: Any = (100, 100, 200, 150)
+    sensor_field: str = "temperature"  # temperature veya humidity
+    parser: str = "number"  # number, temperature veya percent
+    engine: str = "auto"  # auto, line (tek satır rakam), block (serbest metin) veya segment (yedi segment)
+    # None ise ortak ProcessingParams kullanılır
+    processing: Optional[ProcessingParams] = None
 
 @dataclass
 class OCRConfig:
     language: str = "tur"
-    selection_rect: QRect = field(default_factory=lambda: QRect(100, 100, 200, 150))
+    backend: str = "auto"
+    change_gate: bool = True
+    change_threshold: float = 12.0
+    max_skip_seconds: float = 300.0
+    result_cache_size: int = 256
+    result_cache_ttl: float = 600.0
+    # Arayüzde QRect, başsız kipte (x, y, genişlik, yükseklik) demeti
+    selection_rect: Any = field(default_factory=_default_selection_rect)
+    # Aynı karedeki adlandırılmış alanlar; boşsa selection_rect tek sıcaklık alanıdır
+    fields: list = field(default_factory=list)
+    # Değişen alanlar tek tuvalde tek Tesseract çağrısıyla okunur
+    stitch_rois: bool = False
+    # Alan değeri son vote_frames OCR okumasının güvenle ağırlıklı oyu kararlıysa kaydedilir; 1 = her okuma
+    vote_frames: int = 1
+    vote_method: str = "vote"  # vote (ağırlıklı çoğunluk) veya median (ağırlıklı medyan)
+    # Güveni (0-1) bunun altında kalan okumalar oya katılmaz
+    min_confidence: float = 0.0
+    # median: medyana bu kadar yakın okumalar onu destekler
+    vote_tolerance: float = 0.5
+
+    def roi_fields(self) -> list:
+        """Her tikte okunacak ROIField listesi"""
+        if self.fields:
+            return self.fields
+        return [ROIField(name="temperature", rect=self.selection_rect)]
 
 @dataclass
 class DatabaseConfig:
@@ -60,6 +124,91 @@ class DatabaseConfig:
     is_remote: bool = False
     port: int = 1433
     connection_string: str = ""
+    batch_size: int = 50
+    batch_max_delay: float = 2.0
+    writer_queue_size: int = 1000
+    backpressure: str = "block"
+    spill_path: str = "sensor_spill.jsonl"
+    pool_size: int = 4
+    pool_idle_timeout: float = 300.0
+    pool_health_check_after: float = 30.0
+    reconnect_attempts: int = 5
+    reconnect_backoff: float = 0.5
+    reconnect_backoff_max: float = 30.0
+
+@dataclass
+class WebServiceConfig:
+    url: str = ""
+    connect_timeout: float = 3.05
+    read_timeout: float = 5.0
+    pool_connections: int = 4
+    pool_maxsize: int = 8
+    retries: int = 2
+    retry_backoff: float = 0.3
+    batch_mode: bool = False
+    batch_size: int = 50
+    batch_max_delay: float = 2.0
+    async_queue_size: int = 1000
+    max_in_flight: int = 4
+    max_attempts: int = 5
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 30.0
+    payload_format: str = "json"
+    compression: str = "none"
+    gzip_min_bytes: int = 512
+    gzip_level: int = 6
+
+@dataclass
+class StoreForwardConfig:
+    enabled: bool = True
+    path: str = "sensor_queue.db"
+    batch_size: int = 500
+    poll_interval: float = 0.5
+    retry_backoff: float = 1.0
+    retry_backoff_max: float = 60.0
+    # Geçici hatalarda bu kadar denemeden sonra okuma dead_readings tablosuna ayrılır; 0 = sınırsız
+    max_attempts: int = 100
+
+@dataclass
+class HeadlessConfig:
+    interval: float = 10.0
+    sink: str = "db"  # db, web veya none
+    web_url: str = ""
+    humidity: float = 70.0
+    # Bu aralıktaki sıcaklıklar kaydedilmez (arayüzdeki 0-50°C filtresi); None = filtre yok
+    skip_min: Optional[float] = None
+    skip_max: Optional[float] = None
+    # Aşamalı hat: yakalama, ön işleme, OCR ve hedef ayrı iş parçacıklarında örtüşür
+    pipeline: bool = False
+    ocr_workers: int = 1
+    queue_size: int = 4
+    drop_policy: str = "drop_oldest"
+    stats_interval: float = 60.0
+    # Çok kameralı kipte akışlar bu kadar yakalama sürecine dağıtılır; 0 = aynı süreçte
+    capture_processes: int = 0
+
+@dataclass
+class StreamConfig:
+    """Çok kameralı kipte tek bir akış: kendi kamerası, ROI alanları, parametreleri ve aralığı"""
+    name: str = "stream"
+    camera: CameraConfig = field(default_factory=CameraConfig)
+    roi: tuple = (100, 100, 200, 150)
+    # Aynı karedeki adlandırılmış alanlar; boşsa roi tek sıcaklık alanıdır
+    fields: list = field(default_factory=list)
+    processing: ProcessingParams = field(default_factory=ProcessingParams)
+    language: str = "eng"
+    interval: float = 10.0
+    # Nem alanı tanımlı değilse kaydedilen nem; None ise headless.humidity
+    humidity: Optional[float] = None
+    # Boşsa headless.web_url kullanılır
+    web_url: str = ""
+    enabled: bool = True
+
+    def roi_fields(self) -> list:
+        """Her tikte okunacak ROIField listesi"""
+        if self.fields:
+            return self.fields
+        return [ROIField(name="temperature", rect=self.roi)]
 
 @dataclass
 class SensorData:
@@ -73,6 +222,8 @@ class OCRSensorData:
     raw_text: str = ""
     temperature: Optional[float] = None
     is_valid: bool = False
+    # Motorun ortalama kelime güveni (0-1); bilinmiyorsa None
+    confidence: Optional[float] = None
     
     def parse_temperature_from_text(self, text: str) -> bool:
         """OCR metninden sadece sıcaklık değerini çıkar"""
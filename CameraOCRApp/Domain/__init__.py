@@ -2,6 +2,6 @@
 Domain katmanı - Veri modelleri ve iş kuralları
 """
 
-from .Models import ProcessingParams, CameraConfig, OCRConfig, DatabaseConfig, SensorData, OCRSensorData
+from .Models import ProcessingParams, CameraConfig, ROIField, OCRConfig, DatabaseConfig, WebServiceConfig, StoreForwardConfig, HeadlessConfig, StreamConfig, SensorData, OCRSensorData, rect_to_tuple
 
-__all__ = ['ProcessingParams', 'CameraConfig', 'OCRConfig', 'DatabaseConfig', 'SensorData', 'OCRSensorData']
\ No newline at end of file
+__all__ = ['ProcessingParams', 'CameraConfig', 'ROIField', 'OCRConfig', 'DatabaseConfig', 'WebServiceConfig', 'StoreForwardConfig', 'HeadlessConfig', 'StreamConfig', 'SensorData', 'OCRSensorData', 'rect_to_tuple']
\ No newline at end of file
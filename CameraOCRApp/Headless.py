@@ -0,0 +1,72 @@
+"""
+Başsız (PyQt5'siz) okuma servisi.
+
+Depo kök dizininden:
+    python -m CameraOCRApp.Headless --config site.yaml
+veya CameraOCRApp dizininden:
+    python Headless.py --config site.yaml
+
+Örnek site.yaml:
+    camera: {use_rtsp: true, rtsp_url: "rtsp://10.0.0.5:554/stream"}
+    ocr: {language: eng, roi: [100, 100, 200, 150]}
+    processing: {contrast: 2.0, threshold: 128}
+    database: {server: db01, database: SensorDB, username: sa, password: "..."}
+    headless: {interval: 10, sink: db}
+
+Aynı panelden birden çok değer (her tikte tek kayıt):
+    ocr:
+      language: eng
+      fields:
+        - {name: sicaklik, roi: [100, 100, 200, 80], sensor_field: temperature}
+        - {name: nem, roi: [100, 200, 200, 80], sensor_field: humidity, parser: percent}
+
+Çok kameralı kip (tek OCR havuzu ve tek hedef paylaşılır):
+    headless: {sink: db, ocr_workers: 4}
+    streams:
+      - {name: panel-01, camera: {use_rtsp: true, rtsp_url: "rtsp://10.0.0.11/s"}, roi: [80, 60, 220, 90], interval: 5}
+      - {name: panel-02, camera: {index: 0}, roi: [100, 100, 200, 150], processing: {threshold: 110}}
+
+Çok sayıda RTSP akışında kod çözme ayrı süreçlere dağıtılabilir (kareler
+paylaşımlı bellekle taşınır, OCR bu süreçte kalır):
+    headless: {sink: db, ocr_workers: 4, capture_processes: 4}
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+
+# Katman paketleri (Domain, Infrastructure ...) bu dizinden içe aktarılır
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from Application.HeadlessApp import HeadlessApp, load_site_config
+from Utils.TesseractUtils import setup_tesseract
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Kamera OCR okuma servisi (arayüzsüz)")
+    parser.add_argument('--config', required=True, help="YAML veya JSON ayar dosyası")
+    parser.add_argument('--log-level', default='INFO')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(),
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    if not setup_tesseract():
+        return 1
+
+    try:
+        app = HeadlessApp(load_site_config(args.config))
+    except (OSError, ValueError, TypeError) as e:
+        logging.error("Ayar dosyası okunamadı: %s", e)
+        return 1
+
+    # Ctrl+C ve servis yöneticisinin SIGTERM'i döngüyü düzgünce kapatır
+    signal.signal(signal.SIGINT, lambda *_: app.stop())
+    signal.signal(signal.SIGTERM, lambda *_: app.stop())
+    return app.run()
+
+if __name__ == '__main__':
+    sys.exit(main())
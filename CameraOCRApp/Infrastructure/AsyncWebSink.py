@@ -0,0 +1,192 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from Domain.Models import SensorData
+
+class AsyncWebSink:
+    """Kendi iş parçacığında asyncio döngüsüyle çalışan sınırlı kuyruklu web gönderici.
+
+    ``submit`` yalnızca kuyruğa bırakır; istekler WebService oturumu üzerinden
+    bir iş parçacığı havuzunda en fazla ``max_in_flight`` eşzamanlı olarak
+    gönderilir. Toplu kipte ilk okumadan sonra ``batch_max_delay`` saniye
+    boyunca (en fazla ``batch_size`` okumaya kadar) gelenler aynı isteğe
+    eklenir. Bağlantı hatası, bağlantı zaman aşımı ve 5xx yanıtları rastgele
+    sapmalı üstel geri çekilmeyle tekrar denenir (tek tekrar katmanı budur;
+    okuma zaman aşımı tekrarlanmaz); bekleyen tekrar denemeler eşzamanlılık
+    hakkı tutmaz. Sonuçlar geri çağırmalarla bildirilir (UI bunları Qt
+    sinyallerine bağlar).
+    """
+
+    def __init__(self, web_service, max_queue: int = 1000, max_in_flight: int = 4,
+                 max_attempts: int = 5, retry_base_delay: float = 0.5, retry_max_delay: float = 30.0,
+                 drain_timeout: float = 5.0, on_result=None, on_dropped=None):
+        self.web_service = web_service
+        self.max_queue = max_queue
+        self.max_in_flight = max_in_flight
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.drain_timeout = drain_timeout
+        # on_result(items, url, success, message), on_dropped(data, reason)
+        self.on_result = on_result
+        self.on_dropped = on_dropped
+
+        self._loop = None
+        self._queue = None
+        self._in_flight = None
+        self._executor = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._depth = 0  # kuyrukta veya tekrar denemede bekleyen okuma sayısı
+        self._active = 0
+        self._latencies = deque(maxlen=200)
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._ready.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="AsyncWebSink")
+        self._thread = threading.Thread(target=self._run, name="AsyncWebSink", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self, timeout: float = None):
+        """Kuyruktakileri ``drain_timeout`` süresince göndermeyi dene, sonra döngüyü kapat"""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+        self._thread.join(timeout or self.drain_timeout + 5.0)
+        self._thread = None
+        self._executor.shutdown(wait=False)
+
+    def submit(self, data: SensorData, url: str) -> bool:
+        """Okumayı kuyruğa bırak; kuyruk doluysa düşürülür. Hiçbir zaman bloklamaz"""
+        if self._thread is None:
+            return False
+        with self._stats_lock:
+            full = self._depth >= self.max_queue
+            if not full:
+                self._depth += 1
+        if full:
+            with self._stats_lock:
+                self.dropped += 1
+            if self.on_dropped is not None:
+                self.on_dropped(data, "Web kuyruğu dolu, okuma düşürüldü")
+            return False
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (data, url))
+        return True
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            return {
+                'queue_depth': self._depth,
+                'in_flight': self._active,
+                'sent': self.sent,
+                'failed': self.failed,
+                'retried': self.retried,
+                'dropped': self.dropped,
+                'latency_avg_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                'latency_p95_ms': latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+            }
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        self._queue = asyncio.Queue()
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._ready.set()
+        tasks = set()
+
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            items = [item]
+            # Toplu kipte satır sayısı veya bekleme süresi sınırına kadar gelenler tek istekte gönderilir
+            config = self.web_service.config
+            limit = config.batch_size if config.batch_mode else 1
+            deadline = loop.time() + config.batch_max_delay
+            while len(items) < limit:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    extra = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if extra is None:
+                    stopping = True
+                    break
+                items.append(extra)
+
+            by_url = {}
+            for data, url in items:
+                by_url.setdefault(url, []).append(data)
+            for url, readings in by_url.items():
+                task = asyncio.ensure_future(self._deliver(readings, url, limit > 1))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=self.drain_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _deliver(self, items, url: str, batch: bool):
+        loop = asyncio.get_running_loop()
+        message = ""
+        success = False
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                async with self._in_flight:
+                    with self._stats_lock:
+                        self._active += 1
+                    started = time.perf_counter()
+                    try:
+                        response = await loop.run_in_executor(self._executor, self.web_service.post_readings,
+                                                              items, url, batch)
+                        success, message, retryable = True, response.text, False
+                    except Exception as e:
+                        success, message = False, f"Web Servis bağlantı hatası: {e}"
+                        retryable = self.web_service.is_retryable(e)
+                    finally:
+                        with self._stats_lock:
+                            self._active -= 1
+                            self._latencies.append(time.perf_counter() - started)
+
+                if success or not retryable or attempt == self.max_attempts:
+                    break
+                with self._stats_lock:
+                    self.retried += 1
+                # Tam rastgele sapma: tüm istemciler aynı anda tekrar denemesin
+                delay = min(self.retry_base_delay * 2 ** (attempt - 1), self.retry_max_delay)
+                await asyncio.sleep(random.uniform(0, delay))
+        except asyncio.CancelledError:
+            success, message = False, "Kapanışta gönderilemedi"
+        finally:
+            with self._stats_lock:
+                self._depth -= len(items)
+                if success:
+                    self.sent += len(items)
+                else:
+                    self.failed += len(items)
+            if self.on_result is not None:
+                self.on_result(items, url, success, message)
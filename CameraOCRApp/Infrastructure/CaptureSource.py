@@ -0,0 +1,141 @@
+import time
+import cv2
+from Domain.Models import CameraConfig
+from Infrastructure.FrameGrabber import FrameGrabber
+
+class CaptureSource:
+    """Qt'ye bağımlı olmayan kamera/RTSP kaynağı.
+
+    CameraService bu sınıfı Qt sinyalleriyle sarar; başsız kip doğrudan bunu
+    kullanır ve yeni kareler ile hatalar ``on_frame(frame)`` ve
+    ``on_error(mesaj)`` geri çağırmalarıyla bildirilir. ``on_error`` yakalama
+    iş parçacığından da çağrılabilir.
+    """
+
+    def __init__(self, on_frame=None, on_error=None):
+        super().__init__()
+        self.on_frame = on_frame
+        self.on_error = on_error
+        self.cap = None
+        self.grabber = None
+        self.current_frame = None
+        self.config = CameraConfig()
+        self.is_running = False
+        self._last_sequence = 0
+        self._last_captured_at = 0.0
+
+    def _frame_ready(self, frame):
+        if self.on_frame is not None:
+            self.on_frame(frame)
+
+    def _report_error(self, message: str):
+        if self.on_error is not None:
+            self.on_error(message)
+
+    def get_available_cameras(self):
+        cameras = []
+        for i in range(10):
+            cap = cv2.VideoCapture(i)
+            if cap.isOpened():
+                cameras.append(f"Kamera {i}")
+                cap.release()
+        return cameras
+
+    def start_camera(self, config: CameraConfig):
+        self.config = config
+        self.stop_camera()
+
+        if config.use_rtsp and not config.rtsp_url.strip():
+            self._report_error("Lütfen RTSP URL girin!")
+            return False
+
+        cap = self._open_capture(config)
+        if not cap.isOpened():
+            cap.release()
+            self._report_error("Kamera açılamadı! Bağlantıyı kontrol edin.")
+            return False
+
+        if config.threaded_capture:
+            # VideoCapture artık yakalama iş parçacığına ait
+            self.grabber = FrameGrabber(cap,
+                                        reopen=lambda: self._open_capture(config),
+                                        on_error=self._report_error)
+            self.grabber.start()
+        else:
+            self.cap = cap
+
+        self._last_sequence = 0
+        self._last_captured_at = 0.0
+        self.is_running = True
+        return True
+
+    def _open_capture(self, config: CameraConfig):
+        if config.use_rtsp:
+            rtsp_url = config.rtsp_url.strip()
+            username = config.username.strip()
+            password = config.password.strip()
+
+            if username and password:
+                if "://" in rtsp_url:
+                    protocol, rest = rtsp_url.split("://", 1)
+                    rtsp_url = f"{protocol}://{username}:{password}@{rest}"
+                else:
+                    rtsp_url = f"{username}:{password}@{rtsp_url}"
+
+            return cv2.VideoCapture(rtsp_url)
+
+        return cv2.VideoCapture(config.index)
+
+    def stop_camera(self):
+        self.is_running = False
+        if self.grabber is not None:
+            self.grabber.stop()
+            self.grabber = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def read_frame(self):
+        if self.grabber is not None and self.is_running:
+            # Eşzamanlı yakalama: yalnızca yeni bir kare geldiyse yayınla, asla bekleme
+            sequence, frame, _ = self.grabber.latest()
+            if frame is None or sequence == self._last_sequence:
+                return None
+            self._last_sequence = sequence
+            self.current_frame = frame
+            self._frame_ready(frame)
+            return frame
+
+        if self.cap is not None and self.is_running:
+            ret, frame = self.cap.read()
+            if ret:
+                # Eşzamanlı okumada da sıra ilerler ki donmuş kare ile yeni kare ayırt edilebilsin
+                self._last_sequence += 1
+                self._last_captured_at = time.monotonic()
+                self.current_frame = frame
+                self._frame_ready(frame)
+                return frame
+            else:
+                self._report_error("Görüntü alınamıyor. Bağlantıyı kontrol edin.")
+        return None
+
+    def get_frame(self):
+        if self.grabber is not None:
+            frame = self.grabber.get_frame()
+            if frame is not None:
+                return frame
+        return self.current_frame
+
+    def read_roi(self, rect):
+        """En son karedeki (x, y, w, h) alanının görünümü; kareler yerinde değiştirilmez"""
+        frame = self.get_frame()
+        if frame is None:
+            return None
+        x, y, w, h = rect
+        return frame[y:y+h, x:x+w]
+
+    def get_latest_frame(self):
+        """(sıra numarası, kare, yakalama zamanı) döndür; zaman monotonic saniyedir"""
+        if self.grabber is not None:
+            return self.grabber.latest()
+        return self._last_sequence, self.current_frame, self._last_captured_at
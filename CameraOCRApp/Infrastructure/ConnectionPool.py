@@ -0,0 +1,197 @@
+import random
+import threading
+import time
+import pyodbc
+
+class ConnectionPool:
+    """Sağlık kontrollü, boşta kalma süreli ve otomatik yeniden bağlanan küçük bağlantı havuzu.
+
+    Her iş parçacığı ödünç aldığı bağlantıyı tek başına kullanır; kopmuş bir
+    bağlantı ``discard`` ile atılır ve bir sonraki ``acquire`` üstel geri
+    çekilmeyle yeni bağlantı kurar. Böylece sunucu yeniden başladığında işlemler
+    kullanıcı "bağlan"a basmadan devam eder.
+    """
+
+    # ODBC bağlantı hatası SQLSTATE önekleri / kodları
+    CONNECTION_SQLSTATES = ('08', 'HYT00', 'HYT01', '01002')
+
+    def __init__(self, factory, max_size: int = 4, idle_timeout: float = 300.0,
+                 health_check_after: float = 30.0, max_attempts: int = 5,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self._factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._idle = []  # (bağlantı, son kullanım zamanı)
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self.created = 0
+        self.reconnects = 0
+
+    def acquire(self, timeout: float = 30.0, max_attempts: int = None):
+        """Boşta bir bağlantı ver; yoksa (sınır izin veriyorsa) yenisini kur"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Bağlantı havuzu kapatıldı")
+                self._prune_idle()
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._in_use < self.max_size:
+                    connection, last_used = None, None
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Havuzda boş bağlantı yok")
+                self._condition.wait(remaining)
+
+        # Sağlık kontrolü ve bağlantı kurma kilit dışında yapılır
+        try:
+            if connection is not None and time.monotonic() - last_used > self.health_check_after:
+                if not self._is_healthy(connection):
+                    self._close_quietly(connection)
+                    self.reconnects += 1
+                    connection = None
+            if connection is None:
+                connection = self._connect_with_backoff(max_attempts or self.max_attempts)
+            return connection
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection):
+        """Sağlam bağlantıyı havuza geri koy"""
+        with self._condition:
+            self._in_use -= 1
+            if self._closed:
+                self._close_quietly(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def discard(self, connection):
+        """Bozuk bağlantıyı kapat; yerine gerektiğinde yenisi kurulur"""
+        self._close_quietly(connection)
+        with self._condition:
+            self._in_use -= 1
+            self.reconnects += 1
+            self._condition.notify()
+
+    def run(self, operation, retries: int = 1, max_attempts: int = None):
+        """``operation(connection)`` çalıştır; bağlantı koptuysa yeni bağlantıyla tekrar dene.
+
+        Bir bağlantı koptuğunda boştakiler de aynı kopukluktan etkilenmiş
+        sayılır ve kapatılır; yeniden deneme böylece eski bir bağlantıya değil
+        yeni kurulan bağlantıya gider. Commit'i sunucuya ulaşmış olabilecek
+        yazmalar ``retries=0`` ile çağrılmalıdır.
+        """
+        for attempt in range(retries + 1):
+            connection = self.acquire(max_attempts=max_attempts)
+            try:
+                result = operation(connection)
+            except Exception as e:
+                if self.is_connection_error(e):
+                    self.discard(connection)
+                    self._close_idle()
+                    if attempt < retries:
+                        continue
+                else:
+                    self._rollback_quietly(connection)
+                    self.release(connection)
+                raise
+            self.release(connection)
+            return result
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._close_idle()
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'created': self.created,
+                'reconnects': self.reconnects,
+            }
+
+    @classmethod
+    def is_connection_error(cls, error: Exception) -> bool:
+        if isinstance(error, (pyodbc.OperationalError, pyodbc.InterfaceError)):
+            return True
+        if isinstance(error, pyodbc.Error) and error.args:
+            sqlstate = str(error.args[0])
+            return sqlstate.startswith(cls.CONNECTION_SQLSTATES)
+        return False
+
+    def _connect_with_backoff(self, max_attempts: int):
+        delay = self.backoff_base
+        for attempt in range(1, max(max_attempts, 1) + 1):
+            try:
+                connection = self._factory()
+                self.created += 1
+                return connection
+            except Exception:
+                if attempt >= max_attempts or self._closed:
+                    raise
+                # Tüm istemciler aynı anda yüklenmesin diye rastgele sapma eklenir
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2, self.backoff_max)
+
+    def _close_idle(self):
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    def _prune_idle(self):
+        if self.idle_timeout <= 0:
+            return
+        now = time.monotonic()
+        fresh = []
+        for connection, last_used in self._idle:
+            if now - last_used > self.idle_timeout:
+                self._close_quietly(connection)
+            else:
+                fresh.append((connection, last_used))
+        self._idle = fresh
+
+    @staticmethod
+    def ping(connection):
+        """Ucuz sağlık sorgusu; bağlantı kopmuşsa hata fırlatır"""
+        connection.cursor().execute("SELECT 1").fetchall()
+
+    @classmethod
+    def _is_healthy(cls, connection) -> bool:
+        try:
+            cls.ping(connection)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _rollback_quietly(connection):
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -1,16 +1,33 @@
+import threading
+import time
 import pyodbc
-from typing import List, Optional
-from datetime import datetime
+from typing import List
 from Domain.Models import DatabaseConfig, SensorData
+from Infrastructure.ConnectionPool import ConnectionPool
+from Infrastructure.DatabaseWriter import DatabaseWriter
 
 class DatabaseService:
+    INSERT_SQL = """
+        INSERT INTO SensorData (Temperature, Humidity, Timestamp)
+        VALUES (?, ?, ?)
+    """
+
     def __init__(self):
-        self.connection = None
+        self.pool = None
         self.config = DatabaseConfig()
+        # Yazma tamponu: (SensorData, geri çağırma) çiftleri
+        self._pending = []
+        self._pending_since = None
+        self._buffer_lock = threading.Lock()
+        self.writer = None
         
     def test_connection(self, config: DatabaseConfig) -> tuple[bool, str]:
         """Veritabanı bağlantısını test et"""
         try:
+            # Aynı ayarlarla açık bir havuz varsa yeniden oturum açmak yerine onu kullan
+            if self.pool is not None and config == self.config:
+                self.pool.run(ConnectionPool.ping, max_attempts=1)
+                return True, "Bağlantı başarılı! (havuzdan)"
             conn = self._create_connection(config)
             if conn:
                 conn.close()
@@ -42,35 +59,56 @@ class DatabaseService:
                     """
             
             return pyodbc.connect(conn_str)
+        except pyodbc.Error:
+            # Bağlantı hatası türü korunur, havuz yeniden denemeye karar verebilsin
+            raise
         except Exception as e:
             raise Exception(f"Bağlantı hatası: {str(e)}")
     
     def connect(self, config: DatabaseConfig) -> tuple[bool, str]:
         """Veritabanına bağlan"""
         try:
+            self._close_pool()
             self.config = config
-            self.connection = self._create_connection(config)
+            pool = ConnectionPool(lambda: self._create_connection(config),
+                                  max_size=config.pool_size,
+                                  idle_timeout=config.pool_idle_timeout,
+                                  health_check_after=config.pool_health_check_after,
+                                  max_attempts=config.reconnect_attempts,
+                                  backoff_base=config.reconnect_backoff,
+                                  backoff_max=config.reconnect_backoff_max)
+            # İlk bağlantı hemen kurulur ki ayar hataları kullanıcıya anında dönsün
+            pool.release(pool.acquire(max_attempts=1))
+            self.pool = pool
             return True, "Bağlantı başarılı!"
         except Exception as e:
             return False, f"Bağlantı hatası: {str(e)}"
     
     def disconnect(self):
-        """Bağlantıyı kes"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Bağlantıyı kes; kuyrukta ve tamponda bekleyen satırlar önce yazılır"""
+        self.stop_writer()
+        self.flush()
+        self._close_pool()
+
+    def _close_pool(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
     
     def is_connected(self) -> bool:
         """Bağlantı durumunu kontrol et"""
-        return self.connection is not None
+        return self.pool is not None
+
+    def pool_stats(self) -> dict:
+        return self.pool.stats() if self.pool is not None else {}
     
     def create_table(self):
         """SensorData tablosunu oluştur"""
-        if not self.connection:
+        if not self.pool:
             return False, "Önce bağlantı kurulmalı"
         
-        try:
-            cursor = self.connection.cursor()
+        def create(connection):
+            cursor = connection.cursor()
             cursor.execute("""
                 IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='SensorData' AND xtype='U')
                 CREATE TABLE SensorData (
@@ -80,74 +118,172 @@ class DatabaseService:
                     Timestamp DATETIME2 NOT NULL
                 )
             """)
-            self.connection.commit()
+            connection.commit()
+
+        try:
+            # Arayüz iş parçacığından çağrılır; geri çekilmeli yeniden bağlanma arayüzü dondurmasın
+            self.pool.run(create, max_attempts=1)
             return True, "Tablo oluşturuldu/var"
         except Exception as e:
             return False, f"Tablo oluşturma hatası: {str(e)}"
     
     def insert_sensor_data(self, data: SensorData) -> tuple[bool, str]:
         """Sensör verisi ekle"""
-        if not self.connection:
+        if not self.pool:
             return False, "Önce bağlantı kurulmalı"
         
+        def insert(connection):
+            cursor = connection.cursor()
+            cursor.execute(self.INSERT_SQL, data.temperature, data.humidity, data.timestamp)
+            connection.commit()
+
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                INSERT INTO SensorData (Temperature, Humidity, Timestamp)
-                VALUES (?, ?, ?)
-            """, data.temperature, data.humidity, data.timestamp)
-            
-            self.connection.commit()
+            # Bağlantı commit'ten sonra koparsa satır yazılmış olabilir; tekrar satırı çoğaltır
+            self.pool.run(insert, retries=0)
             return True, "Veri başarıyla eklendi"
         except Exception as e:
             return False, f"Veri ekleme hatası: {str(e)}"
+
+    def insert_sensor_data_batch(self, items: List[SensorData]) -> tuple[bool, str]:
+        """Birden çok satırı tek executemany ve tek commit ile ekle"""
+        if not self.pool:
+            return False, "Önce bağlantı kurulmalı"
+        if not items:
+            return True, "Eklenecek veri yok"
+        
+        def insert(connection):
+            cursor = connection.cursor()
+            # Parametre dizisi tek seferde sunucuya gönderilir (satır başına gidiş-dönüş yok)
+            cursor.fast_executemany = True
+            cursor.executemany(self.INSERT_SQL,
+                               [(d.temperature, d.humidity, d.timestamp) for d in items])
+            connection.commit()
+
+        try:
+            # Bağlantı commit'ten sonra koparsa satırlar yazılmış olabilir; otomatik tekrar
+            # satırları çoğaltır. Başarısız toplu iş çağırana döner (yazıcı/kalıcı kuyruk karar verir)
+            self.pool.run(insert, retries=0)
+            return True, f"{len(items)} kayıt başarıyla eklendi"
+        except Exception as e:
+            return False, f"Toplu veri ekleme hatası: {str(e)}"
+
+    def enqueue_sensor_data(self, data: SensorData, callback=None) -> bool:
+        """Satırı yazma tamponuna al; satır sayısı dolunca tampon hemen yazılır.
+
+        ``callback(data, success, message)`` satırın içinde bulunduğu toplu
+        işlem commit edildiğinde (veya başarısız olduğunda) çağrılır. Tampon bu
+        çağrıda yazıldıysa True döner.
+        """
+        with self._buffer_lock:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append((data, callback))
+            full = len(self._pending) >= max(self.config.batch_size, 1)
+        if full:
+            self.flush()
+        return full
+
+    def flush_if_due(self) -> bool:
+        """Satır sayısı veya bekleme süresi sınırı aşıldıysa tamponu yaz"""
+        with self._buffer_lock:
+            due = bool(self._pending) and (
+                len(self._pending) >= self.config.batch_size
+                or time.monotonic() - self._pending_since >= self.config.batch_max_delay)
+        if due:
+            self.flush()
+        return due
+
+    def flush(self) -> tuple[bool, str]:
+        """Tampondaki tüm satırları tek toplu işlemde yaz ve satır başına onay ver"""
+        with self._buffer_lock:
+            batch, self._pending = self._pending, []
+            self._pending_since = None
+        if not batch:
+            return True, "Tampon boş"
+
+        success, message = self.insert_sensor_data_batch([data for data, _ in batch])
+        for data, callback in batch:
+            if callback is not None:
+                callback(data, success, message)
+        return success, message
+
+    def pending_count(self) -> int:
+        with self._buffer_lock:
+            return len(self._pending)
     
     def get_all_data(self) -> List[SensorData]:
         """Tüm sensör verilerini getir"""
-        if not self.connection:
+        if not self.pool:
             return []
         
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT Id, Temperature, Humidity, Timestamp FROM SensorData ORDER BY Timestamp DESC")
-            
-            results = []
-            for row in cursor.fetchall():
-                results.append(SensorData(
-                    id=row.Id,
-                    temperature=row.Temperature,
-                    humidity=row.Humidity,
-                    timestamp=row.Timestamp
-                ))
-            
-            return results
+            return self.pool.run(lambda connection: self._fetch_records(
+                connection, "SELECT Id, Temperature, Humidity, Timestamp FROM SensorData ORDER BY Timestamp DESC"))
         except Exception as e:
             print(f"Veri getirme hatası: {str(e)}")
             return []
     
-    def get_last_n_records(self, n: int = 10) -> List[SensorData]:
-        """Son n kaydı getir"""
-        if not self.connection:
+    def get_last_n_records(self, n: int = 10, max_attempts: int = None) -> List[SensorData]:
+        """Son n kaydı getir; arayüz iş parçacığından ``max_attempts=1`` ile çağrılmalı"""
+        if not self.pool:
             return []
         
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
+            return self.pool.run(lambda connection: self._fetch_records(connection, """
                 SELECT TOP (?) Id, Temperature, Humidity, Timestamp 
                 FROM SensorData 
                 ORDER BY Timestamp DESC
-            """, n)
-            
-            results = []
-            for row in cursor.fetchall():
-                results.append(SensorData(
-                    id=row.Id,
-                    temperature=row.Temperature,
-                    humidity=row.Humidity,
-                    timestamp=row.Timestamp
-                ))
-            
-            return results
+            """, n), max_attempts=max_attempts)
         except Exception as e:
             print(f"Veri getirme hatası: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def _fetch_records(connection, sql: str, *params) -> List[SensorData]:
+        cursor = connection.cursor()
+        cursor.execute(sql, *params)
+        
+        results = []
+        for row in cursor.fetchall():
+            results.append(SensorData(
+                id=row.Id,
+                temperature=row.Temperature,
+                humidity=row.Humidity,
+                timestamp=row.Timestamp
+            ))
+        
+        return results
+
+    def start_writer(self, on_result=None, on_records=None, on_dropped=None):
+        """Arka plan yazıcısını başlat; geri çağırmalar yazıcı iş parçacığından çağrılır"""
+        self.stop_writer()
+        self.writer = DatabaseWriter(self,
+                                     max_queue=self.config.writer_queue_size,
+                                     policy=self.config.backpressure,
+                                     spill_path=self.config.spill_path,
+                                     on_result=on_result,
+                                     on_records=on_records,
+                                     on_dropped=on_dropped)
+        self.writer.start()
+
+    def stop_writer(self):
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
+
+    def submit_sensor_data(self, data: SensorData) -> bool:
+        """Okumayı bloklamadan yazıcı kuyruğuna bırak"""
+        if self.writer is None:
+            return False
+        return self.writer.submit(data)
+
+    def request_refresh(self, n: int = 20) -> bool:
+        """Son n kaydı arka planda oku; yazıcı yoksa False"""
+        if self.writer is None:
+            return False
+        self.writer.request_refresh(n)
+        return True
+
+    def close(self):
+        """Uygulama kapanırken tamponu boşalt ve bağlantıyı kapat"""
+        self.disconnect()
\ No newline at end of file
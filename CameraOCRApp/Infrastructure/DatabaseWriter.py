@@ -0,0 +1,204 @@
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+from Domain.Models import SensorData
+
+class DatabaseWriter:
+    """DatabaseService yazma tamponunu arka plan iş parçacığında işleten sınırlı kuyruk.
+
+    GUI yalnızca ``submit`` ile kuyruğa bırakır; toplu INSERT, commit ve son
+    kayıtların okunması bu iş parçacığında yapılır. Sonuçlar geri çağırmalarla
+    bildirilir (UI bunları Qt sinyallerine bağlar, geri çağırmalar bu iş
+    parçacığından çalışır).
+
+    Kuyruk dolduğunda davranış ``policy`` ile seçilir:
+      - block: en fazla ``block_timeout`` saniye bekle, sonra okumayı düşür
+      - drop_oldest: kuyruktaki en eski okumayı düşür
+      - spill: okumayı diske (JSON satırları) yaz, kuyruk boşalınca geri oku
+    """
+
+    POLICY_BLOCK = "block"
+    POLICY_DROP_OLDEST = "drop_oldest"
+    POLICY_SPILL = "spill"
+    POLICIES = [POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_SPILL]
+
+    def __init__(self, database_service, max_queue: int = 1000, policy: str = POLICY_BLOCK,
+                 spill_path: str = "sensor_spill.jsonl", block_timeout: float = 1.0,
+                 refresh_count: int = 20, on_result=None, on_records=None, on_dropped=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Bilinmeyen geri basınç politikası: {policy}")
+        self.database_service = database_service
+        self.policy = policy
+        self.spill_path = spill_path
+        self.block_timeout = block_timeout
+        self.refresh_count = refresh_count
+        self.on_result = on_result
+        self.on_records = on_records
+        self.on_dropped = on_dropped
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._spill_lock = threading.Lock()
+        self._spilled = 0
+        self._dropped = 0
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return
+        # Önceki çalışmadan kalan taşma dosyası ilk boşlukta geri yüklenir
+        if os.path.exists(self.spill_path):
+            with open(self.spill_path, 'r', encoding='utf-8') as handle:
+                self._spilled = sum(1 for line in handle if line.strip())
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="DatabaseWriter", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Kuyruktakileri yazıp iş parçacığını durdur; en fazla ``timeout`` saniye bekler"""
+        if not self._running:
+            return
+        self._running = False
+        try:
+            self._queue.put(('stop', None), timeout=timeout)
+        except queue.Full:
+            # Kuyruk doluysa (ör. veritabanı yavaş) iş parçacığı _running ile durur
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, data: SensorData) -> bool:
+        """Okumayı kuyruğa bırak; kuyruk doluysa politika uygulanır. Asla uzun süre bloklamaz"""
+        try:
+            self._queue.put_nowait(('row', data))
+            return True
+        except queue.Full:
+            pass
+
+        if self.policy == self.POLICY_SPILL:
+            self._spill(data)
+            return True
+
+        if self.policy == self.POLICY_DROP_OLDEST:
+            try:
+                kind, oldest = self._queue.get_nowait()
+                if kind == 'row':
+                    self._drop(oldest, "Kuyruk dolu, en eski okuma düşürüldü")
+                else:
+                    self._queue.put_nowait((kind, oldest))
+            except (queue.Empty, queue.Full):
+                pass
+            try:
+                self._queue.put_nowait(('row', data))
+                return True
+            except queue.Full:
+                self._drop(data, "Kuyruk dolu, okuma düşürüldü")
+                return False
+
+        try:
+            self._queue.put(('row', data), timeout=self.block_timeout)
+            return True
+        except queue.Full:
+            self._drop(data, "Kuyruk dolu, bekleme süresi aşıldı")
+            return False
+
+    def request_refresh(self, count: int = None):
+        """Son kayıtları arka planda oku; sonuç ``on_records`` ile gelir"""
+        try:
+            self._queue.put_nowait(('refresh', count or self.refresh_count))
+        except queue.Full:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            'queued': self._queue.qsize(),
+            'pending': self.database_service.pending_count(),
+            'spilled': self._spilled,
+            'dropped': self._dropped,
+        }
+
+    def _run(self):
+        service = self.database_service
+        while self._running:
+            timeout = max(min(service.config.batch_max_delay, 0.5), 0.05)
+            try:
+                kind, payload = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind, payload = None, None
+
+            if kind == 'row':
+                if service.enqueue_sensor_data(payload, self._acknowledge):
+                    self._refresh()
+            elif kind == 'refresh':
+                self._refresh(payload)
+            elif kind == 'stop':
+                break
+
+            if service.flush_if_due():
+                self._refresh()
+            if self._queue.empty() and self._spilled:
+                self._replay_spill()
+
+        # Kapanışta bekleyen her şey yazılır
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'row':
+                service.enqueue_sensor_data(payload, self._acknowledge)
+        service.flush()
+
+    def _acknowledge(self, data, success, message):
+        if self.on_result is not None:
+            self.on_result(data, success, message)
+
+    def _refresh(self, count: int = None):
+        count = count or self.refresh_count
+        if count and self.on_records is not None:
+            self.on_records(self.database_service.get_last_n_records(count))
+
+    def _drop(self, data, reason: str):
+        self._dropped += 1
+        if self.on_dropped is not None:
+            self.on_dropped(data, reason)
+
+    def _spill(self, data: SensorData):
+        record = {
+            'temperature': data.temperature,
+            'humidity': data.humidity,
+            'timestamp': data.timestamp.isoformat(),
+        }
+        with self._spill_lock:
+            with open(self.spill_path, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(record) + '\n')
+            self._spilled += 1
+
+    def _replay_spill(self):
+        """Diske taşan okumaları sırayla geri yükle"""
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path):
+                self._spilled = 0
+                return
+            with open(self.spill_path, 'r', encoding='utf-8') as handle:
+                lines = handle.readlines()
+            os.remove(self.spill_path)
+            self._spilled = 0
+
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                data = SensorData(temperature=record['temperature'],
+                                  humidity=record['humidity'],
+                                  timestamp=datetime.fromisoformat(record['timestamp']))
+            except (ValueError, KeyError, TypeError):
+                # Yarım yazılmış satır (ör. çökme sırasında) yazıcıyı durdurmasın
+                self._dropped += 1
+                continue
+            if self.database_service.enqueue_sensor_data(data, self._acknowledge):
+                self._refresh()
@@ -0,0 +1,140 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Tuple
+from Domain.Models import SensorData
+
+class DurableReadingQueue:
+    """Okumaların hedefe gönderilmeden önce yazıldığı SQLite (WAL) tabanlı kalıcı kuyruk.
+
+    Satırlar yalnızca hedef onayladıktan sonra (``ack``) silinir; süreç çökerse
+    onaylanmamış okumalar bir sonraki açılışta kaldığı yerden gönderilir.
+    Hiçbir zaman iletilemeyecek satırlar ``dead_readings`` tablosuna taşınır ki
+    hedefin kuyruğunu tıkamasınlar.
+    """
+
+    def __init__(self, path: str = "sensor_queue.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        # Bağlantı GUI ve boşaltıcı iş parçacıkları arasında kilitle paylaşılır
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # WAL ile NORMAL, süreç çökmesine karşı dayanıklıdır ve her eklemede fsync yapmaz
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS readings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sink TEXT NOT NULL,
+                target TEXT NOT NULL DEFAULT '',
+                temperature REAL NOT NULL,
+                humidity REAL NOT NULL,
+                timestamp TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS readings_sink ON readings (sink, id)")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS dead_readings (
+                id INTEGER PRIMARY KEY,
+                sink TEXT NOT NULL,
+                target TEXT NOT NULL DEFAULT '',
+                temperature REAL NOT NULL,
+                humidity REAL NOT NULL,
+                timestamp TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                reason TEXT NOT NULL DEFAULT '',
+                failed_at TEXT NOT NULL
+            )
+        """)
+
+    def append(self, data: SensorData, sink: str, target: str = "") -> int:
+        """Okumayı kuyruğun sonuna ekle ve satır kimliğini döndür"""
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO readings (sink, target, temperature, humidity, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (sink, target or "", data.temperature, data.humidity, data.timestamp.isoformat()))
+            return cursor.lastrowid
+
+    def peek_batch(self, sink: str, limit: int = 500) -> List[Tuple[int, SensorData, str]]:
+        """Hedefin en eski ``limit`` okumasını sırayla döndür (silmeden)"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, target, temperature, humidity, timestamp FROM readings "
+                "WHERE sink = ? ORDER BY id LIMIT ?", (sink, limit)).fetchall()
+        return [(row_id,
+                 SensorData(temperature=temperature, humidity=humidity,
+                            timestamp=datetime.fromisoformat(timestamp)),
+                 target)
+                for row_id, target, temperature, humidity, timestamp in rows]
+
+    def ack(self, ids: List[int]):
+        """Hedefin onayladığı okumaları kuyruktan sil"""
+        if not ids:
+            return
+        with self._lock:
+            self._connection.execute("BEGIN")
+            self._connection.executemany("DELETE FROM readings WHERE id = ?", [(i,) for i in ids])
+            self._connection.execute("COMMIT")
+
+    def mark_failed(self, ids: List[int], max_attempts: int = None, reason: str = "") -> List[int]:
+        """Deneme sayısını artır; ``max_attempts``'a ulaşan satırları ayır ve kimliklerini döndür"""
+        if not ids:
+            return []
+        with self._lock:
+            self._connection.execute("BEGIN")
+            self._connection.executemany("UPDATE readings SET attempts = attempts + 1 WHERE id = ?",
+                                         [(i,) for i in ids])
+            dead = []
+            if max_attempts:
+                placeholders = ",".join("?" * len(ids))
+                dead = [row[0] for row in self._connection.execute(
+                    f"SELECT id FROM readings WHERE id IN ({placeholders}) AND attempts >= ?",
+                    (*ids, max_attempts))]
+                self._move_to_dead(dead, reason)
+            self._connection.execute("COMMIT")
+        return dead
+
+    def dead_letter(self, ids: List[int], reason: str = ""):
+        """Hiçbir zaman iletilemeyecek okumaları kuyruktan ``dead_readings`` tablosuna taşı"""
+        if not ids:
+            return
+        with self._lock:
+            self._connection.execute("BEGIN")
+            self._connection.executemany("UPDATE readings SET attempts = attempts + 1 WHERE id = ?",
+                                         [(i,) for i in ids])
+            self._move_to_dead(ids, reason)
+            self._connection.execute("COMMIT")
+
+    def _move_to_dead(self, ids: List[int], reason: str):
+        """Kilit ve açık işlem içinde çağrılır"""
+        if not ids:
+            return
+        failed_at = datetime.now().isoformat()
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO dead_readings "
+            "(id, sink, target, temperature, humidity, timestamp, attempts, reason, failed_at) "
+            "SELECT id, sink, target, temperature, humidity, timestamp, attempts, ?, ? FROM readings WHERE id = ?",
+            [(reason, failed_at, i) for i in ids])
+        self._connection.executemany("DELETE FROM readings WHERE id = ?", [(i,) for i in ids])
+
+    def count(self, sink: str = None) -> int:
+        with self._lock:
+            if sink is None:
+                return self._connection.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+            return self._connection.execute("SELECT COUNT(*) FROM readings WHERE sink = ?",
+                                            (sink,)).fetchone()[0]
+
+    def dead_count(self, sink: str = None) -> int:
+        with self._lock:
+            if sink is None:
+                return self._connection.execute("SELECT COUNT(*) FROM dead_readings").fetchone()[0]
+            return self._connection.execute("SELECT COUNT(*) FROM dead_readings WHERE sink = ?",
+                                            (sink,)).fetchone()[0]
+
+    def pending_sinks(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT DISTINCT sink FROM readings")]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
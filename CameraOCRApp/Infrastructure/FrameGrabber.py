@@ -0,0 +1,81 @@
+import threading
+import time
+
+class FrameGrabber:
+    """VideoCapture'ı kendi iş parçacığında okuyup yalnızca en son kareyi tutar.
+
+    Okuma döngüsü kod çözücüyü sürekli boşalttığı için kuyrukta bayat kare
+    birikmez; tüketiciler ``latest()`` ile en yeni kareyi kilit altında
+    kopyalamadan alır ve hiçbir zaman ``read()`` çağrısında beklemez.
+    """
+
+    # Bu kadar ardışık okuma hatasından sonra kaynak yeniden açılır
+    REOPEN_AFTER_FAILURES = 50
+
+    def __init__(self, capture, reopen=None, on_error=None, name="FrameGrabber"):
+        self._capture = capture
+        self._reopen = reopen
+        self._on_error = on_error
+        self._name = name
+
+        self._lock = threading.Lock()
+        self._frame = None
+        self._sequence = 0
+        self._timestamp = 0.0
+
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Döngüyü durdur; VideoCapture iş parçacığı tarafından serbest bırakılır"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def latest(self):
+        """(sıra numarası, kare, monotonic zaman damgası) üçlüsünü döndür"""
+        with self._lock:
+            return self._sequence, self._frame, self._timestamp
+
+    def get_frame(self):
+        with self._lock:
+            return self._frame
+
+    def _run(self):
+        failures = 0
+        capture = self._capture
+        try:
+            while self._running:
+                ret, frame = capture.read()
+                if not ret:
+                    failures += 1
+                    if failures == 1 and self._on_error:
+                        self._on_error("Görüntü alınamıyor. Bağlantıyı kontrol edin.")
+                    if failures >= self.REOPEN_AFTER_FAILURES and self._reopen is not None:
+                        capture.release()
+                        capture = self._reopen()
+                        self._capture = capture
+                        failures = 0
+                    time.sleep(min(0.01 * failures, 0.5))
+                    continue
+
+                failures = 0
+                # Yeni kare referansı tek yuvalı tampona yazılır; eski kare
+                # tüketicilerde hâlâ geçerli kalır çünkü yerinde değiştirilmez
+                with self._lock:
+                    self._frame = frame
+                    self._sequence += 1
+                    self._timestamp = time.monotonic()
+        finally:
+            capture.release()
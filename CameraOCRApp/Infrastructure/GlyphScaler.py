@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+import cv2
+import numpy as np
+
+class GlyphScaler:
+    """İkili ROI'yi Tesseract'ın en iyi çalıştığı karakter yüksekliğine ölçekler.
+
+    Karakter yüksekliği ön plan bağlı bileşenlerinden kestirilir: bileşenler
+    dikey olarak örtüşenler aynı satırda olacak şekilde satırlara ayrılır;
+    satır yüksekliğinin ``TALL_RATIO``'sundan uzun bileşenlerin medyanı o
+    satırın büyük harf/rakam yüksekliğidir (küçük harf, nokta ve eksi
+    elenir). Hiç uzun bileşeni olmayan satır yedi segmentli rakamlardır;
+    parçalanmış segmentlerin satır yüksekliği kullanılır. En yüksek satır
+    ölçeği belirler.
+
+    Ölçek ``roi_key`` başına saklanır; ROI dikdörtgeni veya parametreler
+    değişince anahtar da değişir ve kestirim yeniden yapılır. Küçültmede
+    INTER_AREA, büyütmede INTER_LINEAR kullanılır ve sonuç yeniden
+    eşiklenir; böylece çıktı basamaklı kenarlar olmadan ikili kalır.
+    """
+
+    TALL_RATIO = 0.6
+    # Satırı yedi segment parçaları gibi birleştirirken izin verilen dikey boşluk (bileşen yüksekliğine oranla)
+    LINE_GAP = 0.25
+    # Bu kadar pikselden küçük bileşenler gürültü sayılır
+    MIN_AREA = 4
+    MAX_COMPONENTS = 400
+
+    def __init__(self, min_scale: float = 0.25, max_scale: float = 4.0, tolerance: float = 0.15,
+                 max_entries: int = 64):
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        # Ölçek 1'e bu oran kadar yakınsa yeniden boyutlandırma yapılmaz
+        self.tolerance = tolerance
+        self.max_entries = max_entries
+        self._scales = OrderedDict()
+        self._lock = threading.Lock()
+        self.estimates = 0
+        self.reuses = 0
+
+    def apply(self, binary: np.ndarray, target_height: int, roi_key=None) -> np.ndarray:
+        """Görüntüyü hedef karakter yüksekliğine ölçekle; gerek yoksa girdiyi aynen döndür"""
+        scale = self.scale_for(binary, target_height, roi_key)
+        if abs(scale - 1.0) <= self.tolerance:
+            return binary
+        height, width = binary.shape[:2]
+        size = (max(int(round(width * scale)), 1), max(int(round(height * scale)), 1))
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+        resized = cv2.resize(binary, size, interpolation=interpolation)
+        cv2.threshold(resized, 127, 255, cv2.THRESH_BINARY, dst=resized)
+        return resized
+
+    def scale_for(self, binary: np.ndarray, target_height: int, roi_key=None) -> float:
+        """ROI'nin önbellekteki ölçeği; yoksa kestirip sakla (``roi_key`` None ise saklanmaz)"""
+        key = (roi_key, target_height)
+        if roi_key is not None:
+            with self._lock:
+                scale = self._scales.get(key)
+                if scale is not None:
+                    self._scales.move_to_end(key)
+                    self.reuses += 1
+                    return scale
+
+        glyph_height = self.estimate_height(binary)
+        self.estimates += 1
+        if glyph_height is None:
+            # Boş ekran (ör. panel kapalı) ölçek belirlemez; sonraki karede yeniden denenir
+            return 1.0
+        scale = float(np.clip(target_height / glyph_height, self.min_scale, self.max_scale))
+
+        if roi_key is not None:
+            with self._lock:
+                self._scales[key] = scale
+                while len(self._scales) > self.max_entries:
+                    self._scales.popitem(last=False)
+        return scale
+
+    def estimate_height(self, binary: np.ndarray) -> Optional[float]:
+        """Baskın satırın karakter yüksekliği (piksel); ön plan yoksa None"""
+        foreground = self._foreground(binary)
+        rows, cols = foreground.shape
+        _, _, stats, _ = cv2.connectedComponentsWithStats(foreground, connectivity=8)
+        # 0. bileşen zemindir
+        stats = stats[1:]
+        keep = stats[:, cv2.CC_STAT_AREA] >= self.MIN_AREA
+        # İki yan kenara birden değen bileşen çerçeve veya çizgidir
+        keep &= ~((stats[:, cv2.CC_STAT_LEFT] == 0) & (stats[:, cv2.CC_STAT_LEFT] + stats[:, cv2.CC_STAT_WIDTH] == cols))
+        stats = stats[keep]
+        if not len(stats):
+            return None
+        if len(stats) > self.MAX_COMPONENTS:
+            stats = stats[np.argsort(stats[:, cv2.CC_STAT_AREA])[-self.MAX_COMPONENTS:]]
+
+        lines = []  # [üst, alt, bileşen yükseklikleri]
+        for top, height in sorted(zip(stats[:, cv2.CC_STAT_TOP].tolist(), stats[:, cv2.CC_STAT_HEIGHT].tolist())):
+            bottom = top + height
+            if lines and top - lines[-1][1] < self.LINE_GAP * height:
+                line = lines[-1]
+                line[1] = max(line[1], bottom)
+                line[2].append(height)
+            else:
+                lines.append([top, bottom, [height]])
+
+        best = None
+        for top, bottom, heights in lines:
+            line_height = bottom - top
+            tall = [height for height in heights if height >= self.TALL_RATIO * line_height]
+            glyph_height = float(np.median(tall)) if tall else float(line_height)
+            if best is None or glyph_height > best:
+                best = glyph_height
+        return best if best >= 3 else None
+
+    def clear(self):
+        with self._lock:
+            self._scales.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'estimates': self.estimates, 'reuses': self.reuses, 'entries': len(self._scales)}
+
+    @staticmethod
+    def _foreground(binary: np.ndarray) -> np.ndarray:
+        array = np.asarray(binary)
+        if array.ndim == 3:
+            array = cv2.cvtColor(array, cv2.COLOR_BGR2GRAY)
+        mask = (array > 127).view(np.uint8)
+        # Metin karenin azınlığıdır: açık zeminde koyu, koyu zeminde açık
+        return 1 - mask if mask.mean() > 0.5 else mask
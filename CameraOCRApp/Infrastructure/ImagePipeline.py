@@ -0,0 +1,103 @@
+"""
+PIL'e dönüşüm yapmadan uint8 NumPy dizileri üzerinde çalışan ön işleme adımları.
+
+Adımlar eski PIL tabanlı hattın (ImageEnhance + Image.point) sonuçlarını piksel
+düzeyinde birebir üretir: gri dönüşüm PIL'in sabit noktalı katsayılarını,
+kontrast/parlaklık/keskinlik ise ``Image.blend``'in float32 ve kesme (truncate)
+davranışını izler.
+"""
+
+import threading
+import cv2
+import numpy as np
+
+# PIL "L" dönüşümü: (R*19595 + G*38470 + B*7471 + 0x8000) >> 16
+# Katsayılar 2^16'ya bölündüğünde float32'de tam temsil edilir, bu yüzden
+# cv2.transform sonucu kesildiğinde PIL ile bit düzeyinde aynıdır.
+_GRAY_MATRIX = np.array([[7471, 38470, 19595, 32768]], np.float64) / 65536.0
+
+# ImageFilter.SMOOTH çekirdeği
+_SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], np.float32) / 13.0
+
+MORPH_KERNEL = np.ones((3, 3), np.uint8)
+MORPH_KERNEL.setflags(write=False)
+
+class BufferPool:
+    """İş parçacığı başına yeniden kullanılan ara tamponlar"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, name: str, shape, dtype=np.uint8) -> np.ndarray:
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buffer = buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype)
+            buffers[name] = buffer
+        return buffer
+
+def to_gray(image, pool: BufferPool) -> np.ndarray:
+    """BGR (veya zaten gri) görüntüyü PIL ile aynı sonucu veren uint8 griye çevir"""
+    if not isinstance(image, np.ndarray):
+        # Geriye dönük uyumluluk: PIL görüntüsü
+        return np.asarray(image.convert('L'))
+    if image.ndim == 2:
+        return image
+
+    height, width = image.shape[:2]
+    color = pool.get('gray_f32x3', (height, width, 3), np.float32)
+    np.copyto(color, image[:, :, :3], casting='unsafe')
+    weighted = pool.get('gray_f32', (height, width), np.float32)
+    cv2.transform(color, _GRAY_MATRIX, dst=weighted)
+    gray = pool.get('gray', (height, width))
+    np.copyto(gray, weighted, casting='unsafe')
+    return gray
+
+def _blend_lut(lut: np.ndarray, base: float, factor: float) -> np.ndarray:
+    """Image.blend(degenerate=base, image, factor) eşlemesini LUT üzerinde uygula"""
+    base = np.float32(base)
+    values = base + np.float32(factor) * (lut.astype(np.float32) - base)
+    np.clip(values, 0.0, 255.0, out=values)
+    return values.astype(np.uint8)
+
+def build_tone_lut(mean: int, contrast: float, brightness: float, gamma: float = 1.0) -> np.ndarray:
+    """Kontrast, parlaklık ve gamma'yı tek bir 256 girişli tabloda birleştir"""
+    lut = np.arange(256, dtype=np.uint8)
+    if contrast != 1.0:
+        lut = _blend_lut(lut, mean, contrast)
+    if brightness != 1.0:
+        lut = _blend_lut(lut, 0.0, brightness)
+    if gamma != 1.0:
+        normalized = lut.astype(np.float64) / 255.0
+        lut = np.clip(np.round(255.0 * normalized ** (1.0 / gamma)), 0, 255).astype(np.uint8)
+    return lut
+
+def image_mean(gray: np.ndarray) -> int:
+    """ImageEnhance.Contrast'ın kullandığı yuvarlanmış ortalama"""
+    return int(cv2.mean(gray)[0] + 0.5)
+
+def sharpen(src: np.ndarray, factor: float, pool: BufferPool, dst: np.ndarray) -> np.ndarray:
+    """ImageEnhance.Sharpness ile aynı sonuç: SMOOTH filtresiyle harmanlama"""
+    height, width = src.shape
+    smooth = pool.get('smooth', (height, width))
+    cv2.filter2D(src, -1, _SMOOTH_KERNEL, dst=smooth, borderType=cv2.BORDER_REPLICATE)
+    # PIL kenar piksellerini filtrelemeden kopyalar
+    smooth[0, :] = src[0, :]
+    smooth[-1, :] = src[-1, :]
+    smooth[:, 0] = src[:, 0]
+    smooth[:, -1] = src[:, -1]
+
+    blended = pool.get('blend_f32', (height, width), np.float32)
+    np.subtract(src, smooth, out=blended, dtype=np.float32)
+    np.multiply(blended, np.float32(factor), out=blended)
+    np.add(blended, smooth, out=blended, dtype=np.float32)
+    np.clip(blended, 0.0, 255.0, out=blended)
+    np.copyto(dst, blended, casting='unsafe')
+    return dst
+
+def threshold(src: np.ndarray, level: int, dst: np.ndarray) -> np.ndarray:
+    """x < level -> 0, aksi halde 255"""
+    cv2.threshold(src, level - 1, 255, cv2.THRESH_BINARY, dst=dst)
+    return dst
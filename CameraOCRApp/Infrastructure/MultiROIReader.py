@@ -0,0 +1,285 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from Domain.Models import ProcessingParams, SensorData, rect_to_tuple
+from Infrastructure.ROIChangeDetector import ROIChangeDetector
+from Infrastructure.TemporalVoter import TemporalVoter
+
+@dataclass
+class FieldReading:
+    """Bir alanın son okuması; ``reused`` ROI değişmediği için OCR atlandıysa True.
+
+    ``value`` bu karenin ayrıştırılmış değeri, ``committed`` son karelerin
+    oylamasıyla kaydedilecek değerdir (kararsızsa None).
+    """
+    name: str
+    text: str = ""
+    value: Optional[float] = None
+    reused: bool = False
+    confidence: float = 0.0
+    committed: Optional[float] = None
+
+class MultiROIReader:
+    """Aynı karedeki tüm ROI alanlarını tek geçişte okuyup tek SensorData kaydı üretir.
+
+    Kare bir kez alınır, bütün alanlar aynı kareden kırpılır; yalnızca değişen
+    alanlar ön işlenip tanınır, değişmeyenler son okumalarını kullanır. Her alan
+    kendi tanıma yolunu kullanır (rakam alanları tek satır, etiketli metin blok).
+    ``stitch`` açıkken aynı tanıma yolundaki alanlar tek tuvalde birlikte okunur.
+    Her alanın değeri, tanımanın kendi güveniyle son ``vote_frames`` OCR
+    okumasında oylanır (TemporalVoter); kayıt yalnızca tüm alanlar kararlıyken
+    üretilir. Değişmeyen ROI'nin tekrar kullanılan okuması oy sayılmaz; bu
+    yüzden ROI değiştikten sonra oylama için gereken taze okumalar toplanana
+    kadar değişim kontrolü atlanır.
+
+    Adımlar ayrı çağrılabilir: ``prepare`` ve ``merge`` çağıranın iş parçacığında,
+    ``preprocess`` ve ``recognize`` (durum tutmadıkları için) işçi iş
+    parçacığında çalışabilir. ``read`` hepsini sırayla yapar.
+
+    Aynı OCRService'i paylaşan okuyucular (ör. çok kameralı kipte akış başına
+    bir okuyucu) ``namespace`` ile ayrılır; aynı adlı alanların zamansal
+    ortalama ve karakter ölçeği durumu birbirine karışmaz.
+    """
+
+    SENSOR_FIELDS = ('temperature', 'humidity')
+
+    def __init__(self, ocr_service, change_threshold: float = 12.0, max_skip_seconds: float = 300.0,
+                 stitch: bool = False, vote_frames: int = 1, min_confidence: float = 0.0,
+                 vote_method: str = TemporalVoter.METHOD_VOTE, vote_tolerance: float = 0.5,
+                 namespace=None):
+        if vote_method not in TemporalVoter.METHODS:
+            raise ValueError(f"Bilinmeyen oylama yöntemi: {vote_method}")
+        self.ocr_service = ocr_service
+        self.stitch = stitch
+        self.change_threshold = change_threshold
+        self.max_skip_seconds = max_skip_seconds
+        self.vote_frames = vote_frames
+        self.min_confidence = min_confidence
+        self.vote_method = vote_method
+        self.vote_tolerance = vote_tolerance
+        self.namespace = namespace
+        self._detectors = {}
+        self._voters = {}
+        self._requested = {}  # alan adı -> son değişimden beri OCR'a gönderilen tik
+        self._last = {}  # alan adı -> FieldReading
+
+    @classmethod
+    def validate(cls, fields: list, ocr_service=None):
+        """Alan adları ve SensorData eşlemeleri benzersiz, sıcaklık alanı tanımlı olmalı"""
+        names = [item.name for item in fields]
+        if len(set(names)) != len(names):
+            raise ValueError("OCR alan adları benzersiz olmalı")
+        targets = [item.sensor_field for item in fields]
+        unknown = set(targets) - set(cls.SENSOR_FIELDS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen SensorData alanı: {', '.join(sorted(unknown))}")
+        if len(set(targets)) != len(targets):
+            raise ValueError("Her SensorData alanı yalnızca bir OCR alanından okunabilir")
+        if 'temperature' not in targets:
+            raise ValueError("OCR alanlarından biri sıcaklığı (temperature) okumalı")
+        if ocr_service is not None:
+            for item in fields:
+                if item.parser not in ocr_service.PARSERS:
+                    raise ValueError(f"{item.name}: bilinmeyen ayrıştırıcı {item.parser}")
+                ocr_service.resolve_engine(item.engine, item.parser)
+
+    def prepare(self, frame, fields: list, params: ProcessingParams, language: str,
+                change_gate: bool = True) -> tuple[dict, set]:
+        """Alanları kareden kırp: (ad -> ROI kopyası, OCR gereken alan adları).
+
+        Boş veya kare dışına düşen alan ValueError verir.
+        """
+        rois = {}
+        pending = set()
+        for item in fields:
+            x, y, w, h = rect_to_tuple(item.rect)
+            roi = frame[y:y+h, x:x+w]
+            if roi.size == 0:
+                raise ValueError(f"OCR alanı boş veya karenin dışında: {item.name}")
+            # Tam kare sonraki adımlarda tutulmasın
+            rois[item.name] = roi.copy()
+            field_params = item.processing or params
+            context = (x, y, w, h, field_params.cache_key(), language, item.engine, item.parser)
+            detector = self._detectors.get(item.name)
+            if detector is None:
+                detector = self._detectors[item.name] = ROIChangeDetector(self.change_threshold,
+                                                                          self.max_skip_seconds)
+            changed = detector.has_changed(roi, context)
+            if changed:
+                self._requested[item.name] = 0
+            if not change_gate or changed or item.name not in self._last or self._needs_votes(item.name):
+                pending.add(item.name)
+                # Sonuç gelmeden sayılır; hatta bekleyen tikler ek OCR istemez
+                self._requested[item.name] = self._requested.get(item.name, 0) + 1
+        return rois, pending
+
+    def _needs_votes(self, name: str) -> bool:
+        """Değişimden sonra oylama henüz yeterli taze okuma görmediyse True.
+
+        En az çoğunluk kadar okuma toplanır; değer yine kararsızsa pencere
+        dolana kadar okunmaya devam edilir (boş ekran sonsuza dek OCR'a gitmez).
+        """
+        voter = self._voter(name)
+        requested = self._requested.get(name, 0)
+        if requested < voter.required:
+            return True
+        return voter.result is None and requested < voter.window
+
+    def _voter(self, name: str) -> TemporalVoter:
+        voter = self._voters.get(name)
+        if voter is None:
+            voter = self._voters[name] = TemporalVoter(self.vote_frames, self.min_confidence,
+                                                       self.vote_method, self.vote_tolerance)
+        return voter
+
+    def preprocess(self, rois: dict, fields: list, params: ProcessingParams, names) -> dict:
+        """OCR gereken alanları ön işle; aynı parametreli alanlar aynı derlenmiş planı kullanır.
+
+        Karakter ölçeği alan adı ve dikdörtgeniyle anahtarlanır, alan taşınınca yeniden kestirilir.
+        """
+        return {item.name: self.ocr_service.preprocess_image(rois[item.name], item.processing or params,
+                                                             self.roi_key(item))
+                for item in fields if item.name in names}
+
+    def roi_key(self, item) -> tuple:
+        """Alanın OCRService'teki zamansal ortalama ve karakter ölçeği anahtarı"""
+        key = (item.name, rect_to_tuple(item.rect))
+        return key if self.namespace is None else (self.namespace,) + key
+
+    def recognize(self, processed: dict, fields: list, language: str) -> dict:
+        """Ad -> (metin, değer, güven); her alan kendi tanıma yolu ve ayrıştırıcısıyla okunur"""
+        groups = {}
+        for item in fields:
+            if item.name in processed:
+                engine = self.ocr_service.resolve_engine(item.engine, item.parser)
+                groups.setdefault(engine, {})[item.name] = processed[item.name]
+
+        scored = {}
+        for engine, images in groups.items():
+            scored.update(self.ocr_service.read_texts_scored(images, language, engine, self.stitch))
+        results = {}
+        for item in fields:
+            if item.name in scored:
+                text, confidence = scored[item.name]
+                results[item.name] = (text, self.ocr_service.parse_value(text, item.parser), confidence)
+        return results
+
+    def merge(self, fields: list, results: dict) -> dict:
+        """Yeni sonuçları son okumalarla birleştirip oyla: ad -> FieldReading.
+
+        Yalnızca OCR okumaları oylanır. Değişmeyen ROI'nin son okuması oy
+        sayılmaz (değişim tikindeki tek bir yanlış okuma aksi halde her tikte
+        tekrarlanıp çoğunluğu kazanırdı); son oylama sonucunu taşır.
+        """
+        readings = {}
+        for item in fields:
+            voter = self._voter(item.name)
+            if item.name in results:
+                text, value, confidence = results[item.name]
+                reading = self._last[item.name] = FieldReading(item.name, text, value, confidence=confidence)
+                reading.committed = voter.add(reading.value, reading.confidence)
+            else:
+                last = self._last.get(item.name)
+                if last is None:
+                    continue
+                reading = FieldReading(item.name, last.text, last.value, reused=True, confidence=last.confidence,
+                                       committed=voter.result)
+            readings[item.name] = reading
+        return readings
+
+    def read(self, frame, fields: list, params: ProcessingParams, language: str,
+             change_gate: bool = True) -> dict:
+        """Tek tik: kırp, değişen alanları ön işle ve tanı, son okumalarla birleştir"""
+        rois, pending = self.prepare(frame, fields, params, language, change_gate)
+        try:
+            processed = self.preprocess(rois, fields, params, pending)
+            results = self.recognize(processed, fields, language)
+        except Exception:
+            self.invalidate(pending)
+            raise
+        return self.merge(fields, results)
+
+    def invalidate(self, names=None, keep_readings: bool = False):
+        """Alanların referansını ve son okumasını unut; sonraki tikte OCR zorlanır.
+
+        ``keep_readings`` ile yalnızca referans unutulur: sonraki tikte bir kez
+        OCR yapılır, o okuma gelene kadar son okuma kullanılmaya devam eder
+        (düşürülen tikler için; her yakalamada OCR zorlanmaz). Tüm alanlar
+        unutulurken (``names`` None) oylama pencereleri de boşaltılır.
+        """
+        for name in list(self._detectors if names is None else names):
+            detector = self._detectors.get(name)
+            if detector is not None:
+                detector.reset()
+            if not keep_readings:
+                self._last.pop(name, None)
+        if names is None:
+            for voter in self._voters.values():
+                voter.reset()
+            self._requested = {}
+
+    def configure(self, change_threshold: float = None, max_skip_seconds: float = None):
+        """Değişim kontrolü ayarlarını güncelle; referanslar sıfırlanır"""
+        if change_threshold is not None:
+            self.change_threshold = change_threshold
+        if max_skip_seconds is not None:
+            self.max_skip_seconds = max_skip_seconds
+        for detector in self._detectors.values():
+            detector.threshold = self.change_threshold
+            detector.max_skip_seconds = self.max_skip_seconds
+            detector.reset()
+
+    def configure_voting(self, vote_frames: int = None, min_confidence: float = None,
+                         vote_method: str = None, vote_tolerance: float = None):
+        """Oylama ayarlarını güncelle; pencereler yeni ayarlarla sıfırdan dolar"""
+        if vote_method is not None and vote_method not in TemporalVoter.METHODS:
+            raise ValueError(f"Bilinmeyen oylama yöntemi: {vote_method}")
+        if vote_frames is not None:
+            self.vote_frames = vote_frames
+        if min_confidence is not None:
+            self.min_confidence = min_confidence
+        if vote_method is not None:
+            self.vote_method = vote_method
+        if vote_tolerance is not None:
+            self.vote_tolerance = vote_tolerance
+        self._voters = {}
+        self._requested = {}
+
+    def stats(self) -> dict:
+        """Tüm alanların toplam değişim kontrolü ve oylama sayaçları"""
+        hits = sum(detector.hits for detector in self._detectors.values())
+        misses = sum(detector.misses for detector in self._detectors.values())
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0,
+                'committed': sum(voter.committed for voter in self._voters.values()),
+                'unstable': sum(voter.unstable for voter in self._voters.values()),
+                'low_confidence': sum(voter.rejected for voter in self._voters.values())}
+
+    @staticmethod
+    def build_record(fields: list, readings: dict, timestamp: datetime,
+                     defaults: dict = None) -> Optional[SensorData]:
+        """Tüm alanların oylanmış değeri kararlıysa tek SensorData kaydı; değilse None.
+
+        Alanı tanımlı olmayan SensorData değerleri ``defaults``'tan gelir
+        (ör. nem alanı yoksa sabit nem).
+        """
+        data = SensorData(timestamp=timestamp, **(defaults or {}))
+        for item in fields:
+            reading = readings.get(item.name)
+            if reading is None or reading.committed is None:
+                return None
+            setattr(data, item.sensor_field, reading.committed)
+        return data
+
+    @staticmethod
+    def missing(fields: list, readings: dict) -> list:
+        """Değeri çıkarılamayan alan adları"""
+        return [item.name for item in fields
+                if readings.get(item.name) is None or readings[item.name].value is None]
+
+    @staticmethod
+    def unstable(fields: list, readings: dict) -> list:
+        """Değeri okunduğu halde oylamada kararlı olmayan (veya güveni düşük) alan adları"""
+        return [item.name for item in fields
+                if readings.get(item.name) is not None and readings[item.name].value is not None
+                and readings[item.name].committed is None]
@@ -0,0 +1,91 @@
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Optional
+import numpy as np
+
+class OCRResultCache:
+    """İkili (binarize) ROI parmak izine göre anahtarlanan sınırlı LRU OCR sonuç önbelleği.
+
+    Yedi segmentli paneller az sayıda değer arasında dolaştığı için aynı ikili
+    görüntü tekrar tekrar tanınır; isabette motor hiç çağrılmaz.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(image, language: str, config: str) -> bytes:
+        """Görüntü baytları, boyutu, dil ve Tesseract ayarından 128 bitlik özet"""
+        array = np.ascontiguousarray(np.asarray(image))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((array.shape, array.dtype.str, language, config)).encode())
+        digest.update(array.data)
+        return digest.digest()
+
+    def get(self, key: bytes):
+        """(metin, OCRSensorData kopyası, güven) veya None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                text, parsed, confidence, stored_at, size = entry
+                if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+                    self._remove(key)
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Çağıran sonucu değiştirebileceği için önbellekteki nesne paylaşılmaz
+        return text, (replace(parsed) if parsed is not None else None), confidence
+
+    def put(self, key: bytes, text: str, parsed, confidence: Optional[float] = None):
+        size = sys.getsizeof(key) + sys.getsizeof(text) + (sys.getsizeof(parsed) if parsed is not None else 0)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            stored = replace(parsed) if parsed is not None else None
+            self._entries[key] = (text, stored, confidence, time.monotonic(), size)
+            self._memory_bytes += size
+            while len(self._entries) > max(self.max_entries, 0):
+                self._remove(next(iter(self._entries)))
+
+    def configure(self, max_entries: int = None, ttl_seconds: float = None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            while len(self._entries) > max(self.max_entries, 0):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'memory_bytes': self._memory_bytes,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._memory_bytes -= entry[4]
@@ -2,14 +2,118 @@ import pytesseract
 import cv2
 import numpy as np
 import re
+from typing import Optional
 from PIL import Image, ImageEnhance, ImageOps
 from Domain.Models import ProcessingParams, OCRSensorData
+from Infrastructure.TesseractEngine import TesseractEngine
+from Infrastructure.SevenSegmentDecoder import SevenSegmentDecoder
+from Infrastructure.GlyphScaler import GlyphScaler
+from Infrastructure.TemporalDenoiser import TemporalDenoiser
+from Infrastructure import ImagePipeline
+from Infrastructure.ProcessingPlan import compile_processing_plan
+from Infrastructure.OCRResultCache import OCRResultCache
 
 class OCRService:
-    def __init__(self):
-        pass
+    BACKEND_AUTO = "auto"
+    BACKEND_TESSEROCR = "tesserocr"
+    BACKEND_PYTESSERACT = "pytesseract"
+    BACKENDS = [BACKEND_AUTO, BACKEND_TESSEROCR, BACKEND_PYTESSERACT]
+    TESSERACT_CONFIG = '--psm 6'
+
+    # Alan başına tanıma yolu: tek satır rakam (psm 7) serbest metinden çok daha ucuzdur
+    ENGINE_AUTO = "auto"
+    ENGINE_LINE = "line"
+    ENGINE_BLOCK = "block"
+    # Yedi segment çözücü; güveni düşükse tek satır Tesseract'a düşer
+    ENGINE_SEGMENT = "segment"
+    ENGINES = [ENGINE_AUTO, ENGINE_LINE, ENGINE_BLOCK, ENGINE_SEGMENT]
+    DIGIT_WHITELIST = "0123456789.,-+"
+    # Motor -> (psm, karakter listesi)
+    ENGINE_MODES = {ENGINE_LINE: (7, DIGIT_WHITELIST), ENGINE_BLOCK: (6, "")}
+
+    PARSER_NUMBER = "number"
+    PARSER_TEMPERATURE = "temperature"
+    PARSER_PERCENT = "percent"
+    PARSERS = [PARSER_NUMBER, PARSER_TEMPERATURE, PARSER_PERCENT]
+
+    DENOISE_SPATIAL = "spatial"
+    DENOISE_TEMPORAL = "temporal"
+    DENOISE_MODES = [DENOISE_SPATIAL, DENOISE_TEMPORAL]
+
+    # Birleştirilmiş tuvalde kenar boşluğu ve ROI bantları arasındaki boşluk (piksel)
+    STITCH_MARGIN = 10
+    STITCH_GAP = 24
+
+    def __init__(self, backend: str = BACKEND_AUTO, cache_size: int = 256, cache_ttl: float = 600.0):
+        self.engine = TesseractEngine()
+        self.buffers = ImagePipeline.BufferPool()
+        self.glyph_scaler = GlyphScaler()
+        self.temporal_denoiser = TemporalDenoiser()
+        self.result_cache = OCRResultCache(cache_size, cache_ttl)
+        self.backend = self.BACKEND_AUTO
+        self.set_backend(backend)
+        self.stitched_calls = 0
+        self.stitch_fallbacks = 0
+        self.segment_decoder = SevenSegmentDecoder()
+        self.segment_reads = 0
+        self.segment_fallbacks = 0
+
+    def set_backend(self, backend: str) -> tuple[bool, str]:
+        """OCR motorunu seç: auto, tesserocr (kalıcı motor) veya pytesseract (alt süreç)"""
+        if backend not in self.BACKENDS:
+            return False, f"Bilinmeyen OCR motoru: {backend}"
+        if backend == self.BACKEND_TESSEROCR and not self.engine.is_available():
+            self.backend = self.BACKEND_PYTESSERACT
+            return False, "tesserocr kurulu değil, pytesseract kullanılacak"
+        self.backend = backend
+        return True, f"OCR motoru: {self.active_backend()}"
+
+    def reset_temporal_denoise(self, roi_key=None):
+        """Zamansal ortalamaları unut (ör. kamera değiştiğinde); None ise tüm ROI'ler"""
+        self.temporal_denoiser.reset(roi_key)
+
+    def configure_result_cache(self, max_entries: int = None, ttl_seconds: float = None):
+        """Sonuç önbelleğinin boyutunu ve yaşam süresini ayarla (0 = kapalı/süresiz)"""
+        self.result_cache.configure(max_entries, ttl_seconds)
+
+    def active_backend(self) -> str:
+        """Gerçekte kullanılan motoru döndür"""
+        if self.backend == self.BACKEND_AUTO:
+            return self.BACKEND_TESSEROCR if self.engine.is_available() else self.BACKEND_PYTESSERACT
+        return self.backend
+
+    def _cache_key(self, image, language: str, config: str) -> bytes:
+        # Motorlar aynı görüntüyü farklı okuyabilir; motor değişince diğerinin sonuçları kullanılmaz
+        return OCRResultCache.make_key(image, language, f"{config} {self.active_backend()}")
         
-    def preprocess_image(self, image, params: ProcessingParams):
+    def preprocess_image(self, image, params: ProcessingParams, roi_key=None) -> np.ndarray:
+        """ROI'yi uint8 NumPy dizisi olarak ön işle (PIL dönüşümü yok).
+
+        Parametreler önbelleğe alınmış bir ``ProcessingPlan``'a derlenir; sonuç
+        ``preprocess_image_pil`` ile piksel düzeyinde aynıdır. Tek farklar: bulanıklık
+        ve gamma artık uygulanır, morfolojik işlemler sabit eşikle de çalışır
+        (PIL '1' modu bool dizisi ürettiği için eski yol burada hata veriyordu).
+
+        ``params.glyph_height`` verilirse ikili sonuç bu karakter yüksekliğine
+        ölçeklenir; ölçek ``roi_key`` (ör. alan adı ve dikdörtgen) başına saklanır.
+        Zamansal gürültü azaltmada gri ROI, aynı ``roi_key``'in önceki
+        karelerinin ortalamasına katılır; anahtarsız çağrılarda adım atlanır.
+        """
+        plan = compile_processing_plan(params)
+        if params.denoise > 0 and params.denoise_mode == self.DENOISE_TEMPORAL and roi_key is not None:
+            image = self.temporal_denoiser.apply(ImagePipeline.to_gray(image, self.buffers), params.denoise + 1,
+                                                 roi_key)
+        binary = plan.run(image, self.buffers)
+        if params.glyph_height > 0:
+            key = None if roi_key is None else (roi_key, params.cache_key())
+            scaled = self.glyph_scaler.apply(binary, params.glyph_height, key)
+            if scaled is not binary:
+                return scaled
+        # Ara tamponlar yeniden kullanıldığı için çağırana bağımsız bir kopya verilir
+        return binary.copy()
+
+    def preprocess_image_pil(self, image, params: ProcessingParams):
+        """Eski PIL tabanlı ön işleme; karşılaştırma ve doğrulama için tutulur"""
         # OpenCV to PIL
         if isinstance(image, np.ndarray):
             pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
@@ -64,7 +168,235 @@ class OCRService:
         return pil_image
         
     def extract_text(self, image, language='eng'):
-        return pytesseract.image_to_string(image, lang=language, config='--psm 6')
+        text, _ = self.read_sensor_data(image, language)
+        return text
+
+    def read_sensor_data(self, image, language='eng') -> tuple[str, Optional[OCRSensorData]]:
+        """İkili görüntüyü tanı ve ayrıştır; aynı görüntü daha önce tanındıysa motoru çağırma.
+
+        OCRSensorData'nın ``confidence`` alanı motorun kelime güvenlerinin ortalamasıdır (0-1).
+        """
+        key = self._cache_key(image, language, self.TESSERACT_CONFIG)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached[0], cached[1]
+
+        text, confidence = self._run_engine_scored(image, language)
+        return text, self._store(key, text, confidence)
+
+    def read_text(self, image, language='eng', engine=ENGINE_BLOCK) -> str:
+        """Görüntüyü seçilen tanıma yoluyla oku; sonuç önbelleğini read_sensor_data ile paylaşır"""
+        return self.read_text_scored(image, language, engine)[0]
+
+    def read_text_scored(self, image, language='eng', engine=ENGINE_BLOCK) -> tuple[str, float]:
+        """(metin, güven); güven Tesseract kelime güvenlerinin ortalaması veya yedi segment güvenidir (0-1)"""
+        if engine == self.ENGINE_SEGMENT:
+            return self.read_segments_scored(image, language)
+        psm, whitelist = self.ENGINE_MODES[engine]
+        config = self._tesseract_config(psm, whitelist)
+        key = self._cache_key(image, language, config)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached[0], cached[2]
+
+        text, confidence = self._run_engine_scored(image, language, psm, whitelist)
+        self._store(key, text, confidence)
+        return text, confidence
+
+    def read_texts(self, images: dict, language='eng', engine=ENGINE_BLOCK, stitch: bool = False) -> dict:
+        """Ad -> metin; bkz. ``read_texts_scored``"""
+        return {name: text for name, (text, _) in self.read_texts_scored(images, language, engine, stitch).items()}
+
+    def read_texts_scored(self, images: dict, language='eng', engine=ENGINE_BLOCK, stitch: bool = False) -> dict:
+        """Ad -> (metin, güven). ``stitch`` açıksa önbellekte olmayan görüntüler tek tuvalde tek
+        çağrıyla tanınır; kelimeler ROI'lere kesin eşlenemezse görüntüler tek tek okunur.
+
+        Birleşik tuval başka bir modla (psm 6, ters çevrilmiş) okunduğu için
+        sonuçları ayrı anahtarla saklanır; tek tek okumalar onları görmez.
+        """
+        if engine == self.ENGINE_SEGMENT:
+            return {name: self.read_segments_scored(image, language) for name, image in images.items()}
+        psm, whitelist = self.ENGINE_MODES[engine]
+        config = self._tesseract_config(psm, whitelist)
+        stitch_config = f"{self._tesseract_config(6, whitelist)} stitched"
+        results = {}
+        missing = {}
+        for name, image in images.items():
+            key = self._cache_key(image, language, config)
+            stitch_key = None
+            cached = self.result_cache.get(key)
+            if cached is None and stitch:
+                stitch_key = self._cache_key(image, language, stitch_config)
+                cached = self.result_cache.get(stitch_key)
+            if cached is not None:
+                results[name] = (cached[0], cached[2])
+            else:
+                missing[name] = (image, key, stitch_key)
+
+        if stitch and len(missing) > 1:
+            stitched = self.read_text_stitched({name: image for name, (image, _, _) in missing.items()},
+                                               language, engine)
+            if stitched is None:
+                self.stitch_fallbacks += 1
+            else:
+                for name, (text, confidence) in stitched.items():
+                    self._store(missing[name][2], text, confidence)
+                results.update(stitched)
+                missing = {}
+
+        for name, (image, key, _) in missing.items():
+            text, confidence = self._run_engine_scored(image, language, psm, whitelist)
+            self._store(key, text, confidence)
+            results[name] = (text, confidence)
+        return results
+
+    def read_segments(self, image, language='eng') -> str:
+        return self.read_segments_scored(image, language)[0]
+
+    def read_segments_scored(self, image, language='eng') -> tuple[str, float]:
+        """Yedi segment çözücüyle oku; sonuç belirsizse (düşük güven) tek satır Tesseract kullan"""
+        text, confidence = self.segment_decoder.decode(image)
+        self.segment_reads += 1
+        if text and confidence >= self.segment_decoder.min_confidence:
+            return text, confidence
+        self.segment_fallbacks += 1
+        return self.read_text_scored(image, language, self.ENGINE_LINE)
+
+    def read_text_stitched(self, images: dict, language='eng', engine=ENGINE_BLOCK) -> Optional[dict]:
+        """Görüntüleri alt alta tek tuvale dizip tek ``image_to_data`` çağrısıyla tanı: ad -> (metin, güven).
+
+        Kelime kutuları dikey konumlarına göre kaynak ROI'ye eşlenir. Bir kutu iki
+        banda taşarsa, bantlar arasındaki boşluğa düşerse veya bir bant hiç kelime
+        almazsa eşleme belirsiz sayılır ve None döner.
+        """
+        canvas, bands = self.stitch_images(images)
+        _, whitelist = self.ENGINE_MODES[engine]
+        # Alt alta satırlar tek metin bloğu olarak okunur (tek satır modu burada kullanılamaz)
+        words = self._run_engine_words(canvas, language, 6, whitelist)
+        self.stitched_calls += 1
+        return self.map_words(words, bands, self.STITCH_GAP // 2 - 1)
+
+    def stitch_images(self, images: dict) -> tuple[np.ndarray, dict]:
+        """(tuval, ad -> (üst, alt) bant sınırları); her görüntü açık zemin üzerine koyu metne çevrilir"""
+        tiles = {}
+        for name, image in images.items():
+            tile = TesseractEngine._as_gray_array(image)
+            # Tesseract zemini tuvalin tamamı için bir kez seçer; ters ROI'ler düzeltilir
+            if np.median(tile) < 128:
+                tile = 255 - tile
+            tiles[name] = tile
+
+        margin, gap = self.STITCH_MARGIN, self.STITCH_GAP
+        width = max(tile.shape[1] for tile in tiles.values()) + 2 * margin
+        height = sum(tile.shape[0] for tile in tiles.values()) + gap * (len(tiles) - 1) + 2 * margin
+        canvas = np.full((height, width), 255, np.uint8)
+        bands = {}
+        top = margin
+        for name, tile in tiles.items():
+            tile_height, tile_width = tile.shape
+            canvas[top:top+tile_height, margin:margin+tile_width] = tile
+            bands[name] = (top, top + tile_height)
+            top += tile_height + gap
+        return canvas, bands
+
+    @staticmethod
+    def map_words(words: list, bands: dict, tolerance: int = 0) -> Optional[dict]:
+        """Kelime kutularını bantlara dağıt: ad -> (metin, güven), belirsizse None"""
+        parts = {name: [] for name in bands}
+        for text, left, top, width, height, confidence in words:
+            text = text.strip()
+            if not text:
+                continue
+            bottom = top + height
+            owners = [name for name, (band_top, band_bottom) in bands.items()
+                      if top < band_bottom + tolerance and bottom > band_top - tolerance]
+            if len(owners) != 1:
+                return None
+            band_top, band_bottom = bands[owners[0]]
+            if top < band_top - tolerance or bottom > band_bottom + tolerance:
+                return None
+            parts[owners[0]].append((text, confidence))
+        if not all(parts.values()):
+            return None
+        # Kelimeler Tesseract'ın okuma sırasıyla gelir
+        return {name: (" ".join(text for text, _ in items), OCRService._mean_confidence(conf for _, conf in items))
+                for name, items in parts.items()}
+
+    def resolve_engine(self, engine: str, parser: str) -> str:
+        """auto: etiketli metin bekleyen sıcaklık ayrıştırıcısı dışında tek satır rakam tanıma"""
+        if engine not in self.ENGINES:
+            raise ValueError(f"Bilinmeyen tanıma yolu: {engine}")
+        if engine != self.ENGINE_AUTO:
+            return engine
+        return self.ENGINE_BLOCK if parser == self.PARSER_TEMPERATURE else self.ENGINE_LINE
+
+    def _run_engine_scored(self, image, language, psm: int = 6, whitelist: str = "") -> tuple[str, float]:
+        """(metin, güven 0-1); güven ayrı bir tanıma yapılmadan aynı çağrının kelime güvenlerinden gelir"""
+        if self.active_backend() == self.BACKEND_TESSEROCR:
+            try:
+                return self.engine.recognize_scored(image, language, psm, whitelist)
+            except RuntimeError:
+                # Motor bu dil için başlatılamadıysa (ör. eksik traineddata) yedek yola düş
+                pass
+        # image_to_string ile aynı tanıma; çıktı kelime kutuları ve güvenleriyle gelir
+        data = pytesseract.image_to_data(image, lang=language, config=self._tesseract_config(psm, whitelist),
+                                         output_type=pytesseract.Output.DICT)
+        lines = {}
+        confidences = []
+        for i in range(len(data['level'])):
+            text = data['text'][i].strip()
+            if data['level'][i] != 5 or not text:
+                continue
+            lines.setdefault((data['block_num'][i], data['par_num'][i], data['line_num'][i]), []).append(text)
+            confidences.append(float(data['conf'][i]))
+        return "\n".join(" ".join(words) for words in lines.values()), self._mean_confidence(confidences)
+
+    def _run_engine_words(self, image, language, psm: int, whitelist: str) -> list:
+        """(metin, sol, üst, genişlik, yükseklik, güven) kelime listesi"""
+        if self.active_backend() == self.BACKEND_TESSEROCR:
+            try:
+                return self.engine.recognize_words(image, language, psm, whitelist)
+            except RuntimeError:
+                pass
+        data = pytesseract.image_to_data(image, lang=language, config=self._tesseract_config(psm, whitelist),
+                                         output_type=pytesseract.Output.DICT)
+        # Seviye 5 kelime kutularıdır; üst seviyeler sayfa/blok/satır
+        return [(data['text'][i], data['left'][i], data['top'][i], data['width'][i], data['height'][i],
+                 float(data['conf'][i])) for i in range(len(data['level'])) if data['level'][i] == 5]
+
+    @staticmethod
+    def _tesseract_config(psm: int, whitelist: str) -> str:
+        config = f'--psm {psm}'
+        if whitelist:
+            config += f' -c tessedit_char_whitelist={whitelist}'
+        return config
+
+    def _store(self, key: bytes, text: str, confidence: float) -> Optional[OCRSensorData]:
+        """Tanıma sonucunu ayrıştırıp önbelleğe yaz; tüm okuma yolları aynı kaydı paylaşır"""
+        parsed = self.parse_sensor_data(text)
+        if parsed is not None:
+            parsed.confidence = confidence
+        self.result_cache.put(key, text, parsed, confidence)
+        return parsed
+
+    @staticmethod
+    def _mean_confidence(confidences) -> float:
+        """Tesseract kelime güvenlerinin (0-100, -1 = yok) ortalaması, 0-1 aralığında"""
+        values = [value for value in confidences if value >= 0]
+        return sum(values) / len(values) / 100.0 if values else 0.0
+
+    def parse_value(self, text: str, parser: str = PARSER_NUMBER) -> Optional[float]:
+        """Alan ayrıştırıcısıyla metinden tek bir sayı çıkar; bulunamazsa None"""
+        if parser == self.PARSER_TEMPERATURE:
+            parsed = OCRSensorData()
+            return parsed.temperature if parsed.parse_temperature_from_text(text) else None
+
+        parsed = self.parse_sensor_data(text)
+        if parsed is None:
+            return None
+        if parser == self.PARSER_PERCENT and not 0 <= parsed.temperature <= 100:
+            return None
+        return parsed.temperature
 
     def parse_sensor_data(self, ocr_text: str):
         """OCR metninden sıcaklık verisini ayıklama"""
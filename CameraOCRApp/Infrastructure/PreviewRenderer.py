@@ -0,0 +1,69 @@
+from typing import Optional
+import cv2
+import numpy as np
+from Domain.Models import ProcessingParams, rect_to_tuple
+from Infrastructure import ImagePipeline
+from Infrastructure.ProcessingPlan import compile_processing_plan
+from Infrastructure.ROIChangeDetector import ROIChangeDetector
+from Infrastructure.TemporalDenoiser import TemporalDenoiser
+
+class PreviewRenderer:
+    """Canlı önizleme için OCR yolundan bağımsız ön işleme.
+
+    Kendi tampon havuzu ve zamansal ortalaması vardır; OCRService ile yalnızca
+    değişmez derlenmiş planları paylaşır, bu yüzden önizleme OCR işlerinin
+    tamponlarını ne kullanır ne de kilitler. ``max_size`` verilirse ROI önce
+    (INTER_AREA ile) bu boyuta sığacak şekilde küçültülür. Parametreler,
+    dikdörtgen ve ROI içeriği (ROIChangeDetector ızgarası) değişmediyse iş
+    yapılmaz ve None döner; çağıran son görüntüyü göstermeye devam eder.
+    """
+
+    def __init__(self, change_threshold: float = 2.0):
+        self.buffers = ImagePipeline.BufferPool()
+        self.denoiser = TemporalDenoiser(max_entries=1)
+        # Önizleme süre dolduğu için yenilenmez; yalnızca içerik veya ayar değişince
+        self.detector = ROIChangeDetector(change_threshold, max_skip_seconds=0)
+        self._settling = 0
+        self.rendered = 0
+        self.skipped = 0
+
+    def render(self, frame: np.ndarray, rect, params: ProcessingParams, max_size=None) -> Optional[np.ndarray]:
+        """Karedeki ROI'nin işlenmiş önizlemesi; değişiklik yoksa veya ROI boşsa None"""
+        x, y, w, h = rect_to_tuple(rect)
+        roi = frame[y:y+h, x:x+w]
+        if roi.size == 0:
+            return None
+
+        if max_size is not None:
+            height, width = roi.shape[:2]
+            scale = min(max_size[0] / width, max_size[1] / height)
+            if scale < 1.0:
+                size = (max(int(width * scale), 1), max(int(height * scale), 1))
+                roi = cv2.resize(roi, size, interpolation=cv2.INTER_AREA)
+
+        context = ((x, y, w, h), params.cache_key(), max_size)
+        temporal = params.denoise > 0 and params.denoise_mode == 'temporal'
+        if self.detector.has_changed(roi, context):
+            # Zamansal ortalama birkaç karede oturur; o süre boyunca önizleme yenilenmeye devam eder
+            self._settling = params.denoise + 1 if temporal else 0
+        elif self._settling > 0:
+            self._settling -= 1
+        else:
+            self.skipped += 1
+            return None
+
+        if temporal:
+            roi = self.denoiser.apply(ImagePipeline.to_gray(roi, self.buffers), params.denoise + 1, (x, y, w, h))
+        self.rendered += 1
+        # Sonuç QImage'a verildiği için havuz tamponu değil kopyası döner
+        return compile_processing_plan(params).run(roi, self.buffers).copy()
+
+    def invalidate(self):
+        """Sonraki çağrıda yeniden çiz (ör. kamera değiştiğinde)"""
+        self.detector.reset()
+        self.denoiser.reset()
+
+    def stats(self) -> dict:
+        total = self.rendered + self.skipped
+        return {'rendered': self.rendered, 'skipped': self.skipped,
+                'skip_rate': self.skipped / total if total else 0.0}
@@ -0,0 +1,141 @@
+"""
+ProcessingParams'tan derlenen, değişmez ön işleme planı.
+
+Plan, etkisiz adımları (kontrast=1.0, keskinlik=1.0, aşındırma=1 ...) atlayan
+sıralı bir adım listesidir. LUT'lar ve çekirdekler derleme sırasında bir kez
+hazırlanır; planlar parametre değerleriyle anahtarlanan küçük bir LRU'da
+saklanır, bu yüzden bir değer değiştiğinde eski plan kendiliğinden geçersiz olur.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+import cv2
+import numpy as np
+from Domain.Models import ProcessingParams
+from Infrastructure import ImagePipeline
+
+PLAN_CACHE_SIZE = 16
+
+class PlanStep(NamedTuple):
+    name: str
+    args: tuple = ()
+
+@dataclass(frozen=True, eq=False)
+class ProcessingPlan:
+    key: tuple
+    steps: Tuple[PlanStep, ...]
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, ProcessingPlan) and other.key == self.key
+
+    def step_names(self) -> list:
+        return [step.name for step in self.steps]
+
+    def run(self, image, pool: ImagePipeline.BufferPool) -> np.ndarray:
+        """Planı uygula; sonuç havuzdaki bir tampondur, çağıran kopyalamalıdır"""
+        gray = ImagePipeline.to_gray(image, pool)
+        shape = gray.shape
+        work = gray
+        buffers = (pool.get('work_a', shape), pool.get('work_b', shape))
+        turn = 0
+
+        for name, args in self.steps:
+            # Her adım bir sonraki boş tampona yazar; girdi hiçbir zaman değiştirilmez
+            dst = buffers[turn]
+            if dst is work:
+                turn ^= 1
+                dst = buffers[turn]
+
+            if name == 'tone':
+                table, = args
+                lut = table[ImagePipeline.image_mean(work)] if table.ndim == 2 else table
+                cv2.LUT(work, lut, dst=dst)
+            elif name == 'sharpen':
+                ImagePipeline.sharpen(work, args[0], pool, dst)
+            elif name == 'blur':
+                cv2.GaussianBlur(work, args[0], 0, dst=dst)
+            elif name == 'denoise':
+                cv2.fastNlMeansDenoising(work, dst, args[0], 7, 21)
+            elif name == 'adaptive_threshold':
+                cv2.adaptiveThreshold(work, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                      cv2.THRESH_BINARY, 11, 2, dst=dst)
+            elif name == 'threshold':
+                ImagePipeline.threshold(work, args[0], dst)
+            elif name == 'erode':
+                cv2.erode(work, args[0], dst=dst, iterations=args[1])
+            elif name == 'dilate':
+                cv2.dilate(work, args[0], dst=dst, iterations=args[1])
+            elif name == 'invert':
+                cv2.bitwise_not(work, dst=dst)
+            else:
+                raise ValueError(f"Bilinmeyen plan adımı: {name}")
+
+            work = dst
+            turn ^= 1
+
+        return work
+
+def _tone_table(params: ProcessingParams):
+    """Kontrast/parlaklık/gamma için LUT; kontrast ortalamaya bağlı olduğundan
+    kontrast etkinse her olası ortalama için bir satır içeren 256x256 tablo"""
+    post = ImagePipeline.build_tone_lut(0, 1.0, params.brightness, params.gamma)
+    if params.contrast == 1.0:
+        post.setflags(write=False)
+        return post
+
+    means = np.arange(256, dtype=np.float32)[:, None]
+    values = np.arange(256, dtype=np.float32)[None, :]
+    # Image.blend(ortalama, görüntü, kontrast) - float32 ve kesme ile
+    table = means + np.float32(params.contrast) * (values - means)
+    np.clip(table, 0.0, 255.0, out=table)
+    table = post[table.astype(np.uint8)]
+    table.setflags(write=False)
+    return table
+
+def _compile(params: ProcessingParams) -> ProcessingPlan:
+    steps = []
+
+    if params.contrast != 1.0 or params.brightness != 1.0 or params.gamma != 1.0:
+        steps.append(PlanStep('tone', (_tone_table(params),)))
+
+    if params.sharpness != 1.0:
+        steps.append(PlanStep('sharpen', (params.sharpness,)))
+
+    if params.blur > 0:
+        size = 2 * params.blur + 1
+        steps.append(PlanStep('blur', ((size, size),)))
+
+    # Zamansal gürültü azaltma durum tuttuğu için planın dışında, OCRService'te yapılır
+    if params.denoise > 0 and params.denoise_mode != 'temporal':
+        steps.append(PlanStep('denoise', (params.denoise,)))
+
+    if params.adaptive_thresh:
+        steps.append(PlanStep('adaptive_threshold'))
+    else:
+        steps.append(PlanStep('threshold', (params.threshold,)))
+
+    if params.erode > 1:
+        steps.append(PlanStep('erode', (ImagePipeline.MORPH_KERNEL, params.erode - 1)))
+
+    if params.dilate > 1:
+        steps.append(PlanStep('dilate', (ImagePipeline.MORPH_KERNEL, params.dilate - 1)))
+
+    if params.invert:
+        steps.append(PlanStep('invert'))
+
+    return ProcessingPlan(key=params.cache_key(), steps=tuple(steps))
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile_cached(key: tuple) -> ProcessingPlan:
+    return _compile(ProcessingParams.from_key(key))
+
+def compile_processing_plan(params: ProcessingParams) -> ProcessingPlan:
+    """Parametrelerin o anki değerlerine ait planı (önbellekten) döndür"""
+    return _compile_cached(params.cache_key())
+
+def clear_plan_cache():
+    _compile_cached.cache_clear()
@@ -0,0 +1,75 @@
+import time
+import cv2
+import numpy as np
+
+class ROIChangeDetector:
+    """Kırpılmış ROI'nin son OCR'dan beri değişip değişmediğini ucuzca belirler.
+
+    ROI griye çevrilip küçük bir ızgaraya (INTER_AREA ile) indirgenir; her
+    hücre birkaç yüz pikselin ortalaması olduğundan kamera gürültüsü bastırılır,
+    ama tek bir segmentin yanıp sönmesi en az bir hücrede belirgin bir fark
+    bırakır. Referans yalnızca OCR çalıştırıldığında güncellenir, böylece yavaş
+    kaymalar birikerek gözden kaçmaz.
+    """
+
+    def __init__(self, threshold: float = 12.0, max_skip_seconds: float = 300.0, grid=(32, 32)):
+        self.threshold = threshold
+        self.max_skip_seconds = max_skip_seconds
+        self.grid = grid
+        self.hits = 0
+        self.misses = 0
+        self._reference = None
+        self._context = None
+        self._reference_time = 0.0
+
+    def has_changed(self, roi: np.ndarray, context=None) -> bool:
+        """ROI veya bağlam (dikdörtgen, parametreler, dil) değiştiyse True.
+
+        True döndüğünde bu ROI yeni referans olur; çağıran OCR'ı çalıştırmalıdır.
+        """
+        signature = self._signature(roi)
+        now = time.monotonic()
+
+        changed = (self._reference is None
+                   or context != self._context
+                   or signature.shape != self._reference.shape
+                   or (self.max_skip_seconds > 0 and now - self._reference_time >= self.max_skip_seconds)
+                   or self.difference(signature) > self.threshold)
+
+        if changed:
+            self.misses += 1
+            self._reference = signature
+            self._context = context
+            self._reference_time = now
+        else:
+            self.hits += 1
+        return changed
+
+    def difference(self, signature: np.ndarray) -> float:
+        """Referansla en büyük hücre farkı (gri seviye)"""
+        if self._reference is None or signature.shape != self._reference.shape:
+            return float('inf')
+        return float(cv2.absdiff(signature, self._reference).max())
+
+    def reset(self):
+        """Referansı unut; bir sonraki çağrı OCR'ı zorlar"""
+        self._reference = None
+        self._context = None
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate()}
+
+    def _signature(self, roi: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi
+        height, width = gray.shape[:2]
+        # ROI ızgaradan küçükse piksel başına bir hücre yeterli
+        size = (min(self.grid[0], width), min(self.grid[1], height))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
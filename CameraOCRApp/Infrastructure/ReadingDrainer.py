@@ -0,0 +1,147 @@
+import threading
+import time
+from Domain.Models import SensorData
+
+class ReadingDrainer:
+    """DurableReadingQueue'daki okumaları toplu halde hedeflere ileten arka plan iş parçacığı.
+
+    Her hedef ``send(items, target) -> (bool, str)`` biçiminde bir fonksiyondur
+    ve bu iş parçacığından çağrılır. Başarısız hedef üstel geri çekilmeyle
+    beklemeye alınır, diğer hedefler etkilenmez; biriken kuyruk hedef geri
+    geldiğinde tam dolu toplu işlemlerle ara vermeden boşaltılır.
+
+    Hedef, tekrar denense de başarılamayacak hatalarda (boş adres, 4xx yanıtı,
+    kodlanamayan gövde) üçüncü bir ``True`` değeri döndürür: ``(False, mesaj, True)``.
+    Bu okumalar ve ``max_attempts`` denemeyi aşanlar ayrılır ki arkalarındaki
+    okumaları bekletmesinler.
+    """
+
+    def __init__(self, reading_queue, batch_size: int = 500, poll_interval: float = 0.5,
+                 retry_backoff: float = 1.0, retry_backoff_max: float = 60.0, max_attempts: int = 100,
+                 on_forwarded=None):
+        self.reading_queue = reading_queue
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        # 0 veya None: geçici hatalarda sınırsız deneme
+        self.max_attempts = max_attempts
+        # on_forwarded(sink, items, success, message)
+        self.on_forwarded = on_forwarded
+
+        self._sinks = {}  # ad -> (send, batch_size)
+        self._retry_at = {}  # ad -> (tekrar deneme zamanı, gecikme)
+        self._sinks_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self.forwarded = 0
+        self.failures = 0
+        self.dead = 0
+
+    def set_sink(self, name: str, send, batch_size: int = None):
+        """Hedefi kaydet; ``send`` None ise hedef kaldırılır ve okumaları kuyrukta bekler"""
+        with self._sinks_lock:
+            if send is None:
+                self._sinks.pop(name, None)
+            else:
+                self._sinks[name] = (send, batch_size or self.batch_size)
+            self._retry_at.pop(name, None)
+        self._wake.set()
+
+    def submit(self, data: SensorData, sink: str, target: str = "") -> int:
+        """Okumayı önce diske yaz, sonra boşaltıcıyı uyandır"""
+        row_id = self.reading_queue.append(data, sink, target)
+        self._wake.set()
+        return row_id
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ReadingDrainer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """İş parçacığını durdur; gönderilemeyen okumalar diskte kalır"""
+        if not self._running:
+            return
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            'pending': self.reading_queue.count(),
+            'forwarded': self.forwarded,
+            'failures': self.failures,
+            'dead': self.dead,
+            'backoff': {name: max(at - time.monotonic(), 0.0)
+                        for name, (at, _) in list(self._retry_at.items())},
+        }
+
+    def _run(self):
+        while self._running:
+            self._wake.clear()
+            busy = False
+            with self._sinks_lock:
+                sinks = dict(self._sinks)
+            for name, (send, batch_size) in sinks.items():
+                if not self._running:
+                    break
+                busy |= self._drain_once(name, send, batch_size)
+            if not busy:
+                # Yeni okuma veya hedef eklenince hemen uyanır
+                self._wake.wait(self.poll_interval)
+
+    def _drain_once(self, name: str, send, batch_size: int) -> bool:
+        """Hedefe bir toplu işlem gönder; kuyrukta daha fazlası varsa True"""
+        retry = self._retry_at.get(name)
+        if retry is not None and time.monotonic() < retry[0]:
+            return False
+
+        peeked = self.reading_queue.peek_batch(name, batch_size)
+        if not peeked:
+            return False
+        # Tek gönderimde yalnızca aynı adrese giden ardışık okumalar gruplanır
+        target = peeked[0][2]
+        end = next((i for i, entry in enumerate(peeked) if entry[2] != target), len(peeked))
+        batch = peeked[:end]
+        ids = [row_id for row_id, _, _ in batch]
+        items = [data for _, data, _ in batch]
+
+        try:
+            result = send(items, target)
+            success, message = result[0], result[1]
+            permanent = len(result) > 2 and bool(result[2])
+        except Exception as e:
+            success, message, permanent = False, str(e), False
+
+        if success:
+            self.reading_queue.ack(ids)
+            self.forwarded += len(ids)
+            self._retry_at.pop(name, None)
+        elif permanent:
+            # Hedef çalışıyor ama bu okumaları hiçbir zaman kabul etmeyecek; beklemeden devam edilir
+            self.reading_queue.dead_letter(ids, message)
+            self.failures += 1
+            self.dead += len(ids)
+            message = f"{len(ids)} okuma kalıcı olarak iletilemedi, kuyruktan ayrıldı - {message}"
+        else:
+            dead = set(self.reading_queue.mark_failed(ids, self.max_attempts, message))
+            self.failures += 1
+            if dead:
+                self.dead += len(dead)
+                message = (f"{len(dead)} okuma {self.max_attempts} denemede iletilemedi, "
+                           f"kuyruktan ayrıldı - {message}")
+            delay = min(retry[1] * 2, self.retry_backoff_max) if retry else self.retry_backoff
+            self._retry_at[name] = (time.monotonic() + delay, delay)
+
+        if self.on_forwarded is not None:
+            self.on_forwarded(name, items, success, message)
+        if permanent:
+            # Ayrılan okumaların arkasındakiler hemen denenir
+            return True
+        return success and (len(peeked) >= batch_size or end < len(peeked))
@@ -0,0 +1,170 @@
+import cv2
+import numpy as np
+
+class SevenSegmentDecoder:
+    """İkili ROI'deki yedi segmentli LCD/LED rakamlarını Tesseract'sız çözer.
+
+    Ön plan (yanan segmentler) azınlık pikselleri sayılır; sütun izdüşümü
+    boşluklarından karakter hücreleri çıkarılır. Kısa ve altta kalan hücre
+    ondalık nokta, kısa ve ortada kalan hücre eksi işaretidir; dar ve uzun
+    hücre '1'dir. Diğer hücrelerde yedi segment bölgesinin doluluk oranı
+    integral görüntüden tüm hücreler için tek seferde okunur.
+
+    Güven, her segmentin eşikten uzaklığının en küçüğüdür (0-1); bilinmeyen
+    segment deseni veya belirsiz hücre güveni 0 yapar. Eğik (italik) paneller
+    desteklenmez, bunlarda güven düşer ve çağıran Tesseract'a döner.
+    """
+
+    # Segment sırası: a (üst), b (sağ üst), c (sağ alt), d (alt), e (sol alt), f (sol üst), g (orta)
+    # Hücreye göre bölgeler: (x0, x1, y0, y1) oranları; köşeler komşu segmentlere karışmasın diye dışarıda
+    SEGMENT_REGIONS = np.array([
+        (0.3, 0.7, 0.0, 0.2),
+        (0.7, 1.0, 0.2, 0.4),
+        (0.7, 1.0, 0.6, 0.8),
+        (0.3, 0.7, 0.8, 1.0),
+        (0.0, 0.3, 0.6, 0.8),
+        (0.0, 0.3, 0.2, 0.4),
+        (0.3, 0.7, 0.4, 0.6),
+    ])
+
+    # abcdefg bit deseni -> karakter (bazı panellerin 6, 7 ve 9 çizim farkları dahil)
+    PATTERNS = {
+        0b1111110: '0', 0b0110000: '1', 0b1101101: '2', 0b1111001: '3', 0b0110011: '4',
+        0b1011011: '5', 0b1011111: '6', 0b0011111: '6', 0b1110000: '7', 0b1110010: '7',
+        0b1111111: '8', 0b1111011: '9', 0b1110011: '9', 0b0000001: '-',
+    }
+
+    # Rakam yüksekliğinin bu oranından dar sütun boşlukları aynı rakamın segment aralığıdır
+    MERGE_GAP = 0.1
+
+    def __init__(self, on_threshold: float = 0.2, min_confidence: float = 0.5):
+        # Bölgenin bu oranından fazlası doluysa segment yanıyor sayılır
+        self.on_threshold = on_threshold
+        # Çağıranın sonucu kabul etmesi için gereken en düşük güven
+        self.min_confidence = min_confidence
+        self._weights = 1 << np.arange(6, -1, -1)
+
+    def decode(self, image) -> tuple[str, float]:
+        """(metin, güven) döndür; ör. ('-12.5', 0.92). Ön plan yoksa ('', 0.0)"""
+        foreground = self._foreground(image)
+        columns = foreground.any(axis=0)
+        if not columns.any():
+            return "", 0.0
+
+        # Segmentler arasındaki ince boşluklar rakamı parçalara böler; parçalar rakam
+        # yüksekliğine göre birleştirilir (ondalık nokta ayrı kalır)
+        extents = self._extents(foreground, self._runs(columns))
+        tallest = max(bottom - top for _, _, top, bottom in extents)
+        tall = [extent for extent in extents if extent[3] - extent[2] >= 0.6 * tallest]
+        top = min(extent[2] for extent in tall)
+        bottom = max(extent[3] for extent in tall)
+        height = bottom - top
+
+        merged = []
+        for extent in extents:
+            if (merged and extent[0] - merged[-1][1] < self.MERGE_GAP * height
+                    and not self._is_point(extent, top, height) and not self._is_point(merged[-1], top, height)):
+                previous = merged[-1]
+                merged[-1] = (previous[0], extent[1], min(previous[2], extent[2]), max(previous[3], extent[3]))
+            else:
+                merged.append(extent)
+        extents = merged
+
+        # '1' dışındaki rakamların genişliği; hepsi '1' ise tipik en-boy oranı varsayılır
+        wide = [end - start for start, end, run_top, run_bottom in extents
+                if run_bottom - run_top >= 0.6 * height and end - start >= 0.3 * height]
+        digit_width = float(np.median(wide)) if wide else 0.55 * height
+
+        chars = []
+        confidences = []
+        cells = []
+        for start, end, run_top, run_bottom in extents:
+            run_height = run_bottom - run_top
+            if run_height < 0.35 * height:
+                center = (run_top + run_bottom) / 2.0 - top
+                if center > 0.75 * height:
+                    chars.append('.')
+                elif 0.3 * height < center < 0.7 * height and end - start >= 0.75 * run_height:
+                    chars.append('-')
+                else:
+                    # Üstte kalan küçük leke: gürültü veya okunamayan işaret
+                    chars.append('?')
+                    confidences.append(0.0)
+                    continue
+                confidences.append(1.0)
+            elif end - start < 0.5 * digit_width:
+                # Yalnızca b ve c segmentleri: dikey doluluk oranı güveni belirler
+                coverage = foreground[top:bottom, start:end].any(axis=1).mean()
+                chars.append('1')
+                confidences.append(float(np.clip((coverage - 0.5) * 2.0, 0.0, 1.0)))
+            else:
+                # Sol segmentleri olmayan rakamlar (ör. 7) dar kalır; hücre sağ kenara hizalanır
+                cells.append((len(chars), max(min(start, end - int(round(digit_width))), 0), end))
+                chars.append('')
+
+        if cells:
+            for (index, _, _), char, confidence in zip(cells, *self._decode_cells(foreground, cells, top, bottom)):
+                chars[index] = char
+                confidences.append(confidence)
+
+        text = "".join(chars)
+        # Eksi yalnızca başta, nokta en fazla bir kez anlamlıdır
+        if '?' in text or '-' in text[1:] or text.count('.') > 1:
+            return text, 0.0
+        return text, min(confidences) if confidences else 0.0
+
+    def _decode_cells(self, foreground: np.ndarray, cells: list, top: int, bottom: int):
+        """Tüm hücrelerin yedi segment doluluğunu integral görüntüden tek seferde hesapla"""
+        integral = cv2.integral(foreground.view(np.uint8))
+
+        starts = np.array([start for _, start, _ in cells], np.float64)[:, None]
+        widths = np.array([end - start for _, start, end in cells], np.float64)[:, None]
+        height = float(bottom - top)
+        regions = self.SEGMENT_REGIONS
+        x0 = np.rint(starts + regions[:, 0] * widths).astype(np.intp)
+        x1 = np.maximum(np.rint(starts + regions[:, 1] * widths).astype(np.intp), x0 + 1)
+        y0 = np.rint(top + regions[:, 2] * height).astype(np.intp)
+        y1 = np.maximum(np.rint(top + regions[:, 3] * height).astype(np.intp), y0 + 1)
+        y0, y1 = np.broadcast_to(y0, x0.shape), np.broadcast_to(y1, x0.shape)
+
+        sums = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+        fill = sums / ((x1 - x0) * (y1 - y0))
+        lit = fill > self.on_threshold
+        margin = np.abs(fill - self.on_threshold) / self.on_threshold
+        confidences = np.clip(margin, 0.0, 1.0).min(axis=1)
+
+        codes = lit.astype(np.intp) @ self._weights
+        chars = [self.PATTERNS.get(int(code), '?') for code in codes]
+        confidences = [float(conf) if char != '?' else 0.0 for char, conf in zip(chars, confidences)]
+        return chars, confidences
+
+    @staticmethod
+    def _extents(foreground: np.ndarray, runs: list) -> list:
+        """Her sütun dizisi için (başlangıç, bitiş, üst, alt); satır sınırları tek reduceat ile bulunur"""
+        # Diziler arasındaki sütunlar boş olduğundan bir sonraki başlangıca kadar indirgemek yeterli
+        hits = np.logical_or.reduceat(foreground, [start for start, _ in runs], axis=1)
+        tops = hits.argmax(axis=0)
+        bottoms = hits.shape[0] - hits[::-1].argmax(axis=0)
+        return [(start, end, int(top), int(bottom)) for (start, end), top, bottom in zip(runs, tops, bottoms)]
+
+    @staticmethod
+    def _is_point(extent: tuple, top: int, height: int) -> bool:
+        """Alt kenarda kalan küçük kare: ondalık nokta adayı"""
+        start, end, run_top, run_bottom = extent
+        return (run_bottom - run_top < 0.35 * height and end - start < 0.35 * height
+                and (run_top + run_bottom) / 2.0 - top > 0.75 * height)
+
+    @staticmethod
+    def _foreground(image) -> np.ndarray:
+        array = np.asarray(image)
+        if array.ndim == 3:
+            array = array.mean(axis=2)
+        binary = array > 127
+        # Segmentler karenin azınlığıdır: açık zeminde koyu, koyu zeminde açık
+        return ~binary if binary.mean() > 0.5 else binary
+
+    @staticmethod
+    def _runs(columns: np.ndarray) -> list:
+        """Dolu sütun dizilerinin [başlangıç, bitiş) aralıkları"""
+        edges = np.diff(np.concatenate(([0], columns.astype(np.int8), [0])))
+        return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
@@ -0,0 +1,210 @@
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+
+class SharedFrameRing:
+    """``multiprocessing.shared_memory`` üzerinde sabit boyutlu kare halkası.
+
+    Yakalama süreci kareleri sırayla halkanın yuvalarına yazar; okuyucular
+    (OCR tarafı) kareyi turşulamadan (pickle) ve tamamını kopyalamadan
+    yalnızca ROI'yi okur. Her yuvanın sıra numarası yazma sırasında -1
+    yapılır; okuyucu kopyalamadan önce ve sonra numarayı karşılaştırır
+    (seqlock), böylece yazıcı aynı yuvaya döndüyse yırtık ROI döndürülmez.
+
+    Bellek düzeni: int64 başlık [sürüm, yükseklik, genişlik, kanal (gri: 0), yuva,
+    son sıra, kalp atışı ns, ayrılmış], ardından yuva sıra numaraları ve yuva
+    zamanları (monotonic ns), 64 bayta hizalanmış uint8 kare verisi.
+    """
+
+    VERSION = 1
+    HEADER_FIELDS = 8
+    _LATEST = 5
+    _HEARTBEAT = 6
+    # Okuyucu yırtık okuma gördüğünde bu kadar yeniden dener
+    READ_ATTEMPTS = 3
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        header = np.ndarray((self.HEADER_FIELDS,), np.int64, shm.buf)
+        if header[0] != self.VERSION:
+            raise ValueError(f"Paylaşımlı kare halkası sürümü uyumsuz: {self.name}")
+        height, width, channels = (int(v) for v in header[1:4])
+        self.shape = (height, width, channels) if channels else (height, width)
+        self.slots = int(header[4])
+        self._map(shm, self.shape, self.slots)
+
+    @classmethod
+    def _layout(cls, shape, slots: int) -> tuple:
+        meta_bytes = (cls.HEADER_FIELDS + 2 * slots) * 8
+        data_offset = (meta_bytes + 63) // 64 * 64
+        frame_bytes = int(np.prod(shape))
+        return meta_bytes, data_offset, data_offset + frame_bytes * slots
+
+    def _map(self, shm, shape, slots: int):
+        _, data_offset, _ = self._layout(shape, slots)
+        self._header = np.ndarray((self.HEADER_FIELDS,), np.int64, shm.buf)
+        self._slot_seq = np.ndarray((slots,), np.int64, shm.buf, offset=self.HEADER_FIELDS * 8)
+        self._slot_time = np.ndarray((slots,), np.int64, shm.buf, offset=(self.HEADER_FIELDS + slots) * 8)
+        self._frames = np.ndarray((slots,) + tuple(shape), np.uint8, shm.buf, offset=data_offset)
+
+    @classmethod
+    def create(cls, name: str, shape, slots: int = 4) -> 'SharedFrameRing':
+        """Yazıcı tarafı: verilen kare boyutu için yeni halka oluştur"""
+        shape = tuple(shape)
+        _, _, size = cls._layout(shape, slots)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((cls.HEADER_FIELDS,), np.int64, shm.buf)
+        header[:] = 0
+        header[1], header[2] = shape[:2]
+        header[3] = shape[2] if len(shape) == 3 else 0
+        header[4] = slots
+        np.ndarray((2 * slots,), np.int64, shm.buf, offset=cls.HEADER_FIELDS * 8)[:] = 0
+        header[0] = cls.VERSION
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedFrameRing':
+        """Okuyucu tarafı: var olan halkaya bağlan (FileNotFoundError yoksa)"""
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13: bağlanan süreç de kaynak izleyicisine kaydolur ve
+            # çıkışta yazıcının segmentini silerdi; kayıt geri alınır
+            shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm, owner=False)
+
+    def write(self, frame: np.ndarray) -> int:
+        """Kareyi sıradaki yuvaya yaz ve sıra numarasını döndür; boyut uymuyorsa 0"""
+        if frame.shape != self.shape:
+            return 0
+        sequence = int(self._header[self._LATEST]) + 1
+        index = sequence % self.slots
+        self._slot_seq[index] = -1
+        np.copyto(self._frames[index], frame)
+        self._slot_time[index] = time.monotonic_ns()
+        self._slot_seq[index] = sequence
+        self._header[self._LATEST] = sequence
+        return sequence
+
+    def heartbeat(self):
+        """Yazıcı kare üretemese de canlı olduğunu bildirir"""
+        self._header[self._HEARTBEAT] = time.monotonic_ns()
+
+    def heartbeat_age(self) -> float:
+        beat = int(self._header[self._HEARTBEAT])
+        return (time.monotonic_ns() - beat) / 1e9 if beat else float('inf')
+
+    def latest(self):
+        """(sıra, kare görünümü, monotonic saniye); görünüm yazıcı tarafından ezilebilir"""
+        sequence = int(self._header[self._LATEST])
+        if sequence == 0:
+            return 0, None, 0.0
+        index = sequence % self.slots
+        return sequence, self._frames[index], self._slot_time[index] / 1e9
+
+    def read_roi(self, x: int, y: int, w: int, h: int):
+        """En son karedeki ROI'nin tutarlı kopyasını (sıra, roi, zaman) olarak döndür"""
+        for _ in range(self.READ_ATTEMPTS):
+            sequence = int(self._header[self._LATEST])
+            if sequence == 0:
+                return 0, None, 0.0
+            index = sequence % self.slots
+            if self._slot_seq[index] != sequence:
+                continue
+            roi = self._frames[index, y:y+h, x:x+w].copy()
+            captured_at = self._slot_time[index] / 1e9
+            if self._slot_seq[index] == sequence:
+                return sequence, roi, captured_at
+        return 0, None, 0.0
+
+    def close(self):
+        # NumPy görünümleri bırakılmadan segment kapatılamaz
+        self._header = self._slot_seq = self._slot_time = self._frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Çağıranda hâlâ bir kare görünümü var; eşleme çöp toplayıcıyla kalkar
+            pass
+
+    def unlink(self):
+        self.close()
+        self.shm.unlink()
+
+    @staticmethod
+    def remove(name: str):
+        """Çöken bir yazıcıdan kalan segmenti sil"""
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return
+        shm.close()
+        shm.unlink()
+
+class SharedFrameSource:
+    """Başka bir süreçteki yakalayıcının halkasını CaptureSource gibi okuyan kaynak.
+
+    ``resolve(akış adı)`` o an geçerli halka adını (veya None) döndürür;
+    yakalama süreci yeniden başlatılıp yeni halka açtığında kaynak kendiliğinden
+    yeni halkaya geçer.
+    """
+
+    def __init__(self, stream_name: str, resolve, on_error=None):
+        self.stream_name = stream_name
+        self.resolve = resolve
+        self.on_error = on_error
+        self.ring = None
+        self.is_running = False
+        # Zamanlayıcı ve istatistik okuyan iş parçacıkları halka değişimini paylaşır
+        self._lock = threading.Lock()
+
+    def start_camera(self, config=None) -> bool:
+        with self._lock:
+            self.is_running = self._ensure_ring()
+        return self.is_running
+
+    def stop_camera(self):
+        with self._lock:
+            self.is_running = False
+            if self.ring is not None:
+                self.ring.close()
+                self.ring = None
+
+    def read_frame(self):
+        # Kareler yakalama sürecinde okunur; burada yapılacak iş yok
+        return None
+
+    def get_frame(self):
+        return self.get_latest_frame()[1]
+
+    def get_latest_frame(self):
+        with self._lock:
+            if not self._ensure_ring():
+                return 0, None, 0.0
+            return self.ring.latest()
+
+    def read_roi(self, rect):
+        with self._lock:
+            if not self._ensure_ring():
+                return None
+            return self.ring.read_roi(*rect)[1]
+
+    def _ensure_ring(self) -> bool:
+        name = self.resolve(self.stream_name)
+        if self.ring is not None and self.ring.name == name:
+            return True
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        if name is None:
+            return False
+        try:
+            self.ring = SharedFrameRing.attach(name)
+        except (FileNotFoundError, ValueError) as e:
+            if self.on_error is not None:
+                self.on_error(f"Paylaşımlı kare halkasına bağlanılamadı: {e}")
+            return False
+        return True
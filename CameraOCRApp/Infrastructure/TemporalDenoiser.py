@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+class TemporalDenoiser:
+    """Sabit kameralarda fastNlMeansDenoising yerine kareler arası üstel ortalama.
+
+    Her ROI anahtarı için önceden ayrılmış bir float32 ortalama tamponu
+    tutulur; gri ROI ``alpha = 2 / (kare sayısı + 1)`` ile bu ortalamaya
+    katılır ve ortalamanın uint8 kopyası hattın geri kalanına verilir.
+    Ortalamadan ``MOTION_THRESHOLD`` gri düzeyinden fazla ayrılan pikseller
+    (ör. değişen rakam) doğrudan yeni değeri alır, böylece eski rakamın izi
+    kalmaz. ROI boyutu değişince tampon sıfırlanır; piksellerin çoğu aynı
+    anda değişirse (kamera değişti veya oynadı) ortalama yeni kareden
+    yeniden başlar.
+    """
+
+    MOTION_THRESHOLD = 32.0
+    # Piksellerin bu oranından fazlası değiştiyse sahne değişmiş sayılır
+    RESET_FRACTION = 0.5
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+        self.resets = 0
+
+    def apply(self, gray: np.ndarray, frames: int, key) -> np.ndarray:
+        """Gri ROI'yi anahtarın ortalamasına kat; dönen uint8 dizi sonraki çağrıya kadar geçerlidir"""
+        alpha = 2.0 / (max(frames, 1) + 1.0)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or state['average'].shape != gray.shape:
+                state = self._states[key] = self._allocate(gray.shape)
+                while len(self._states) > self.max_entries:
+                    self._states.popitem(last=False)
+                np.copyto(state['average'], gray)
+            else:
+                self._states.move_to_end(key)
+                self._update(state, gray, alpha)
+            np.copyto(state['output'], state['average'], casting='unsafe')
+            return state['output']
+
+    def _update(self, state: dict, gray: np.ndarray, alpha: float):
+        average, frame, diff, moved = state['average'], state['frame'], state['diff'], state['moved']
+        np.copyto(frame, gray)
+        cv2.absdiff(frame, average, dst=diff)
+        np.greater(diff, self.MOTION_THRESHOLD, out=moved)
+        if np.count_nonzero(moved) > self.RESET_FRACTION * moved.size:
+            self.resets += 1
+            np.copyto(average, frame)
+            return
+        cv2.accumulateWeighted(frame, average, alpha)
+        np.copyto(average, frame, where=moved)
+
+    @staticmethod
+    def _allocate(shape) -> dict:
+        return {
+            'average': np.empty(shape, np.float32),
+            'frame': np.empty(shape, np.float32),
+            'diff': np.empty(shape, np.float32),
+            'moved': np.empty(shape, np.bool_),
+            'output': np.empty(shape, np.uint8),
+        }
+
+    def reset(self, key=None):
+        """Anahtarın (None ise tüm anahtarların) ortalamasını unut"""
+        with self._lock:
+            if key is None:
+                self._states.clear()
+            else:
+                self._states.pop(key, None)
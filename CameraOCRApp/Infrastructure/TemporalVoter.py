@@ -0,0 +1,88 @@
+from collections import deque
+from typing import Optional
+
+class TemporalVoter:
+    """Bir alanın son K okumasını güvenle ağırlıklandırıp yalnızca kararlı değeri verir.
+
+    Her OCR okuması pencereye bir oy ekler; değeri çıkarılamayan veya güveni
+    ``min_confidence`` altında kalan okuma boş oy sayılır ve pencerede yer
+    tutar. ``vote`` yönteminde güven toplamı en yüksek değer, ``median``
+    yönteminde ağırlıklı medyan seçilir (medyana ``tolerance`` kadar yakın
+    okumalar onu destekler). Seçilen değeri pencerenin çoğunluğu
+    (``window // 2 + 1`` oy) desteklemiyorsa sonuç None'dır; tek bir yanlış
+    okunmuş kare böylece kayda dönüşmez. ``window=1`` ve ``min_confidence=0``
+    her okumayı olduğu gibi geçirir.
+    """
+
+    METHOD_VOTE = "vote"
+    METHOD_MEDIAN = "median"
+    METHODS = [METHOD_VOTE, METHOD_MEDIAN]
+
+    def __init__(self, window: int = 1, min_confidence: float = 0.0, method: str = METHOD_VOTE,
+                 tolerance: float = 0.5):
+        if method not in self.METHODS:
+            raise ValueError(f"Bilinmeyen oylama yöntemi: {method}")
+        self.window = max(int(window), 1)
+        self.min_confidence = min_confidence
+        self.method = method
+        self.tolerance = tolerance
+        self._votes = deque(maxlen=self.window)
+        # Son ``add`` sonucu; ekran değişmediği sürece geçerli kalır
+        self.result = None
+        self.committed = 0
+        self.unstable = 0
+        self.rejected = 0
+
+    @property
+    def required(self) -> int:
+        """Değerin kaydedilmesi için gereken destekleyen oy sayısı"""
+        return self.window // 2 + 1
+
+    def add(self, value: Optional[float], confidence: float) -> Optional[float]:
+        """Okumayı pencereye ekle; kararlı değer veya None"""
+        if value is not None and confidence < self.min_confidence:
+            self.rejected += 1
+            value = None
+        self._votes.append((value, confidence) if value is not None else None)
+
+        votes = [vote for vote in self._votes if vote is not None]
+        result = None
+        if len(votes) >= self.required:
+            if self.method == self.METHOD_MEDIAN:
+                result = self._median(votes)
+            else:
+                result = self._majority(votes)
+        if result is None:
+            self.unstable += 1
+        else:
+            self.committed += 1
+        self.result = result
+        return result
+
+    def _majority(self, votes: list) -> Optional[float]:
+        weights = {}
+        counts = {}
+        for value, confidence in votes:
+            weights[value] = weights.get(value, 0.0) + confidence
+            counts[value] = counts.get(value, 0) + 1
+        # Eşit ağırlıkta daha yeni okunan değer kazanır
+        winner = max(reversed(list(weights)), key=weights.get)
+        return winner if counts[winner] >= self.required else None
+
+    def _median(self, votes: list) -> Optional[float]:
+        ordered = sorted(votes)
+        half = sum(confidence for _, confidence in ordered) / 2.0
+        median = ordered[-1][0]
+        total = 0.0
+        for value, confidence in ordered:
+            total += confidence
+            if total >= half:
+                median = value
+                break
+        support = sum(1 for value, _ in votes if abs(value - median) <= self.tolerance)
+        return median if support >= self.required else None
+
+    def reset(self):
+        """Pencereyi boşalt (ör. ROI veya ayarlar değiştiğinde)"""
+        self._votes.clear()
+        self.result = None
@@ -0,0 +1,104 @@
+import os
+import threading
+import numpy as np
+import pytesseract
+
+try:
+    import tesserocr
+except ImportError:  # İsteğe bağlı bağımlılık; yoksa pytesseract kullanılır
+    tesserocr = None
+
+class TesseractEngine:
+    """Tesseract C API'sini (tesserocr) dil ve iş parçacığı başına açık tutar.
+
+    Her çağrıda yeni bir ``tesseract`` süreci başlatmak ve traineddata'yı
+    yeniden yüklemek yerine API nesnesi bir kez oluşturulur; piksel verisi
+    geçici dosya olmadan doğrudan NumPy dizisinden aktarılır.
+    """
+
+    def __init__(self, tessdata_path: str = None, psm: int = 6):
+        self.tessdata_path = tessdata_path
+        self.psm = psm
+        self._local = threading.local()
+
+    @staticmethod
+    def is_available() -> bool:
+        return tesserocr is not None
+
+    def recognize(self, image, language: str = 'eng', psm: int = None, whitelist: str = "") -> str:
+        """Gri/ikili görüntüyü kalıcı motorla tanı; psm ve karakter listesi çağrı başına ayarlanır"""
+        return self._prepare(image, language, psm, whitelist).GetUTF8Text()
+
+    def recognize_scored(self, image, language: str = 'eng', psm: int = None, whitelist: str = "") -> tuple[str, float]:
+        """(metin, güven 0-1); güven aynı tanımanın ortalama kelime güvenidir, ek tanıma yapılmaz"""
+        api = self._prepare(image, language, psm, whitelist)
+        text = api.GetUTF8Text()
+        return text, max(api.MeanTextConf(), 0) / 100.0
+
+    def recognize_words(self, image, language: str = 'eng', psm: int = None, whitelist: str = "") -> list:
+        """Kelimeleri okuma sırasıyla (metin, sol, üst, genişlik, yükseklik, güven) olarak döndür"""
+        api = self._prepare(image, language, psm, whitelist)
+        api.Recognize()
+        level = tesserocr.RIL.WORD
+        words = []
+        for word in tesserocr.iterate_level(api.GetIterator(), level):
+            text = word.GetUTF8Text(level)
+            box = word.BoundingBox(level)
+            if text and box:
+                left, top, right, bottom = box
+                words.append((text, left, top, right - left, bottom - top, word.Confidence(level)))
+        return words
+
+    def _prepare(self, image, language: str, psm, whitelist: str):
+        array = self._as_gray_array(image)
+        height, width = array.shape
+        api = self._get_api(language)
+        # Aynı motor farklı alanlar için kullanıldığından ayarlar her çağrıda yenilenir
+        api.SetPageSegMode(self.psm if psm is None else psm)
+        api.SetVariable('tessedit_char_whitelist', whitelist)
+        api.SetImageBytes(array.tobytes(), width, height, 1, array.strides[0])
+        return api
+
+    def close(self):
+        """Bu iş parçacığına ait motorları kapat"""
+        apis = getattr(self._local, 'apis', None)
+        if apis:
+            for api in apis.values():
+                api.End()
+            apis.clear()
+
+    def _get_api(self, language: str):
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+
+        api = apis.get(language)
+        if api is None:
+            if tesserocr is None:
+                raise RuntimeError("tesserocr kurulu değil")
+            kwargs = {'lang': language, 'psm': self.psm}
+            path = self.tessdata_path or self._default_tessdata_path()
+            if path:
+                kwargs['path'] = path
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            apis[language] = api
+        return api
+
+    @staticmethod
+    def _default_tessdata_path():
+        """TESSDATA_PREFIX yoksa pytesseract'ın bulduğu kurulumun tessdata klasörü"""
+        if os.environ.get('TESSDATA_PREFIX'):
+            return None
+        cmd = pytesseract.pytesseract.tesseract_cmd
+        candidate = os.path.join(os.path.dirname(cmd), 'tessdata') if os.path.dirname(cmd) else ''
+        return candidate if candidate and os.path.isdir(candidate) else None
+
+    @staticmethod
+    def _as_gray_array(image) -> np.ndarray:
+        array = np.asarray(image)
+        if array.dtype == np.bool_:
+            # PIL '1' modundaki görüntüler bool dizisine dönüşür
+            array = array.astype(np.uint8) * 255
+        if array.ndim == 3:
+            array = array[:, :, 0] if array.shape[2] == 1 else array.mean(axis=2).astype(np.uint8)
+        return np.ascontiguousarray(array, dtype=np.uint8)
@@ -1,35 +1,258 @@
 # Infrastructure/WebService.py
+import gzip
+import struct
 import requests
 import json
-from Domain.Models import SensorData
+from typing import List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from Domain.Models import SensorData, WebServiceConfig
+from Infrastructure.AsyncWebSink import AsyncWebSink
+
+try:
+    import msgpack
+except ImportError:  # İsteğe bağlı bağımlılık; yoksa JSON kullanılır
+    msgpack = None
 
 class WebService:
-    def __init__(self):
-        pass
+    FORMAT_JSON = "json"
+    FORMAT_MSGPACK = "msgpack"
+    FORMAT_STRUCT = "struct"
+    FORMATS = [FORMAT_JSON, FORMAT_MSGPACK, FORMAT_STRUCT]
+    COMPRESSION_NONE = "none"
+    COMPRESSION_GZIP = "gzip"
+    COMPRESSIONS = [COMPRESSION_NONE, COMPRESSION_GZIP]
+
+    # Okuma başına 16 bayt: float32 sıcaklık, float32 nem, int64 epoch-ms (little-endian)
+    READING_STRUCT = struct.Struct('<ffq')
+    CONTENT_TYPES = {
+        FORMAT_JSON: "application/json",
+        FORMAT_MSGPACK: "application/msgpack",
+        FORMAT_STRUCT: "application/octet-stream",
+    }
+
+    def __init__(self, config: WebServiceConfig = None):
+        self.config = config or WebServiceConfig()
+        self.set_payload_format(self.config.payload_format, self.config.compression)
+        # Kalıcı oturum: TCP/TLS bağlantıları istekler arasında yeniden kullanılır
+        self.session = self._create_session(self.config)
+        # Asenkron gönderici kendi geri çekilmesiyle tekrar dener; istekleri taşıma katmanında tekrarlanmaz
+        self.sink_session = self._create_session(self.config, retries=False)
+        self.sink = None
+
+    @staticmethod
+    def _create_session(config: WebServiceConfig, retries: bool = True) -> requests.Session:
+        session = requests.Session()
+        if retries:
+            # POST yalnızca bağlantı kurulamadığında veya sunucu isteği işlemeden
+            # reddettiğinde (502/503/504) tekrarlanır; okuma zaman aşımında tekrar yok
+            retry = Retry(total=config.retries,
+                          connect=config.retries,
+                          read=0,
+                          status=config.retries,
+                          backoff_factor=config.retry_backoff,
+                          status_forcelist=(502, 503, 504),
+                          allowed_methods=frozenset(['POST']),
+                          raise_on_status=False)
+        else:
+            retry = 0
+        adapter = HTTPAdapter(pool_connections=config.pool_connections,
+                              pool_maxsize=config.pool_maxsize,
+                              max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def configure(self, config: WebServiceConfig):
+        """Ayarları değiştir; bağlantı havuzu yeni ayarlarla yeniden kurulur"""
+        old_sessions = (self.session, self.sink_session)
+        self.config = config
+        self.set_payload_format(config.payload_format, config.compression)
+        self.session = self._create_session(config)
+        self.sink_session = self._create_session(config, retries=False)
+        for session in old_sessions:
+            session.close()
+
+    def set_payload_format(self, payload_format: str, compression: str = None) -> tuple[bool, str]:
+        """Gövde biçimini seç: json (varsayılan), msgpack veya struct; isteğe bağlı gzip"""
+        if compression is not None:
+            if compression not in self.COMPRESSIONS:
+                return False, f"Bilinmeyen sıkıştırma: {compression}"
+            self.config.compression = compression
+        if payload_format not in self.FORMATS:
+            return False, f"Bilinmeyen gövde biçimi: {payload_format}"
+        if payload_format == self.FORMAT_MSGPACK and msgpack is None:
+            self.config.payload_format = self.FORMAT_JSON
+            return False, "msgpack kurulu değil, JSON kullanılacak"
+        self.config.payload_format = payload_format
+        return True, f"Gövde biçimi: {payload_format} ({self.config.compression})"
+
+    @staticmethod
+    def _payload(data: SensorData) -> dict:
+        return {
+            "temperature": data.temperature,
+            "humidity": data.humidity,
+            "timestamp": data.timestamp.isoformat()  # Zaman damgasını ISO formatına dönüştür
+        }
 
     def send_sensor_data(self, data: SensorData, url: str) -> tuple[bool, str]:
         """Sıcaklık ve nem verilerini bir web servisine POST isteği olarak gönderir."""
         if not url:
             return False, "Hata: Web Servis URL'si boş bırakılamaz."
-        
-        # Gönderilecek veriyi JSON formatına dönüştür
-        payload = {
+
+        success, message = self._post(url, data)
+        if success:
+            return True, f"Veri başarıyla gönderildi. Sunucu yanıtı: {message}"
+        return False, message
+
+    def send_sensor_data_batch(self, items: List[SensorData], url: str) -> tuple[bool, str]:
+        """Okumaları tek POST isteğinde gönderir; gövde seçili biçimdedir (json, msgpack veya struct,
+        isteğe bağlı gzip), bkz. ``encode_payload``."""
+        if not url:
+            return False, "Hata: Web Servis URL'si boş bırakılamaz."
+        if not items:
+            return True, "Gönderilecek veri yok"
+
+        success, message = self._post(url, list(items))
+        if success:
+            return True, f"{len(items)} kayıt başarıyla gönderildi. Sunucu yanıtı: {message}"
+        return False, message
+
+    def forward_readings(self, items: List[SensorData], url: str) -> tuple[bool, str, bool]:
+        """Kalıcı kuyruk boşaltıcısı için gönder; (başarılı, mesaj, kalıcı hata) döndürür.
+
+        Toplu kip kapalıysa tek okuma tek başına gönderilir.
+        """
+        if not url:
+            return False, "Hata: Web Servis URL'si boş bırakılamaz.", True
+        if not items:
+            return True, "Gönderilecek veri yok", False
+
+        payload = items[0] if len(items) == 1 and not self.config.batch_mode else list(items)
+        success, message, permanent = self._deliver(url, payload)
+        if success:
+            return True, f"{len(items)} kayıt başarıyla gönderildi. Sunucu yanıtı: {message}", False
+        return False, message, permanent
+
+    def post_readings(self, items: List[SensorData], url: str, batch: bool = True) -> requests.Response:
+        """Okumaları tekrar denemeden gönder (AsyncWebSink için); başarısızlıkta requests istisnası fırlatır"""
+        return self._send(url, items if batch else items[0], self.sink_session)
+
+    def encode_payload(self, payload) -> tuple[bytes, dict]:
+        """Okuma veya okuma listesini seçili biçimde kodla; (gövde, başlıklar) döndürür"""
+        payload_format = self.config.payload_format
+        if payload_format == self.FORMAT_STRUCT:
+            readings = payload if isinstance(payload, list) else [payload]
+            body = b''.join(self.READING_STRUCT.pack(data.temperature, data.humidity,
+                                                     self._epoch_ms(data)) for data in readings)
+        elif payload_format == self.FORMAT_MSGPACK:
+            if isinstance(payload, list):
+                body = msgpack.packb([self._compact_payload(data) for data in payload], use_single_float=True)
+            else:
+                body = msgpack.packb(self._compact_payload(payload), use_single_float=True)
+        else:
+            if isinstance(payload, list):
+                document = [self._payload(data) for data in payload]
+            else:
+                document = self._payload(payload)
+            body = json.dumps(document, separators=(',', ':')).encode('utf-8')
+
+        headers = {"Content-Type": self.CONTENT_TYPES[payload_format]}
+        # Çok küçük gövdelerde gzip başlığı kazançtan büyük olur
+        if self.config.compression == self.COMPRESSION_GZIP and len(body) >= self.config.gzip_min_bytes:
+            body = gzip.compress(body, compresslevel=self.config.gzip_level, mtime=0)
+            headers["Content-Encoding"] = "gzip"
+        return body, headers
+
+    @staticmethod
+    def _epoch_ms(data: SensorData) -> int:
+        return int(data.timestamp.timestamp() * 1000)
+
+    @classmethod
+    def _compact_payload(cls, data: SensorData) -> dict:
+        return {
             "temperature": data.temperature,
             "humidity": data.humidity,
-            "timestamp": data.timestamp.isoformat()  # Zaman damgasını ISO formatına dönüştür
+            "timestamp": cls._epoch_ms(data)
         }
-        
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Bağlantı kurma hatası, bağlantı zaman aşımı ve 5xx yanıtları geçicidir.
+
+        Okuma zaman aşımında sunucu isteği işlemiş olabilir; tekrar okumayı çoğaltır.
+        """
+        if isinstance(error, requests.exceptions.ReadTimeout):
+            return False
+        if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+            return True
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            return error.response.status_code >= 500
+        return False
+
+    @staticmethod
+    def is_permanent(error: Exception) -> bool:
+        """Tekrar denense de başarılamayacak hatalar: 4xx yanıtları (408 ve 429 hariç),
+        geçersiz adres ve kodlanamayan gövde."""
+        if isinstance(error, requests.exceptions.HTTPError):
+            if error.response is None:
+                return False
+            status = error.response.status_code
+            return 400 <= status < 500 and status not in (408, 429)
+        if isinstance(error, (requests.exceptions.InvalidURL, requests.exceptions.MissingSchema,
+                              requests.exceptions.InvalidSchema)):
+            return True
+        if isinstance(error, requests.exceptions.RequestException):
+            return False
+        return isinstance(error, (ValueError, TypeError, OverflowError, struct.error))
+
+    def _send(self, url: str, payload, session: requests.Session = None) -> requests.Response:
+        body, headers = self.encode_payload(payload)
+        response = (session or self.session).post(url, data=body, headers=headers,
+                                                  timeout=(self.config.connect_timeout, self.config.read_timeout))
+        response.raise_for_status()  # HTTP hatalarını kontrol et (örn. 404, 500)
+        return response
+
+    def _post(self, url: str, payload) -> tuple[bool, str]:
+        success, message, _ = self._deliver(url, payload)
+        return success, message
+
+    def _deliver(self, url: str, payload) -> tuple[bool, str, bool]:
         try:
-            headers = {"Content-Type": "application/json"}
-            # POST isteği gönder
-            response = requests.post(url, data=json.dumps(payload), headers=headers, timeout=10)
-            response.raise_for_status()  # HTTP hatalarını kontrol et (örn. 404, 500)
-            
-            # Başarılı yanıt
-            return True, f"Veri başarıyla gönderildi. Sunucu yanıtı: {response.text}"
-            
+            return True, self._send(url, payload).text, False
+
         except requests.exceptions.RequestException as e:
             # Bağlantı hatalarını veya diğer istek hatalarını yakala
-            return False, f"Web Servis bağlantı hatası: {e}"
+            return False, f"Web Servis bağlantı hatası: {e}", self.is_permanent(e)
         except Exception as e:
-            return False, f"Genel hata: {e}"
\ No newline at end of file
+            return False, f"Genel hata: {e}", self.is_permanent(e)
+
+    def start_sink(self, on_result=None, on_dropped=None):
+        """Asenkron gönderici iş parçacığını başlat; geri çağırmalar o iş parçacığından çağrılır"""
+        self.stop_sink()
+        self.sink = AsyncWebSink(self,
+                                 max_queue=self.config.async_queue_size,
+                                 max_in_flight=self.config.max_in_flight,
+                                 max_attempts=self.config.max_attempts,
+                                 retry_base_delay=self.config.retry_base_delay,
+                                 retry_max_delay=self.config.retry_max_delay,
+                                 on_result=on_result,
+                                 on_dropped=on_dropped)
+        self.sink.start()
+
+    def stop_sink(self):
+        if self.sink is not None:
+            self.sink.stop()
+            self.sink = None
+
+    def submit_sensor_data(self, data: SensorData, url: str) -> bool:
+        """Okumayı bloklamadan asenkron göndericiye bırak; gönderici yoksa veya kuyruk doluysa False"""
+        if self.sink is None:
+            return False
+        return self.sink.submit(data, url)
+
+    def close(self):
+        """Kuyruğu gönder, bağlantı havuzlarını kapat"""
+        self.stop_sink()
+        self.session.close()
+        self.sink_session.close()
@@ -2,8 +2,38 @@
 Infrastructure katmanı - Harici servisler ve veri erişimi
 """
 
-from .CameraService import CameraService
-from .OCRService import OCRService
-from .DatabaseService import DatabaseService
+import importlib
 
-__all__ = ['CameraService', 'OCRService', 'DatabaseService']
\ No newline at end of file
+from .CaptureSource import CaptureSource
+from .DatabaseWriter import DatabaseWriter
+from .DurableReadingQueue import DurableReadingQueue
+from .ReadingDrainer import ReadingDrainer
+from .AsyncWebSink import AsyncWebSink
+from .FrameGrabber import FrameGrabber
+from .ROIChangeDetector import ROIChangeDetector
+from .OCRResultCache import OCRResultCache
+from .ProcessingPlan import ProcessingPlan, compile_processing_plan
+from .SharedFrameRing import SharedFrameRing, SharedFrameSource
+from .MultiROIReader import MultiROIReader, FieldReading
+from .SevenSegmentDecoder import SevenSegmentDecoder
+from .TemporalVoter import TemporalVoter
+from .GlyphScaler import GlyphScaler
+from .TemporalDenoiser import TemporalDenoiser
+from .PreviewRenderer import PreviewRenderer
+
+__all__ = ['CameraService', 'CaptureSource', 'OCRService', 'DatabaseService', 'DatabaseWriter', 'ConnectionPool', 'DurableReadingQueue', 'ReadingDrainer', 'AsyncWebSink', 'FrameGrabber', 'ROIChangeDetector', 'OCRResultCache', 'ProcessingPlan', 'compile_processing_plan', 'SharedFrameRing', 'SharedFrameSource', 'MultiROIReader', 'FieldReading', 'SevenSegmentDecoder', 'TemporalVoter', 'GlyphScaler', 'TemporalDenoiser', 'PreviewRenderer']
+
+# PyQt5, pytesseract ve pyodbc'ye bağlı sınıflar ilk erişimde yüklenir; başsız kip PyQt5'i
+# hiç içe aktarmaz, çözücü ve görüntü adımları (ve testleri) bu bağımlılıklar olmadan çalışır
+_LAZY = {
+    'CameraService': '.CameraService',
+    'OCRService': '.OCRService',
+    'DatabaseService': '.DatabaseService',
+    'ConnectionPool': '.ConnectionPool',
+}
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
\ No newline at end of file
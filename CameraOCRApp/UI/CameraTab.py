@@ -1,11 +1,13 @@
 import cv2
-import numpy as np
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QTextEdit, QLabel, QLineEdit, QGroupBox, QComboBox, 
                              QSpinBox, QCheckBox, QFormLayout, QScrollArea)
 from PyQt5.QtCore import Qt, QTimer, QRect
 from PyQt5.QtGui import QImage, QPixmap, QPainter, QPen, QColor, QFont
-from Domain.Models import CameraConfig, OCRConfig, ProcessingParams
+from Domain.Models import CameraConfig, ROIField, OCRConfig, ProcessingParams
+from Infrastructure.MultiROIReader import MultiROIReader
+from Infrastructure.PreviewRenderer import PreviewRenderer
+from UI.OCRJobRunner import OCRJobRunner
 
 class CameraTab(QWidget):
     def __init__(self, camera_service, ocr_service):
@@ -16,6 +18,10 @@ class CameraTab(QWidget):
         self.ocr_config = OCRConfig()
         self.ocr_config.selection_rect = QRect(100, 100, 200, 150)
         self.processing_params = ProcessingParams()
+        # OCR havuz iş parçacığında çalışır; önizleme Tesseract'ı beklemez
+        self.ocr_runner = OCRJobRunner(ocr_service, parent=self)
+        # Önizleme kendi hızında ve kendi tamponlarıyla çalışır; OCR ile yarışmaz
+        self.preview_renderer = PreviewRenderer()
         
         self.is_selecting = False
         self.is_dragging = False
@@ -82,6 +88,10 @@ class CameraTab(QWidget):
         self.use_rtsp_checkbox = QCheckBox("RTSP Kullan")
         rtsp_layout.addRow(self.use_rtsp_checkbox)
         
+        self.threaded_capture_checkbox = QCheckBox("Arka Planda Yakala (yalnızca son kare)")
+        self.threaded_capture_checkbox.setChecked(True)
+        rtsp_layout.addRow(self.threaded_capture_checkbox)
+        
         rtsp_group.setLayout(rtsp_layout)
         cam_layout.addWidget(rtsp_group)
         
@@ -95,6 +105,21 @@ class CameraTab(QWidget):
         self.btn_stop.setStyleSheet("QPushButton { background-color: #f44336; color: white; font-weight: bold; }")
         cam_layout.addWidget(self.btn_stop)
         
+        # İşlenmiş önizleme hızı ve küçültülmüş girdi
+        preview_layout = QHBoxLayout()
+        preview_layout.addWidget(QLabel("Önizleme:"))
+        self.preview_rate_spin = QSpinBox()
+        self.preview_rate_spin.setRange(1, 30)
+        self.preview_rate_spin.setValue(5)
+        self.preview_rate_spin.setSuffix(" fps")
+        self.preview_rate_spin.valueChanged.connect(self.update_preview_rate)
+        preview_layout.addWidget(self.preview_rate_spin)
+        self.preview_downscale_checkbox = QCheckBox("Küçültülmüş girdi")
+        self.preview_downscale_checkbox.setChecked(True)
+        self.preview_downscale_checkbox.stateChanged.connect(self.update_processed_frame)
+        preview_layout.addWidget(self.preview_downscale_checkbox)
+        cam_layout.addLayout(preview_layout)
+        
         self.btn_refresh = QPushButton("🔄 Yenile")
         self.btn_refresh.clicked.connect(self.refresh_cam_list)
         cam_layout.addWidget(self.btn_refresh)
@@ -116,6 +141,14 @@ class CameraTab(QWidget):
         ocr_layout.addWidget(QLabel("OCR Dili:"))
         ocr_layout.addWidget(self.lang_combo)
         
+        # OCR motoru seçimi
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItems(self.ocr_service.BACKENDS)
+        self.backend_combo.setCurrentText(self.ocr_config.backend)
+        self.backend_combo.currentTextChanged.connect(self.change_ocr_backend)
+        ocr_layout.addWidget(QLabel("OCR Motoru:"))
+        ocr_layout.addWidget(self.backend_combo)
+        
         # Selection size
         size_layout = QHBoxLayout()
         size_layout.addWidget(QLabel("Genişlik:"))
@@ -135,6 +168,37 @@ class CameraTab(QWidget):
         size_layout.addWidget(self.btn_set_size)
         
         ocr_layout.addLayout(size_layout)
+        
+        # Aynı kareden okunacak adlandırılmış alanlar (ör. sıcaklık ve nem)
+        field_layout = QHBoxLayout()
+        self.field_name_input = QLineEdit()
+        self.field_name_input.setPlaceholderText("Alan adı")
+        field_layout.addWidget(self.field_name_input)
+        
+        self.field_target_combo = QComboBox()
+        self.field_target_combo.addItems(MultiROIReader.SENSOR_FIELDS)
+        field_layout.addWidget(self.field_target_combo)
+        
+        self.field_parser_combo = QComboBox()
+        self.field_parser_combo.addItems(self.ocr_service.PARSERS)
+        field_layout.addWidget(self.field_parser_combo)
+        
+        self.field_engine_combo = QComboBox()
+        self.field_engine_combo.addItems(self.ocr_service.ENGINES)
+        field_layout.addWidget(self.field_engine_combo)
+        
+        self.btn_add_field = QPushButton("➕ Seçimi Alan Yap")
+        self.btn_add_field.clicked.connect(self.add_roi_field)
+        field_layout.addWidget(self.btn_add_field)
+        
+        self.btn_clear_fields = QPushButton("🗑️ Alanları Temizle")
+        self.btn_clear_fields.clicked.connect(self.clear_roi_fields)
+        field_layout.addWidget(self.btn_clear_fields)
+        
+        ocr_layout.addLayout(field_layout)
+        self.fields_label = QLabel()
+        ocr_layout.addWidget(self.fields_label)
+        self.update_fields_label()
         ocr_group.setLayout(ocr_layout)
         
         control_layout.addWidget(cam_group)
@@ -159,10 +223,15 @@ class CameraTab(QWidget):
         # Timer for camera update
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
+        # İşlenmiş önizleme kamera karelerinden bağımsız, son kareden kendi hızında yenilenir
+        self.preview_timer = QTimer()
+        self.preview_timer.timeout.connect(self.update_processed_frame)
         
     def connect_signals(self):
         self.camera_service.frame_updated.connect(self.display_frame)
         self.camera_service.camera_error.connect(self.handle_camera_error)
+        self.ocr_runner.result_ready.connect(self.on_ocr_result)
+        self.ocr_runner.job_failed.connect(self.on_ocr_failed)
         
     def refresh_cam_list(self):
         self.cam_combo.clear()
@@ -177,21 +246,33 @@ class CameraTab(QWidget):
         self.camera_config.username = self.username_input.text()
         self.camera_config.password = self.password_input.text()
         self.camera_config.use_rtsp = self.use_rtsp_checkbox.isChecked()
+        self.camera_config.threaded_capture = self.threaded_capture_checkbox.isChecked()
         
         if self.camera_service.start_camera(self.camera_config):
+            # Önceki kameranın kare ortalamaları yeni görüntüye karışmasın
+            self.ocr_service.reset_temporal_denoise()
+            self.preview_renderer.invalidate()
             self.timer.start(30)
+            self.preview_timer.start(self.preview_interval())
             
     def stop_camera(self):
         self.timer.stop()
+        self.preview_timer.stop()
         self.camera_service.stop_camera()
         self.camera_label.clear()
         self.processed_label.clear()
         self.text_result.setText("Kamera durduruldu.")
         
     def update_frame(self):
-        frame = self.camera_service.read_frame()
-        if frame is not None:
-            self.update_processed_frame()
+        # Kare frame_updated sinyaliyle gösterilir; işlenmiş önizleme preview_timer'dadır
+        self.camera_service.read_frame()
+    
+    def preview_interval(self) -> int:
+        return int(1000 / self.preview_rate_spin.value())
+    
+    def update_preview_rate(self):
+        if self.preview_timer.isActive():
+            self.preview_timer.setInterval(self.preview_interval())
                 
     def display_frame(self, frame):
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -228,6 +309,13 @@ class CameraTab(QWidget):
         info = f"{self.ocr_config.selection_rect.width()}×{self.ocr_config.selection_rect.height()}"
         painter.drawText(self.ocr_config.selection_rect.x(), self.ocr_config.selection_rect.y() - 10, info)
         
+        # Tanımlı okuma alanları
+        painter.setPen(QPen(QColor(0, 200, 0), 2))
+        painter.setBrush(Qt.NoBrush)
+        for roi_field in self.ocr_config.fields:
+            painter.drawRect(roi_field.rect)
+            painter.drawText(roi_field.rect.x(), roi_field.rect.bottom() + 14, roi_field.name)
+        
         painter.end()
         
         self.camera_label.setPixmap(pixmap.scaled(self.camera_label.size(), 
@@ -238,26 +326,20 @@ class CameraTab(QWidget):
         frame = self.camera_service.get_frame()
         if frame is None or self.ocr_config.selection_rect.isEmpty():
             return
-            
-        x, y, w, h = (self.ocr_config.selection_rect.x(), self.ocr_config.selection_rect.y(),
-                      self.ocr_config.selection_rect.width(), self.ocr_config.selection_rect.height())
         
-        cropped = frame[y:y+h, x:x+w]
-        processed = self.ocr_service.preprocess_image(cropped, self.processing_params)
+        max_size = None
+        if self.preview_downscale_checkbox.isChecked():
+            # Etikete sığmayacak çözünürlük işlenmez
+            max_size = (self.processed_label.width(), self.processed_label.height())
+        processed = self.preview_renderer.render(frame, self.ocr_config.selection_rect,
+                                                 self.processing_params, max_size)
+        if processed is None:
+            # ROI ve parametreler değişmedi: son önizleme geçerli
+            return
         
         # Convert to QImage
-        if isinstance(processed, np.ndarray):
-            if len(processed.shape) == 2:  # Grayscale
-                h, w = processed.shape
-                bytes_per_line = w
-                qt_image = QImage(processed.data, w, h, bytes_per_line, QImage.Format_Grayscale8)
-            else:  # Color
-                h, w, ch = processed.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(processed.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        else:  # PIL Image
-            qt_image = QImage(processed.tobytes(), processed.width, processed.height, 
-                            processed.width, QImage.Format_Grayscale8)
+        h, w = processed.shape
+        qt_image = QImage(processed.data, w, h, w, QImage.Format_Grayscale8)
         
         pixmap = QPixmap.fromImage(qt_image)
         self.processed_label.setPixmap(pixmap.scaled(self.processed_label.size(), 
@@ -346,6 +428,33 @@ class CameraTab(QWidget):
                 
         self.ocr_config.selection_rect = new_rect
         
+    def add_roi_field(self):
+        if self.ocr_config.selection_rect.isEmpty():
+            self.text_result.setText("Lütfen önce bir alan seçin!")
+            return
+        
+        sensor_field = self.field_target_combo.currentText()
+        name = self.field_name_input.text().strip() or sensor_field
+        roi_field = ROIField(name=name, rect=QRect(self.ocr_config.selection_rect),
+                             sensor_field=sensor_field, parser=self.field_parser_combo.currentText(),
+                             engine=self.field_engine_combo.currentText())
+        # Aynı adlı veya aynı SensorData alanını okuyan eski alanın yerini alır
+        self.ocr_config.fields = [item for item in self.ocr_config.fields
+                                  if item.name != name and item.sensor_field != sensor_field] + [roi_field]
+        self.field_name_input.clear()
+        self.update_fields_label()
+    
+    def clear_roi_fields(self):
+        self.ocr_config.fields = []
+        self.update_fields_label()
+    
+    def update_fields_label(self):
+        if not self.ocr_config.fields:
+            self.fields_label.setText("Alanlar: seçili alan sıcaklık olarak okunur")
+            return
+        self.fields_label.setText("Alanlar: " + ", ".join(f"{item.name} → {item.sensor_field}"
+                                                         for item in self.ocr_config.fields))
+    
     def run_ocr(self):
         if self.camera_service.get_frame() is None or self.ocr_config.selection_rect.isEmpty():
             self.text_result.setText("Lütfen önce bir alan seçin!")
@@ -355,14 +464,21 @@ class CameraTab(QWidget):
                       self.ocr_config.selection_rect.width(), self.ocr_config.selection_rect.height())
         
         cropped = self.camera_service.get_frame()[y:y+h, x:x+w]
-        processed = self.ocr_service.preprocess_image(cropped, self.processing_params)
-        
-        try:
-            lang = self.lang_combo.currentText()
-            text = self.ocr_service.extract_text(processed, lang)
-            self.text_result.setText(text.strip() if text.strip() else "Metin bulunamadı")
-        except Exception as e:
-            self.text_result.setText(f"OCR hatası: {str(e)}")
+        lang = self.lang_combo.currentText()
+        # Zamansal ortalama ve karakter ölçeği bu dikdörtgene özgüdür
+        if not self.ocr_runner.submit(cropped, self.processing_params, lang, roi_key=('camera', (x, y, w, h))):
+            self.text_result.setText("Önceki OCR sürüyor, bu istek sonra çalıştırılacak...")
+    
+    def on_ocr_result(self, context, text, parsed):
+        self.text_result.setText(text.strip() if text.strip() else "Metin bulunamadı")
+    
+    def on_ocr_failed(self, context, message):
+        self.text_result.setText(f"OCR hatası: {message}")
+    
+    def change_ocr_backend(self, backend):
+        success, message = self.ocr_service.set_backend(backend)
+        self.ocr_config.backend = self.ocr_service.backend
+        self.text_result.setText(message)
     
     def get_processing_params(self):
         """Processing parametrelerini döndür"""
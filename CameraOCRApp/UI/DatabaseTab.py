@@ -4,19 +4,32 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
                              QLabel, QTextEdit, QSpinBox, QDoubleSpinBox,
                              QTableWidget, QTableWidgetItem, QHeaderView,
                              QMessageBox, QComboBox, QDateTimeEdit, QRadioButton)
-from PyQt5.QtCore import Qt, QTimer, QDateTime
+from PyQt5.QtCore import Qt, QTimer, QDateTime, pyqtSignal
 from PyQt5.QtGui import QFont
-from Domain.Models import DatabaseConfig, SensorData, OCRSensorData
+from Domain.Models import DatabaseConfig
+from Infrastructure.MultiROIReader import MultiROIReader
+from UI.OCRJobRunner import OCRJobRunner
 from datetime import datetime
 
 class DatabaseTab(QWidget):
-    def __init__(self, database_service, camera_service, ocr_service, ocr_config, web_service):
+    # Arka plan yazıcısının sonuçları; GUI iş parçacığına kuyruklu olarak taşınır
+    db_row_written = pyqtSignal(object, bool, str)
+    db_row_dropped = pyqtSignal(object, str)
+    db_records_loaded = pyqtSignal(list)
+    # Kalıcı kuyruk boşaltıcısının sonuçları: (hedef, okumalar, başarı, mesaj)
+    reading_forwarded = pyqtSignal(str, list, bool, str)
+    # Asenkron web göndericisinin sonuçları: (okumalar, adres, başarı, mesaj)
+    web_sent = pyqtSignal(list, str, bool, str)
+    web_dropped = pyqtSignal(object, str)
+    
+    def __init__(self, database_service, camera_service, ocr_service, ocr_config, web_service, reading_drainer=None):
         super().__init__()
         self.database_service = database_service
         self.camera_service = camera_service
         self.ocr_service = ocr_service
         self.ocr_config = ocr_config
         self.web_service = web_service
+        self.reading_drainer = reading_drainer
         self.config = DatabaseConfig()
         
         # Sabit bağlantı bilgileri buraya eklendi
@@ -28,12 +41,38 @@ class DatabaseTab(QWidget):
         self.config.port = 1433
 
         self.processing_params = None
+        # Tüm ROI alanları aynı kareden okunur; değişmeyen alanların son okuması kullanılır
+        self.field_reader = MultiROIReader(self.ocr_service,
+                                           self.ocr_config.change_threshold,
+                                           self.ocr_config.max_skip_seconds,
+                                           self.ocr_config.stitch_rois,
+                                           self.ocr_config.vote_frames,
+                                           self.ocr_config.min_confidence,
+                                           self.ocr_config.vote_method,
+                                           self.ocr_config.vote_tolerance)
+        # Nem alanı tanımlı değilse kayıtlara yazılan sabit nem
+        self.default_humidity = 70.0
+        # Tesseract havuz iş parçacığında çalışır; sonuç sinyalle GUI'ye döner
+        self.ocr_runner = OCRJobRunner(self.ocr_service, parent=self)
+        self.ocr_runner.fields_ready.connect(self.on_ocr_result)
+        self.ocr_runner.job_failed.connect(self.on_ocr_failed)
+        self.ocr_service.configure_result_cache(self.ocr_config.result_cache_size,
+                                                self.ocr_config.result_cache_ttl)
         self.timer = QTimer()
         self.timer.timeout.connect(self.auto_ocr_and_save)
         self.ocr_timer = QTimer()
         self.ocr_timer.timeout.connect(self.read_ocr_temperature)
+        self.db_row_written.connect(self.on_db_row_written)
+        self.db_row_dropped.connect(self.on_db_row_dropped)
+        self.db_records_loaded.connect(self.populate_table)
+        self.reading_forwarded.connect(self.on_reading_forwarded)
+        self.web_sent.connect(self.on_web_sent)
+        self.web_dropped.connect(self.on_web_dropped)
         
         self.init_ui()
+        self.start_reading_drainer()
+        # Kalıcı kuyruk kapalıyken web gönderimi GUI iş parçacığını bekletmesin
+        self.web_service.start_sink(on_result=self.web_sent.emit, on_dropped=self.web_dropped.emit)
         self.connect_db()
 
     def init_ui(self):
@@ -50,13 +89,22 @@ class DatabaseTab(QWidget):
         self.web_service_radio = QRadioButton("Web Servisine Gönder")
         self.web_service_radio.toggled.connect(self.toggle_web_service_input)
         
-        self.web_service_url_input = QLineEdit("webservice")
+        self.web_service_url_input = QLineEdit(self.web_service.config.url or "webservice")
         self.web_service_url_input.setPlaceholderText("Web Servis URL'sini girin (örn: http://localhost:5000/api/data)")
         self.web_service_url_input.hide()
         
+        self.web_batch_check = QCheckBox("Toplu gönderim (okumaları JSON dizisi olarak gönder)")
+        self.web_batch_check.setChecked(self.web_service.config.batch_mode)
+        self.web_batch_check.stateChanged.connect(self.update_web_batch_mode)
+        self.web_batch_check.hide()
+        
         data_target_layout.addWidget(self.db_radio)
         data_target_layout.addWidget(self.web_service_radio)
         data_target_layout.addWidget(self.web_service_url_input)
+        data_target_layout.addWidget(self.web_batch_check)
+        self.web_sink_label = QLabel("Web kuyruğu: 0 / gönderimde: 0")
+        self.web_sink_label.hide()
+        data_target_layout.addWidget(self.web_sink_label)
         data_target_group.setLayout(data_target_layout)
         
         # Veritabanı Bağlantı Ayarları
@@ -123,6 +171,32 @@ class DatabaseTab(QWidget):
         ocr_layout.addRow("Otomatik Okuma:", self.ocr_auto_check)
         ocr_layout.addRow("Okuma Aralığı:", self.interval_spin)
         
+        self.change_gate_check = QCheckBox("ROI değişmediyse OCR'ı atla")
+        self.change_gate_check.setChecked(self.ocr_config.change_gate)
+        self.change_threshold_spin = QDoubleSpinBox()
+        self.change_threshold_spin.setRange(0.0, 255.0)
+        self.change_threshold_spin.setSingleStep(1.0)
+        self.change_threshold_spin.setValue(self.ocr_config.change_threshold)
+        self.change_gate_label = QLabel("Atlanan: 0 / Çalıştırılan: 0")
+        self.stitch_check = QCheckBox("Alanları tek Tesseract çağrısında oku")
+        self.stitch_check.setChecked(self.ocr_config.stitch_rois)
+        ocr_layout.addRow("Değişim Kontrolü:", self.change_gate_check)
+        ocr_layout.addRow("Değişim Eşiği:", self.change_threshold_spin)
+        ocr_layout.addRow("OCR İstatistiği:", self.change_gate_label)
+        ocr_layout.addRow("Birleştirme:", self.stitch_check)
+        self.vote_frames_spin = QSpinBox()
+        self.vote_frames_spin.setRange(1, 15)
+        self.vote_frames_spin.setValue(self.ocr_config.vote_frames)
+        self.vote_frames_spin.setSuffix(" kare")
+        self.min_confidence_spin = QSpinBox()
+        self.min_confidence_spin.setRange(0, 100)
+        self.min_confidence_spin.setValue(int(round(self.ocr_config.min_confidence * 100)))
+        self.min_confidence_spin.setPrefix("%")
+        ocr_layout.addRow("Oylama Penceresi:", self.vote_frames_spin)
+        ocr_layout.addRow("En Düşük Güven:", self.min_confidence_spin)
+        self.result_cache_label = QLabel("İsabet: %0 / 0 kayıt")
+        ocr_layout.addRow("Sonuç Önbelleği:", self.result_cache_label)
+        
         ocr_buttons_layout = QHBoxLayout()
         ocr_buttons_layout.addWidget(self.ocr_test_btn)
         ocr_buttons_layout.addWidget(self.ocr_start_btn)
@@ -175,23 +249,75 @@ class DatabaseTab(QWidget):
         self.ocr_start_btn.clicked.connect(self.start_ocr_reading)
         self.ocr_stop_btn.clicked.connect(self.stop_ocr_reading)
         self.ocr_test_btn.clicked.connect(self.test_ocr_reading)
+        self.change_gate_check.stateChanged.connect(self.update_change_gate)
+        self.change_threshold_spin.valueChanged.connect(self.update_change_gate)
+        self.stitch_check.stateChanged.connect(self.update_stitch_mode)
+        self.vote_frames_spin.valueChanged.connect(self.update_voting)
+        self.min_confidence_spin.valueChanged.connect(self.update_voting)
         
     def toggle_web_service_input(self):
         is_web_service_selected = self.web_service_radio.isChecked()
         self.web_service_url_input.setVisible(is_web_service_selected)
+        self.web_batch_check.setVisible(is_web_service_selected)
+        self.web_sink_label.setVisible(is_web_service_selected)
         self.connect_btn.setEnabled(not is_web_service_selected)
         self.test_conn_btn.setEnabled(not is_web_service_selected)
         self.disconnect_btn.setEnabled(not is_web_service_selected)
         self.log_text.append(f"[Ayarlar] Veri hedefi {'Web Servis' if is_web_service_selected else 'Veritabanı'} olarak ayarlandı.")
 
+    def update_web_batch_mode(self):
+        self.web_service.config.batch_mode = self.web_batch_check.isChecked()
+        if self.reading_drainer is not None:
+            self.reading_drainer.set_sink('web', self.forward_to_web_service, batch_size=self.web_batch_size())
+
+    def web_batch_size(self) -> int:
+        return self.web_service.config.batch_size if self.web_service.config.batch_mode else 1
+
     def set_processing_params(self, params):
         self.processing_params = params
 
+    def update_change_gate(self):
+        self.ocr_config.change_gate = self.change_gate_check.isChecked()
+        self.ocr_config.change_threshold = self.change_threshold_spin.value()
+        self.field_reader.configure(self.ocr_config.change_threshold)
+
+    def update_stitch_mode(self):
+        self.ocr_config.stitch_rois = self.stitch_check.isChecked()
+        self.field_reader.stitch = self.ocr_config.stitch_rois
+
+    def update_voting(self):
+        self.ocr_config.vote_frames = self.vote_frames_spin.value()
+        self.ocr_config.min_confidence = self.min_confidence_spin.value() / 100.0
+        self.field_reader.configure_voting(self.ocr_config.vote_frames, self.ocr_config.min_confidence)
+
+    def start_reading_drainer(self):
+        if self.reading_drainer is None:
+            return
+        self.reading_drainer.on_forwarded = self.reading_forwarded.emit
+        self.reading_drainer.set_sink('web', self.forward_to_web_service, batch_size=self.web_batch_size())
+        self.reading_drainer.start()
+        pending = self.reading_drainer.reading_queue.count()
+        if pending:
+            self.log_text.append(f"[Kuyruk] Önceki çalışmadan {pending} gönderilmemiş okuma bulundu.")
+
+    def forward_to_database(self, items, target):
+        """Boşaltıcı iş parçacığından çağrılır"""
+        return self.database_service.insert_sensor_data_batch(items)
+
+    def forward_to_web_service(self, items, target):
+        """Boşaltıcı iş parçacığından çağrılır"""
+        return self.web_service.forward_readings(items, target)
+
     def connect_db(self):
         success, message = self.database_service.connect(self.config)
         self.show_message(message, "Bağlantı Başarılı" if success else "Bağlantı Hatası")
         if success:
             self.log_text.append("[DB] Bağlantı başarılı.")
+            self.database_service.start_writer(on_result=self.db_row_written.emit,
+                                               on_records=self.db_records_loaded.emit,
+                                               on_dropped=self.db_row_dropped.emit)
+            if self.reading_drainer is not None:
+                self.reading_drainer.set_sink('db', self.forward_to_database)
             self.refresh_data()
             self.connect_btn.setEnabled(False)
             self.disconnect_btn.setEnabled(True)
@@ -200,6 +326,9 @@ class DatabaseTab(QWidget):
             self.show_message("Lütfen bağlantı bilgilerini kontrol edin veya SQL Server'ın çalıştığından emin olun.", "Bağlantı Hatası")
 
     def disconnect_db(self):
+        if self.reading_drainer is not None:
+            # Okumalar bağlantı yeniden kurulana kadar kuyrukta bekler
+            self.reading_drainer.set_sink('db', None)
         self.database_service.disconnect()
         self.show_message("Veritabanı bağlantısı kesildi.", "Bağlantı Kesildi")
         self.log_text.append("[DB] Bağlantı kesildi.")
@@ -222,62 +351,143 @@ class DatabaseTab(QWidget):
             self.log_text.append("[OCR] Hata: Kamera aktif değil!")
             return
 
-        x = self.ocr_config.selection_rect.x()
-        y = self.ocr_config.selection_rect.y()
-        w = self.ocr_config.selection_rect.width()
-        h = self.ocr_config.selection_rect.height()
-        
-        if w == 0 or h == 0:
-            self.log_text.append("[OCR] Hata: Lütfen Kamera sekmesinden bir OCR alanı seçin!")
+        fields = self.ocr_config.roi_fields()
+        try:
+            MultiROIReader.validate(fields, self.ocr_service)
+            rois, pending = self.field_reader.prepare(frame, fields, self.processing_params,
+                                                      self.ocr_config.language, self.ocr_config.change_gate)
+        except ValueError as e:
+            self.log_text.append(f"[OCR] Hata: {e}")
             return
-            
+
         try:
-            cropped_frame = frame[y:y+h, x:x+w]
-            processed_image = self.ocr_service.preprocess_image(cropped_frame, self.processing_params)
-            text = self.ocr_service.extract_text(processed_image, self.ocr_config.language)
-            self.log_text.append(f"[OCR] Okunan Ham Veri: {text.strip()}")
-            
-            ocr_sensor_data = self.ocr_service.parse_sensor_data(text)
-            
-            if ocr_sensor_data:
-                full_sensor_data = SensorData(
-                    temperature=ocr_sensor_data.temperature,
-                    humidity=70.0,
-                    timestamp=datetime.now()
-                )
-                
+            context = (datetime.now(), fields, pending)
+            if not pending:
+                # Ekran aynı değerleri gösteriyor: Tesseract'ı çalıştırmadan son okumaları kullan
+                self.on_ocr_result(context, {})
+            elif not self.ocr_runner.submit_fields(self.field_reader, rois, fields, self.processing_params,
+                                                   self.ocr_config.language, pending, context):
+                self.log_text.append("[OCR] Önceki okuma sürüyor, bu okuma ondan sonra yapılacak")
+        except Exception as e:
+            # Referans geçersiz sayılır ki bir sonraki tikte OCR yeniden denensin
+            self.field_reader.invalidate()
+            self.log_text.append(f"Bir hata oluştu: {str(e)}")
+
+    def on_ocr_result(self, context, results):
+        captured_at, fields, _ = context
+        readings = self.field_reader.merge(fields, results)
+        for name, reading in readings.items():
+            if reading.reused:
+                self.log_text.append(f"[OCR:{name}] ROI değişmedi, son okuma kullanıldı: {reading.text.strip()}")
+            else:
+                self.log_text.append(f"[OCR:{name}] Okunan Ham Veri: {reading.text.strip()} "
+                                     f"(güven %{reading.confidence * 100:.0f})")
+        self.update_change_gate_label()
+        data = MultiROIReader.build_record(fields, readings, captured_at, {'humidity': self.default_humidity})
+        unstable = MultiROIReader.unstable(fields, readings)
+        if data is None and unstable and not MultiROIReader.missing(fields, readings):
+            # Tek bir yanlış okunmuş kare kayda dönüşmesin; pencere kararlı olana kadar beklenir
+            self.log_text.append(f"ⓘ [OCR] Değer henüz kararlı değil, kaydedilmedi: {', '.join(unstable)}")
+            return
+        self.save_ocr_reading(data)
+
+    def on_ocr_failed(self, context, message):
+        # Referans geçersiz sayılır ki bir sonraki tikte OCR yeniden denensin
+        self.field_reader.invalidate(context[2] if context else None)
+        self.log_text.append(f"Bir hata oluştu: {message}")
+
+    def save_ocr_reading(self, full_sensor_data):
+        try:
+            if full_sensor_data:
                 # Yeni filtreleme mantığı buraya eklendi
                 if 0 <= full_sensor_data.temperature <= 50:
                     self.log_text.append(f"ⓘ Veri filtrelendi: Sıcaklık {full_sensor_data.temperature}°C. 0-50°C aralığındaki veriler kaydedilmiyor.")
                     return
                 
+                if self.web_service_radio.isChecked() and not self.web_service_url_input.text().strip():
+                    # Adressiz okuma kuyruğa girerse hiçbir zaman iletilemez
+                    self.log_text.append("Lütfen Web Servis URL'sini girin!")
+                    return
+
                 # Seçilen hedefe göre veriyi kaydet veya gönder
-                if self.db_radio.isChecked():
+                if self.reading_drainer is not None and (self.db_radio.isChecked()
+                                                         or self.web_service_radio.isChecked()):
+                    # Okuma önce diske yazılır; hedef kapalı olsa bile kaybolmaz
+                    if self.db_radio.isChecked():
+                        self.reading_drainer.submit(full_sensor_data, 'db')
+                    else:
+                        self.reading_drainer.submit(full_sensor_data, 'web',
+                                                    self.web_service_url_input.text().strip())
+                    self.log_text.append(f"[Kuyruk] Okuma kaydedildi: {full_sensor_data.temperature}°C")
+                elif self.db_radio.isChecked():
                     if not self.database_service.is_connected():
                          self.log_text.append("[DB] Hata: Veritabanı bağlantısı bulunamadı.")
                          return
-                    success, message = self.database_service.insert_sensor_data(full_sensor_data)
-                    log_prefix = "[DB]"
+                    # Yazıcı kuyruğuna bırakılır; onay toplu işlem commit edilince sinyalle gelir
+                    if self.database_service.submit_sensor_data(full_sensor_data):
+                        self.log_text.append(f"[DB] Kayıt kuyruğa alındı: {full_sensor_data.temperature}°C")
                 elif self.web_service_radio.isChecked():
                     url = self.web_service_url_input.text().strip()
-                    success, message = self.web_service.send_sensor_data(full_sensor_data, url)
-                    log_prefix = "[Web Servis]"
+                    # Gönderim arka planda yapılır; sonuç sinyalle gelir
+                    if self.web_service.submit_sensor_data(full_sensor_data, url):
+                        self.log_text.append(f"[Web Servis] Gönderim kuyruğuna alındı: {full_sensor_data.temperature}°C")
+                        self.update_web_sink_label()
                 else:
                     self.log_text.append("✗ Hata: Veri kayıt hedefi seçilmedi!")
                     return
-
-                if success:
-                    self.log_text.append(f"✓ {log_prefix} Başarılı: {message}")
-                else:
-                    self.log_text.append(f"✗ {log_prefix} Hata: {message}")
             else:
                 self.log_text.append("✗ Hata: Metinden geçerli sıcaklık verisi çıkarılamadı!")
-                
-            self.refresh_data()
             
         except Exception as e:
+            # Referans geçersiz sayılır ki bir sonraki tikte OCR yeniden denensin
+            self.field_reader.invalidate()
             self.log_text.append(f"Bir hata oluştu: {str(e)}")
 
+    def on_db_row_written(self, data, success, message):
+        if success:
+            self.log_text.append(f"✓ [DB] Başarılı: {data.temperature}°C ({data.timestamp:%H:%M:%S}) - {message}")
+        else:
+            self.log_text.append(f"✗ [DB] Hata: {data.temperature}°C ({data.timestamp:%H:%M:%S}) - {message}")
+
+    def on_reading_forwarded(self, sink, items, success, message):
+        label = "DB" if sink == 'db' else "Web Servis"
+        if success:
+            self.log_text.append(f"✓ [{label}] {len(items)} okuma iletildi - {message}")
+            if sink == 'db':
+                self.refresh_data()
+        else:
+            pending = self.reading_drainer.reading_queue.count(sink)
+            self.log_text.append(f"✗ [{label}] İletilemedi, {pending} okuma kuyrukta bekliyor - {message}")
+
+    def on_web_sent(self, items, url, success, message):
+        if success:
+            self.log_text.append(f"✓ [Web Servis] {len(items)} okuma gönderildi. Sunucu yanıtı: {message}")
+        else:
+            self.log_text.append(f"✗ [Web Servis] {len(items)} okuma gönderilemedi: {message}")
+        self.update_web_sink_label()
+
+    def on_web_dropped(self, data, reason):
+        self.log_text.append(f"✗ [Web Servis] Okuma düşürüldü: {data.temperature}°C - {reason}")
+        self.update_web_sink_label()
+
+    def update_web_sink_label(self):
+        if self.web_service.sink is None:
+            return
+        stats = self.web_service.sink.stats()
+        self.web_sink_label.setText(f"Web kuyruğu: {stats['queue_depth']} / gönderimde: {stats['in_flight']} / "
+                                    f"gecikme ort. {stats['latency_avg_ms']:.0f} ms, p95 {stats['latency_p95_ms']:.0f} ms")
+
+    def on_db_row_dropped(self, data, reason):
+        self.log_text.append(f"✗ [DB] Okuma düşürüldü: {data.temperature}°C - {reason}")
+
+    def update_change_gate_label(self):
+        stats = self.field_reader.stats()
+        self.change_gate_label.setText(f"Atlanan: {stats['hits']} / Çalıştırılan: {stats['misses']} "
+                                       f"(%{stats['hit_rate'] * 100:.0f} isabet) / Kararsız: {stats['unstable']}")
+        cache = self.ocr_service.result_cache.stats()
+        self.result_cache_label.setText(f"İsabet: %{cache['hit_rate'] * 100:.0f} / {cache['entries']} kayıt "
+                                        f"({cache['memory_bytes'] / 1024:.1f} KB)")
+
     def start_ocr_reading(self):
         if self.db_radio.isChecked() and not self.database_service.is_connected():
             self.log_text.append("Lütfen önce veritabanına bağlanın!")
@@ -311,8 +521,13 @@ class DatabaseTab(QWidget):
         if not self.database_service.is_connected():
             return
         
-        data = self.database_service.get_last_n_records(20)
+        # Yazıcı çalışıyorsa sorgu arka planda yapılır, sonuç sinyalle gelir
+        if self.database_service.request_refresh(20):
+            return
         
+        self.populate_table(self.database_service.get_last_n_records(20, max_attempts=1))
+    
+    def populate_table(self, data):
         self.table_widget.setRowCount(len(data))
         
         for row, sensor_data in enumerate(data):
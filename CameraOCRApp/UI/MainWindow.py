@@ -5,12 +5,13 @@ from UI.ProcessingTab import ProcessingTab
 from UI.DatabaseTab import DatabaseTab
 
 class MainWindow(QMainWindow):
-    def __init__(self, camera_service, ocr_service, database_service, web_service):
+    def __init__(self, camera_service, ocr_service, database_service, web_service, reading_drainer=None):
         super().__init__()
         self.camera_service = camera_service
         self.ocr_service = ocr_service
         self.database_service = database_service
         self.web_service = web_service
+        self.reading_drainer = reading_drainer
         
         self.setWindowTitle("Gelişmiş Kamera OCR ve Sıcaklık Veritabanı Uygulaması")
         self.setGeometry(100, 100, 1600, 1000)
@@ -25,14 +26,16 @@ class MainWindow(QMainWindow):
         tab_widget = QTabWidget()
         
         self.camera_tab = CameraTab(self.camera_service, self.ocr_service)
-        self.processing_tab = ProcessingTab(self.camera_service)
+        self.processing_tab = ProcessingTab(self.camera_service, self.camera_tab.get_processing_params())
+        self.processing_tab.params_changed.connect(self.camera_tab.update_processed_frame)
         
         self.database_tab = DatabaseTab(
             self.database_service, 
             self.camera_service, 
             self.ocr_service, 
             self.camera_tab.ocr_config, 
-            self.web_service
+            self.web_service,
+            self.reading_drainer
         )
         
         self.database_tab.set_processing_params(self.camera_tab.get_processing_params())
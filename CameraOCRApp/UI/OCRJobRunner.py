@@ -0,0 +1,152 @@
+from dataclasses import replace
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from Domain.Models import ProcessingParams
+
+class _OCRJobSignals(QObject):
+    # (iş kimliği, iş sonucu) / (iş kimliği, hata mesajı)
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+class _OCRJob(QRunnable):
+    """Ön işleme ve tanımayı havuz iş parçacığında çalıştıran iş"""
+
+    def __init__(self, job_id: int, task):
+        super().__init__()
+        self.job_id = job_id
+        self.task = task
+        self.signals = _OCRJobSignals()
+        # Sinyal nesnesi işle birlikte yaşar; havuz işi kendisi silmesin
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            result = self.task()
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.finished.emit(self.job_id, result)
+
+class OCRJobRunner(QObject):
+    """OCR'ı QThreadPool'da çalıştırıp sonucu GUI iş parçacığına sinyalle döndürür.
+
+    Aynı anda en fazla bir iş çalışır. Önceki iş sürerken gelen istekler tek
+    bir bekleyen istekte birleştirilir (en yenisi kalır) ve iş bitince
+    başlatılır; böylece periyodik okumalar Tesseract'tan hızlı geldiğinde iş
+    birikmez. Her iş ROI'nin salt okunur bir kopyasını ve parametrelerin o
+    anki görüntüsünü alır, GUI'de yapılan değişiklikler çalışan işi etkilemez.
+    """
+
+    # (bağlam, metin, OCRSensorData) / (bağlam, ad -> (metin, değer, güven)) / (bağlam, hata mesajı)
+    result_ready = pyqtSignal(object, str, object)
+    fields_ready = pyqtSignal(object, object)
+    job_failed = pyqtSignal(object, str)
+
+    def __init__(self, ocr_service, thread_pool: QThreadPool = None, parent=None):
+        super().__init__(parent)
+        self.ocr_service = ocr_service
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._job_id = 0
+        self._running = None  # (iş, bağlam, sonuç işleyici)
+        self._pending = None  # (görev, bağlam, sonuç işleyici)
+        self._pending_fields = None  # bekleyen alan isteğinin (okuyucu, alan adları)
+        self.coalesced = 0
+
+    def is_busy(self) -> bool:
+        return self._running is not None
+
+    def submit(self, roi, params: ProcessingParams, language: str, context=None, roi_key=None) -> bool:
+        """ROI'yi tanıma kuyruğuna al; iş hemen başladıysa True, bekleyen istekle birleştiyse False.
+
+        ``roi_key`` ROI başına durum (zamansal ortalama, karakter ölçeği) anahtarıdır.
+        """
+        roi = roi.copy()
+        roi.setflags(write=False)
+        params = replace(params)
+
+        def task():
+            processed = self.ocr_service.preprocess_image(roi, params, roi_key)
+            return self.ocr_service.read_sensor_data(processed, language)
+
+        return self._request(task, context, self._emit_result)
+
+    def submit_fields(self, reader, rois: dict, fields: list, params: ProcessingParams, language: str,
+                      names, context=None) -> bool:
+        """Aynı karenin ROI alanlarını tek işte ön işle ve tanı; sonuç ``fields_ready`` ile gelir.
+
+        ``rois`` çağıranın kopyalarıdır (MultiROIReader.prepare); işe devredilir.
+        Bekleyen bir alan isteğinin yerine geçilirse onun alanları da bu işte
+        okunur: değişim referansları ``prepare``'de ilerletildiği için aksi
+        halde o alanlar bir sonraki değişime kadar okunmazdı.
+        """
+        for roi in rois.values():
+            roi.setflags(write=False)
+        fields = [replace(item) for item in fields]
+        params = replace(params)
+        names = set(names)
+        if self._running is not None and self._pending_fields is not None and self._pending_fields[0] is reader:
+            # prepare her alanı kırptığı için en yeni ROI'ler birleşik alan kümesini kapsar
+            names |= self._pending_fields[1]
+
+        def task():
+            processed = reader.preprocess(rois, fields, params, names)
+            return reader.recognize(processed, fields, language)
+
+        started = self._request(task, context, self.fields_ready.emit)
+        if not started:
+            self._pending_fields = (reader, names)
+        return started
+
+    def _request(self, task, context, emit) -> bool:
+        request = (task, context, emit)
+        if self._running is not None:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = request
+            self._pending_fields = None
+            return False
+        self._start(*request)
+        return True
+
+    def cancel_pending(self):
+        """Henüz başlamamış isteği iptal et; çalışan iş tamamlanır"""
+        if self._pending is not None:
+            self.coalesced += 1
+        if self._pending_fields is not None:
+            # İptal edilen alanlar sonraki tikte yeniden okunsun
+            reader, names = self._pending_fields
+            reader.invalidate(names, keep_readings=True)
+        self._pending = None
+        self._pending_fields = None
+
+    def _start(self, task, context, emit):
+        self._job_id += 1
+        job = _OCRJob(self._job_id, task)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        self._running = (job, context, emit)
+        self.thread_pool.start(job)
+
+    def _finish(self, job_id: int):
+        if self._running is None or self._running[0].job_id != job_id:
+            return None, None
+        _, context, emit = self._running
+        self._running = None
+        if self._pending is not None:
+            request, self._pending = self._pending, None
+            self._pending_fields = None
+            self._start(*request)
+        return context, emit
+
+    def _emit_result(self, context, result):
+        text, parsed = result
+        self.result_ready.emit(context, text, parsed)
+
+    def _on_finished(self, job_id: int, result):
+        context, emit = self._finish(job_id)
+        if emit is not None:
+            emit(context, result)
+
+    def _on_failed(self, job_id: int, message: str):
+        context, emit = self._finish(job_id)
+        if emit is not None:
+            self.job_failed.emit(context, message)
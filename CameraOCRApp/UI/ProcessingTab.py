@@ -1,14 +1,19 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QGroupBox, QFormLayout, 
                              QSlider, QSpinBox, QDoubleSpinBox, QCheckBox, 
-                             QPushButton, QScrollArea)
-from PyQt5.QtCore import Qt
+                             QPushButton, QScrollArea, QComboBox)
+from PyQt5.QtCore import Qt, pyqtSignal
 from Domain.Models import ProcessingParams
 
 class ProcessingTab(QWidget):
-    def __init__(self, camera_service):
+    # Bir parametre değeri gerçekten değiştiğinde yayınlanır
+    params_changed = pyqtSignal(object)
+    
+    def __init__(self, camera_service, processing_params=None):
         super().__init__()
         self.camera_service = camera_service
-        self.processing_params = ProcessingParams()
+        # Kamera sekmesiyle aynı nesne paylaşılır ki ayarlar OCR'a yansısın
+        self.processing_params = processing_params if processing_params is not None else ProcessingParams()
+        self._params_key = self.processing_params.cache_key()
         self.init_ui()
         
     def init_ui(self):
@@ -87,6 +92,22 @@ class ProcessingTab(QWidget):
         self.denoise_spin.valueChanged.connect(self.update_processing_params)
         processing_form.addRow("Gürültü Azaltma:", self.denoise_spin)
         
+        # Uzamsal (fastNlMeans) veya zamansal (kare ortalaması) gürültü azaltma
+        self.denoise_mode_combo = QComboBox()
+        self.denoise_mode_combo.addItem("Uzamsal (tek kare)", "spatial")
+        self.denoise_mode_combo.addItem("Zamansal (kare ortalaması)", "temporal")
+        self.denoise_mode_combo.currentIndexChanged.connect(self.update_processing_params)
+        processing_form.addRow("Gürültü Azaltma Türü:", self.denoise_mode_combo)
+        
+        # Karakter yüksekliği (Tesseract için ölçekleme)
+        self.glyph_height_spin = QSpinBox()
+        self.glyph_height_spin.setRange(0, 96)
+        self.glyph_height_spin.setValue(0)
+        self.glyph_height_spin.setSuffix(" px")
+        self.glyph_height_spin.setSpecialValueText("Kapalı")
+        self.glyph_height_spin.valueChanged.connect(self.update_processing_params)
+        processing_form.addRow("Karakter Yüksekliği:", self.glyph_height_spin)
+        
         # Checkbox'lar
         self.adaptive_check = QCheckBox("Adaptif Eşikleme")
         self.adaptive_check.stateChanged.connect(self.update_processing_params)
@@ -122,9 +143,18 @@ class ProcessingTab(QWidget):
         self.processing_params.erode = self.erode_spin.value()
         self.processing_params.gamma = self.gamma_spin.value()
         self.processing_params.denoise = self.denoise_spin.value()
+        self.processing_params.denoise_mode = self.denoise_mode_combo.currentData()
+        self.processing_params.glyph_height = self.glyph_height_spin.value()
         self.processing_params.adaptive_thresh = self.adaptive_check.isChecked()
         self.processing_params.invert = self.invert_check.isChecked()
         
+        # Derlenmiş plan değerlerle anahtarlandığı için yalnızca gerçek bir
+        # değişiklik yeni bir plan (ve önizleme yenilemesi) tetikler
+        key = self.processing_params.cache_key()
+        if key != self._params_key:
+            self._params_key = key
+            self.params_changed.emit(self.processing_params)
+        
     def reset_processing_params(self):
         self.contrast_slider.setValue(200)
         self.brightness_slider.setValue(100)
@@ -135,6 +165,8 @@ class ProcessingTab(QWidget):
         self.erode_spin.setValue(1)
         self.gamma_spin.setValue(1.0)
         self.denoise_spin.setValue(0)
+        self.denoise_mode_combo.setCurrentIndex(0)
+        self.glyph_height_spin.setValue(0)
         self.adaptive_check.setChecked(False)
         self.invert_check.setChecked(False)
         self.update_processing_params()
\ No newline at end of file
@@ -5,5 +5,6 @@ UI katmanı - Kullanıcı arayüzü bileşenleri
 from .CameraTab import CameraTab
 from .ProcessingTab import ProcessingTab
 from .DatabaseTab import DatabaseTab
+from .OCRJobRunner import OCRJobRunner
 
-__all__ = ['CameraTab', 'ProcessingTab', 'DatabaseTab']
\ No newline at end of file
+__all__ = ['CameraTab', 'ProcessingTab', 'DatabaseTab', 'OCRJobRunner']
\ No newline at end of file
@@ -0,0 +1,311 @@
+"""
+OCR performans ölçümleri.
+
+CameraOCRApp dizininden çalıştırın:
+    python -m Utils.OCRBenchmark backends --image panel.png --lang eng --runs 30
+    python -m Utils.OCRBenchmark preprocess --image panel.png --runs 200
+    python -m Utils.OCRBenchmark stitch --texts 23.5 61 18.2 -4.0 --runs 30
+    python -m Utils.OCRBenchmark segments --count 500 --noise 0.05
+    python -m Utils.OCRBenchmark glyph --heights 16 24 48 96 200 --target 32
+    python -m Utils.OCRBenchmark denoise --height 200 --noise 0.05 --runs 30
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import cv2
+import numpy as np
+from Domain.Models import ProcessingParams
+from Infrastructure.OCRService import OCRService
+from Utils.SevenSegmentCorpus import seven_segment_corpus
+from Utils.TesseractUtils import setup_tesseract
+
+def render_text_image(text: str = "23.5 C", height: int = 80) -> np.ndarray:
+    """Beyaz zemin üzerine siyah metin içeren sentetik BGR görüntü üret"""
+    scale = height / 40.0
+    (width, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)
+    image = np.full((text_height + baseline + 20, width + 20, 3), 255, np.uint8)
+    cv2.putText(image, text, (10, text_height + 10), cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 0, 0), 2)
+    return image
+
+def _time_calls(func, runs: int) -> dict:
+    durations = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000.0)
+    return {
+        'mean_ms': statistics.fmean(durations),
+        'median_ms': statistics.median(durations),
+        'min_ms': min(durations),
+        'result': result,
+    }
+
+def benchmark_backends(image, language: str = 'eng', runs: int = 20) -> dict:
+    """Aynı ön işlenmiş görüntüyü her OCR motoruyla tanıyıp süreleri karşılaştır"""
+    service = OCRService()
+    processed = service.preprocess_image(image, ProcessingParams())
+
+    # Önbellek açık kalırsa ilk çağrıdan sonra motor hiç ölçülmez
+    service.configure_result_cache(max_entries=0)
+
+    results = {}
+    for backend in (OCRService.BACKEND_PYTESSERACT, OCRService.BACKEND_TESSEROCR):
+        success, message = service.set_backend(backend)
+        if not success:
+            results[backend] = {'error': message}
+            continue
+        # İlk çağrı motoru başlatır; ısınma ölçüme dahil edilmez
+        service.extract_text(processed, language)
+        results[backend] = _time_calls(lambda: service.extract_text(processed, language), runs)
+    return results
+
+def benchmark_preprocess(image, params: ProcessingParams = None, runs: int = 100) -> dict:
+    """NumPy hattını eski PIL hattıyla hız ve piksel eşliği açısından karşılaştır"""
+    service = OCRService()
+    params = params or ProcessingParams()
+
+    numpy_output = service.preprocess_image(image, params)
+    pil_output = np.asarray(service.preprocess_image_pil(image, params).convert('L'))
+    mismatched = int(np.count_nonzero(numpy_output != pil_output))
+
+    results = {
+        'numpy': _time_calls(lambda: service.preprocess_image(image, params), runs),
+        'pil': _time_calls(lambda: service.preprocess_image_pil(image, params), runs),
+    }
+    for stats in results.values():
+        stats['result'] = f"{mismatched} farklı piksel"
+    return results
+
+def benchmark_stitch(texts: list, language: str = 'eng', runs: int = 20,
+                     engine: str = OCRService.ENGINE_LINE) -> dict:
+    """Aynı ROI'leri tek tek ve tek tuvalde birleştirerek tanıyıp süreleri karşılaştır"""
+    service = OCRService()
+    service.configure_result_cache(max_entries=0)
+    params = ProcessingParams()
+    images = {f"roi{i}": service.preprocess_image(render_text_image(text), params)
+              for i, text in enumerate(texts)}
+
+    def describe(result):
+        return " | ".join(f"{name}={text.strip()}" for name, text in result.items())
+
+    # İlk çağrı motoru başlatır; ısınma ölçüme dahil edilmez
+    service.read_texts(images, language, engine)
+    results = {
+        'per_roi': _time_calls(lambda: service.read_texts(images, language, engine), runs),
+        'stitched': _time_calls(lambda: service.read_texts(images, language, engine, stitch=True), runs),
+    }
+    results['per_roi']['result'] = describe(results['per_roi']['result'])
+    results['stitched']['result'] = (f"{describe(results['stitched']['result'])} "
+                                     f"(geri dönüş {service.stitch_fallbacks}/{service.stitched_calls})")
+    return results
+
+def benchmark_segments(count: int = 200, language: str = 'eng', noise: float = 0.0,
+                       seed: int = 0, tesseract: bool = True) -> dict:
+    """Yedi segment çözücüyü sentetik rakam derlemi üzerinde doğruluk ve süre olarak ölç.
+
+    ``decoder`` yalnızca çözücüdür (kabul oranı güven eşiğini geçenlerdir),
+    ``segment`` Tesseract'a geri dönüş dahil tanıma yoludur, ``tesseract`` tek
+    satır rakam tanımadır.
+    """
+    service = OCRService()
+    service.configure_result_cache(max_entries=0)
+    params = ProcessingParams()
+    corpus = [(service.preprocess_image(image, params), text)
+              for image, text in seven_segment_corpus(count, seed, noise)]
+    decoder = service.segment_decoder
+
+    def decode(image):
+        text, confidence = decoder.decode(image)
+        return text, confidence >= decoder.min_confidence
+
+    readers = {
+        'decoder': decode,
+        'segment': lambda image: (service.read_text(image, language, OCRService.ENGINE_SEGMENT).strip(), True),
+    }
+    if tesseract:
+        readers['tesseract'] = lambda image: (service.read_text(image, language, OCRService.ENGINE_LINE).strip(), True)
+
+    results = {}
+    for name, read in readers.items():
+        durations = []
+        accepted = correct = 0
+        for image, expected in corpus:
+            start = time.perf_counter()
+            text, accept = read(image)
+            durations.append((time.perf_counter() - start) * 1000.0)
+            if accept:
+                accepted += 1
+                correct += text == expected
+        results[name] = {
+            'mean_ms': statistics.fmean(durations),
+            'median_ms': statistics.median(durations),
+            'min_ms': min(durations),
+            'result': f"doğru {correct}/{accepted} kabul, kabul oranı %{accepted / len(corpus) * 100:.1f}",
+        }
+    results['segment']['result'] += f", Tesseract'a dönüş {service.segment_fallbacks}"
+    return results
+
+def benchmark_glyph_scale(heights: list, texts: list = None, target: int = 32, language: str = 'eng',
+                          engine: str = OCRService.ENGINE_LINE) -> dict:
+    """Farklı karakter yüksekliklerindeki ROI'leri ölçeklemeden ve hedef yüksekliğe ölçekleyerek
+    tanıyıp ön işleme + OCR süresini ve doğruluğu karşılaştır"""
+    texts = texts or ["23.5", "-4.0", "61", "118.2", "7.25"]
+    service = OCRService()
+    service.configure_result_cache(max_entries=0)
+    variants = {'orijinal': ProcessingParams(), f'{target} px': ProcessingParams(glyph_height=target)}
+    # İlk çağrı motoru başlatır; ısınma ölçüme dahil edilmez
+    service.read_text(service.preprocess_image(render_text_image(texts[0]), variants['orijinal']), language, engine)
+
+    results = {}
+    for height in heights:
+        images = [(render_text_image(text, height), text) for text in texts]
+        for label, params in variants.items():
+            durations = []
+            correct = 0
+            for index, (image, expected) in enumerate(images):
+                start = time.perf_counter()
+                # Her görüntü ayrı ROI sayılır; ölçek her birinde bir kez kestirilir
+                processed = service.preprocess_image(image, params, ('benchmark', height, index))
+                text = service.read_text(processed, language, engine).strip()
+                durations.append((time.perf_counter() - start) * 1000.0)
+                correct += text == expected
+            results[f"{height}px {label}"] = {
+                'mean_ms': statistics.fmean(durations),
+                'median_ms': statistics.median(durations),
+                'min_ms': min(durations),
+                'result': f"doğru {correct}/{len(images)}, girdi {processed.shape[1]}x{processed.shape[0]}",
+            }
+    return results
+
+def benchmark_denoise(image, noise: float = 0.05, strength: int = 10, runs: int = 30, seed: int = 0) -> dict:
+    """Gürültülü kare dizisinde uzamsal ve zamansal gürültü azaltmayı süre ve temiz çıktıya
+    göre farklı piksel oranı açısından karşılaştır"""
+    service = OCRService()
+    rng = np.random.default_rng(seed)
+    frames = [np.clip(image + rng.normal(0.0, noise * 255.0, image.shape), 0, 255).astype(np.uint8)
+              for _ in range(runs)]
+    variants = {
+        'yok': ProcessingParams(),
+        'uzamsal': ProcessingParams(denoise=strength),
+        'zamansal': ProcessingParams(denoise=strength, denoise_mode=OCRService.DENOISE_TEMPORAL),
+    }
+    reference = service.preprocess_image(image, variants['yok'])
+
+    results = {}
+    for label, params in variants.items():
+        durations = []
+        for frame in frames:
+            start = time.perf_counter()
+            processed = service.preprocess_image(frame, params, ('benchmark', label))
+            durations.append((time.perf_counter() - start) * 1000.0)
+        # Son karenin (ortalamanın oturduğu) temiz görüntüden farkı
+        mismatched = np.count_nonzero(processed != reference) / reference.size
+        results[label] = {
+            'mean_ms': statistics.fmean(durations),
+            'median_ms': statistics.median(durations),
+            'min_ms': min(durations),
+            'result': f"temizden farklı piksel %{mismatched * 100:.2f}",
+        }
+    return results
+
+def _print_results(title: str, results: dict):
+    print(title)
+    for name, stats in results.items():
+        if 'error' in stats:
+            print(f"  {name:<14} {stats['error']}")
+            continue
+        text = str(stats.get('result', '')).strip().replace('\n', ' | ')
+        print(f"  {name:<14} ort {stats['mean_ms']:8.2f} ms  medyan {stats['median_ms']:8.2f} ms  "
+              f"min {stats['min_ms']:8.2f} ms  -> {text!r}")
+
+def _load_image(path):
+    if not path:
+        return render_text_image()
+    image = cv2.imread(path)
+    if image is None:
+        raise SystemExit(f"Görüntü okunamadı: {path}")
+    return image
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="OCR performans ölçümleri")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    backends = subparsers.add_parser('backends', help="pytesseract ile kalıcı motoru karşılaştır")
+    backends.add_argument('--image', help="ROI görüntüsü (verilmezse sentetik metin)")
+    backends.add_argument('--lang', default='eng')
+    backends.add_argument('--runs', type=int, default=20)
+
+    preprocess = subparsers.add_parser('preprocess', help="NumPy ve PIL ön işleme hatlarını karşılaştır")
+    preprocess.add_argument('--image', help="ROI görüntüsü (verilmezse sentetik metin)")
+    preprocess.add_argument('--runs', type=int, default=100)
+
+    stitch = subparsers.add_parser('stitch', help="ROI başına çağrıyla birleştirilmiş tuvali karşılaştır")
+    stitch.add_argument('--texts', nargs='+', default=["23.5", "61", "18.2", "-4.0"],
+                        help="Her biri ayrı ROI olarak çizilecek metinler")
+    stitch.add_argument('--lang', default='eng')
+    stitch.add_argument('--engine', choices=[OCRService.ENGINE_LINE, OCRService.ENGINE_BLOCK],
+                        default=OCRService.ENGINE_LINE)
+    stitch.add_argument('--runs', type=int, default=20)
+
+    segments = subparsers.add_parser('segments', help="Yedi segment çözücüyü sentetik derlemle ölç")
+    segments.add_argument('--count', type=int, default=200)
+    segments.add_argument('--noise', type=float, default=0.0, help="Gauss gürültüsü (0-1, 255'e oranla)")
+    segments.add_argument('--seed', type=int, default=0)
+    segments.add_argument('--lang', default='eng')
+    segments.add_argument('--no-tesseract', action='store_true', help="Tesseract karşılaştırmasını atla")
+
+    glyph = subparsers.add_parser('glyph', help="Karakter yüksekliği ölçeklemesinin süre ve doğruluk etkisi")
+    glyph.add_argument('--heights', type=int, nargs='+', default=[16, 24, 48, 96, 200],
+                       help="Sentetik metnin çizim yükseklikleri (piksel)")
+    glyph.add_argument('--target', type=int, default=32, help="Hedef karakter yüksekliği (piksel)")
+    glyph.add_argument('--lang', default='eng')
+    glyph.add_argument('--engine', choices=[OCRService.ENGINE_LINE, OCRService.ENGINE_BLOCK],
+                       default=OCRService.ENGINE_LINE)
+
+    denoise = subparsers.add_parser('denoise', help="Uzamsal ve zamansal gürültü azaltmayı karşılaştır")
+    denoise.add_argument('--image', help="ROI görüntüsü (verilmezse sentetik metin)")
+    denoise.add_argument('--height', type=int, default=120, help="Sentetik metnin yüksekliği (piksel)")
+    denoise.add_argument('--noise', type=float, default=0.05, help="Gauss gürültüsü (0-1, 255'e oranla)")
+    denoise.add_argument('--strength', type=int, default=10)
+    denoise.add_argument('--runs', type=int, default=30)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'backends':
+        if not setup_tesseract():
+            return 1
+        image = _load_image(args.image)
+        _print_results(f"OCR motorları ({args.runs} tekrar, dil={args.lang})",
+                       benchmark_backends(image, args.lang, args.runs))
+    elif args.command == 'preprocess':
+        image = _load_image(args.image)
+        _print_results(f"Ön işleme ({args.runs} tekrar)", benchmark_preprocess(image, runs=args.runs))
+    elif args.command == 'stitch':
+        if not setup_tesseract():
+            return 1
+        _print_results(f"{len(args.texts)} ROI ({args.runs} tekrar, dil={args.lang}, yol={args.engine})",
+                       benchmark_stitch(args.texts, args.lang, args.runs, args.engine))
+    elif args.command == 'segments':
+        if not args.no_tesseract and not setup_tesseract():
+            return 1
+        _print_results(f"Yedi segment ({args.count} görüntü, gürültü={args.noise})",
+                       benchmark_segments(args.count, args.lang, args.noise, args.seed, not args.no_tesseract))
+    elif args.command == 'denoise':
+        image = cv2.imread(args.image) if args.image else render_text_image(height=args.height)
+        if image is None:
+            raise SystemExit(f"Görüntü okunamadı: {args.image}")
+        _print_results(f"Gürültü azaltma ({args.runs} kare, gürültü={args.noise}, güç={args.strength})",
+                       benchmark_denoise(image, args.noise, args.strength, args.runs))
+    elif args.command == 'glyph':
+        if not setup_tesseract():
+            return 1
+        _print_results(f"Karakter yüksekliği (hedef {args.target} px, dil={args.lang}, yol={args.engine})",
+                       benchmark_glyph_scale(args.heights, target=args.target, language=args.lang,
+                                             engine=args.engine))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
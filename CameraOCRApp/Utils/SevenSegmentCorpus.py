@@ -0,0 +1,65 @@
+"""
+Yedi segment çözücü için sentetik rakam derlemi.
+
+OCRService'e ve Tesseract'a bağlı değildir; ölçümler (``Utils.OCRBenchmark
+segments``) ve testler aynı derlemi kullanır.
+"""
+
+import cv2
+import numpy as np
+
+# Yedi segment çizimi: karakter -> yanan segmentler (a üst, b sağ üst ... g orta)
+SEVEN_SEGMENT_GLYPHS = {
+    '0': 'abcdef', '1': 'bc', '2': 'abdeg', '3': 'abcdg', '4': 'bcfg',
+    '5': 'acdfg', '6': 'acdefg', '7': 'abc', '8': 'abcdefg', '9': 'abcdfg', '-': 'g',
+}
+
+def render_seven_segment(text: str = "-12.5", height: int = 60, thickness: float = 0.12,
+                         lit_on_dark: bool = True) -> np.ndarray:
+    """Yedi segmentli panel görüntüsü (BGR) çiz; ondalık nokta önceki rakamın sağ altına konur"""
+    width = int(round(height * 0.55))
+    stroke = max(int(round(height * thickness)), 2)
+    gap = max(stroke // 4, 1)
+    spacing = max(int(round(height * 0.2)), stroke + 2)
+    half = height // 2
+    boxes = {
+        'a': (stroke + gap, 0, width - stroke - gap, stroke),
+        'b': (width - stroke, gap, width, half - gap),
+        'c': (width - stroke, half + gap, width, height - gap),
+        'd': (stroke + gap, height - stroke, width - stroke - gap, height),
+        'e': (0, half + gap, stroke, height - gap),
+        'f': (0, gap, stroke, half - gap),
+        'g': (stroke + gap, half - stroke // 2, width - stroke - gap, half + (stroke + 1) // 2),
+    }
+    cells = [char for char in text if char != '.']
+    margin = spacing
+    image = np.zeros((height + 2 * margin, margin * 2 + len(cells) * (width + spacing), 3), np.uint8)
+    x = margin
+    for char in text:
+        if char == '.':
+            # Nokta, önceki hücre ile sonraki hücre arasındaki boşluğa çizilir
+            left = x - spacing + (spacing - stroke) // 2
+            cv2.rectangle(image, (left, margin + height - stroke), (left + stroke - 1, margin + height - 1),
+                          (255, 255, 255), -1)
+            continue
+        for segment in SEVEN_SEGMENT_GLYPHS.get(char, ''):
+            x0, y0, x1, y1 = boxes[segment]
+            cv2.rectangle(image, (x + x0, margin + y0), (x + x1 - 1, margin + y1 - 1), (255, 255, 255), -1)
+        x += width + spacing
+    return image if lit_on_dark else 255 - image
+
+def seven_segment_corpus(count: int = 200, seed: int = 0, noise: float = 0.0) -> list:
+    """Rastgele değerler, yükseklikler ve kalınlıklarla (görüntü, beklenen metin) listesi"""
+    rng = np.random.default_rng(seed)
+    corpus = []
+    for _ in range(count):
+        value = rng.uniform(-99.9, 199.9)
+        decimals = int(rng.integers(0, 3))
+        text = f"{value:.{decimals}f}"
+        image = render_seven_segment(text, height=int(rng.integers(24, 96)),
+                                     thickness=float(rng.uniform(0.08, 0.15)),
+                                     lit_on_dark=bool(rng.integers(0, 2)))
+        if noise > 0:
+            image = np.clip(image + rng.normal(0.0, noise * 255.0, image.shape), 0, 255).astype(np.uint8)
+        corpus.append((image, text))
+    return corpus
@@ -2,6 +2,11 @@
 Utils katmanı - Yardımcı fonksiyonlar ve araçlar
 """
 
-from .TesseractUtils import find_tesseract, setup_tesseract, manual_tesseract_setup, search_for_tesseract
+__all__ = ['find_tesseract', 'setup_tesseract', 'manual_tesseract_setup', 'search_for_tesseract']
 
-__all__ = ['find_tesseract', 'setup_tesseract', 'manual_tesseract_setup', 'search_for_tesseract']
\ No newline at end of file
+def __getattr__(name):
+    # pytesseract ilk erişimde yüklenir; SevenSegmentCorpus gibi araçlar onsuz içe aktarılır
+    if name in __all__:
+        from . import TesseractUtils
+        return getattr(TesseractUtils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Katman paketleri (Domain, Infrastructure ...) CameraOCRApp dizininden içe aktarılır
+app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if app_dir not in sys.path:
+    sys.path.insert(0, app_dir)
@@ -0,0 +1,51 @@
+"""
+Yedi segment çözücünün sentetik rakam derlemindeki doğruluğu.
+
+Görüntüler ölçümlerle (``Utils.OCRBenchmark segments``) aynı ön işleme
+planından geçer; Tesseract ve OCRService gerekmez.
+"""
+
+import pytest
+from Domain.Models import ProcessingParams
+from Infrastructure import ImagePipeline
+from Infrastructure.ProcessingPlan import compile_processing_plan
+from Infrastructure.SevenSegmentDecoder import SevenSegmentDecoder
+from Utils.SevenSegmentCorpus import render_seven_segment, seven_segment_corpus
+
+CORPUS_SIZE = 300
+# Eşiği geçen okumaların en az bu oranı kabul edilmeli (ölçülen: temizde ~%98, %5 gürültüde ~%98)
+MIN_ACCEPT_RATE = 0.95
+
+def _decode_corpus(noise: float, seed: int = 0):
+    decoder = SevenSegmentDecoder()
+    plan = compile_processing_plan(ProcessingParams())
+    pool = ImagePipeline.BufferPool()
+    accepted = []
+    for image, expected in seven_segment_corpus(CORPUS_SIZE, seed, noise):
+        text, confidence = decoder.decode(plan.run(image, pool).copy())
+        if confidence >= decoder.min_confidence:
+            accepted.append((text, expected))
+    return accepted
+
+@pytest.mark.parametrize('noise', [0.0, 0.05])
+def test_accepted_readings_are_never_wrong(noise):
+    """Güven eşiğini geçen okuma yanlışsa Tesseract'a dönülmez; yanlış kabul hiç olmamalı"""
+    wrong = [(text, expected) for text, expected in _decode_corpus(noise) if text != expected]
+    assert wrong == []
+
+@pytest.mark.parametrize('noise', [0.0, 0.05])
+def test_acceptance_rate_floor(noise):
+    accepted = _decode_corpus(noise)
+    assert len(accepted) / CORPUS_SIZE >= MIN_ACCEPT_RATE
+
+@pytest.mark.parametrize('text', ["-12.5", "0", "188.8", "7.25"])
+def test_decodes_rendered_panel(text):
+    decoder = SevenSegmentDecoder()
+    for lit_on_dark in (True, False):
+        decoded, confidence = decoder.decode(render_seven_segment(text, lit_on_dark=lit_on_dark))
+        assert decoded == text
+        assert confidence >= decoder.min_confidence
+
+def test_empty_image_has_no_confidence():
+    image = render_seven_segment("", height=40)
+    assert SevenSegmentDecoder().decode(image) == ("", 0.0)